@@ -9,10 +9,14 @@
 【子模块说明】
 - router.py: 主路由注册器，汇总所有端点路由
 - deps.py: 依赖注入函数，提供通用的依赖（如当前用户获取）
+- pagination.py: 列表接口共用的游标分页（cursor / limit / next_cursor）
+- http_cache.py: ETag / If-None-Match 条件请求与 304 响应
+- responses.py: orjson 响应与列表接口的快速编码路径（投影行直接编码，跳过模型校验）
 - endpoints/: 具体的 API 端点实现
   - auth.py: 用户认证相关接口（注册、登录）
   - files.py: 文件上传相关接口
   - query.py: 数据查询相关接口（合同、法条）
+  - admin.py: 管理接口（法条导入）
 
 【API 版本】
 当前版本: v1
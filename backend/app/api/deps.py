@@ -13,16 +13,29 @@
 
 【主要依赖函数】
 - get_current_user: 从 JWT Token 中解析并返回当前登录用户
+- get_current_user_optional: 可选认证，无有效 Token 时返回 None
+- get_current_admin: 管理员认证（role 为 admin），用于法条导入等管理接口
+
+【认证缓存】
+两个函数共用 app/services/auth_cache.py 中的进程内缓存：
+同一 Token 命中缓存时不再解码 JWT、也不查询 users 表。
+批量请求（POST /batch）认证一次后用 shared_user 把用户交给各子请求，子请求不再查缓存与解码。
+python-jose 在第一次解码 Token 时才导入，不计入应用启动时间。
 """
 
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.user import User
+from app.services.auth_cache import auth_cache
 
 # OAuth2 密码模式的 Bearer Token 认证方案
 # tokenUrl 指定获取 Token 的接口地址，用于 Swagger UI 的认证功能
@@ -32,9 +45,22 @@ oauth2_scheme_optional = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/token", auto_error=False
 )
 
+# 批量请求中已认证的 (Token, 用户)：子请求在复制了该上下文的任务中执行，携带相同 Token 时直接使用
+_shared_user: ContextVar[tuple[str, User] | None] = ContextVar("shared_user", default=None)
+
+
+@contextmanager
+def shared_user(token: str, user: User) -> Iterator[None]:
+    """在当前上下文（及其中创建的任务）里，携带该 Token 的认证直接返回 user。"""
+    reset = _shared_user.set((token, user))
+    try:
+        yield
+    finally:
+        _shared_user.reset(reset)
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
 ) -> User:
     """
     获取当前登录用户
@@ -42,10 +68,11 @@ def get_current_user(
     【功能说明】
     从请求头中的 Authorization: Bearer <token> 提取 JWT Token，
     解析 Token 获取用户名，然后从数据库查询对应的用户对象。
+    同一 Token 命中认证缓存时直接返回缓存的用户快照（detached 对象，只读使用）。
     
     【参数说明】
-    - db: Session
-        数据库会话，通过 get_db 依赖注入获取
+    - db: AsyncSession
+        数据库会话，通过 get_async_db 依赖注入获取
     - token: str
         JWT Token，通过 oauth2_scheme 从请求头自动提取
     
@@ -58,7 +85,7 @@ def get_current_user(
     
     【使用示例】（在Java中类似于@Autowired注入的方式）
     @router.get("/me")
-    def get_me(current_user: User = Depends(get_current_user)):
+    async def get_me(current_user: User = Depends(get_current_user)):
         return current_user
     """
     # 定义认证失败时的异常
@@ -68,22 +95,7 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},  # 告知客户端使用 Bearer Token 认证
     )
     
-    try:
-        # 解码 JWT Token，验证签名和有效期
-        # 注意：Python 使用 jwt.decode()，与 Java 的 JWT 库用法不同
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        
-        # 从 Token 的 payload 中获取 subject（用户名）
-        # payload.get() 方法返回 None 如果 key 不存在（Java 中需要判空）
-        username: str | None = payload.get("sub")  # Python 3.10+ 的类型联合语法，Java 没有
-        if not username:
-            raise credentials_exception
-    except JWTError:
-        # JWT 解码失败（签名无效、Token 过期等）
-        raise credentials_exception
-
-    # 从数据库查询用户
-    user = db.query(User).filter(User.username == username).first()
+    user = await _resolve_user(db, token)
     if not user:
         raise credentials_exception
     
@@ -94,19 +106,68 @@ def get_current_user(
     return user
 
 
-def get_current_user_optional(
-    db: Session = Depends(get_db),
+async def get_current_user_optional(
+    db: AsyncSession = Depends(get_async_db),
     token: str | None = Depends(oauth2_scheme_optional),
 ) -> User | None:
     """可选当前用户：有有效 Token 则返回 User，否则返回 None。"""
     if not token:
         return None
+    user = await _resolve_user(db, token)
+    return user if user and user.is_active else None
+
+
+async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    """
+    获取当前管理员用户
+
+    管理员账号的 role 为 admin；注册接口只接受 lawyer / client，
+    管理员需在数据库中直接设置（或使用 scripts/import_laws.py 等命令行工具代替接口）。
+
+    【异常情况】
+    - HTTP 401 / 400: 同 get_current_user
+    - HTTP 403 Forbidden: 当前用户不是管理员
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="需要管理员权限")
+    return current_user
+
+
+async def _resolve_user(db: AsyncSession, token: str) -> User | None:
+    """
+    由 Token 解析用户（先查认证缓存）
+    
+    【返回值】
+    User | None: Token 无效或用户不存在时返回 None；
+    已停用的用户同样返回（并缓存），由调用方决定如何处理。
+    """
+    shared = _shared_user.get()
+    if shared is not None and shared[0] == token:
+        return shared[1]
+    cached = auth_cache.get(token)
+    if cached is not None:
+        return cached
+
+    # python-jose 导入时会加载 cryptography，延迟到第一次解码 Token（缓存未命中）时
+    from jose import JWTError, jwt
+
     try:
+        # 解码 JWT Token，验证签名和有效期
+        # 注意：Python 使用 jwt.decode()，与 Java 的 JWT 库用法不同
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username = payload.get("sub")
-        if not username:
-            return None
-        user = db.query(User).filter(User.username == username).first()
-        return user if user and user.is_active else None
     except JWTError:
+        # JWT 解码失败（签名无效、Token 过期等）
         return None
+    
+    # 从 Token 的 payload 中获取 subject（用户名）
+    # payload.get() 方法返回 None 如果 key 不存在（Java 中需要判空）
+    username: str | None = payload.get("sub")  # Python 3.10+ 的类型联合语法，Java 没有
+    if not username:
+        return None
+
+    # 从数据库查询用户，并写入缓存（过期时间不超过 Token 自身的 exp）
+    result = await db.execute(select(User).where(User.username == username))
+    user = result.scalar_one_or_none()
+    if user:
+        auth_cache.put(token, user, token_exp=payload.get("exp"))
+    return user
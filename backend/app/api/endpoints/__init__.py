@@ -10,6 +10,7 @@
 - auth.py: 用户认证端点（注册、登录、获取Token）
 - files.py: 文件管理端点（上传、列表）
 - query.py: 数据查询端点（合同查询、法条搜索）
+- admin.py: 管理端点（法条批量导入，仅管理员）
 
 【设计原则】
 每个端点模块都创建自己的 APIRouter 实例，
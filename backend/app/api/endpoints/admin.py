@@ -0,0 +1,185 @@
+"""
+=============================================================================
+文件: app/api/endpoints/admin.py
+模块: 管理接口
+描述: 仅管理员（role 为 admin）可调用的维护接口
+=============================================================================
+
+【接口列表】
+POST /api/v1/admin/laws/import  - 批量导入法条（上传 .txt / .jsonl / .csv 文件）
+GET  /api/v1/admin/usage         - 模型用量统计（按小时 / 天，按用户 / 模型分组）
+
+【安全机制】
+所有接口依赖 get_current_admin：未登录返回 401，非管理员返回 403。
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.api.deps import get_current_admin
+from app.core.config import settings
+from app.db.session import engine, get_async_db
+from app.models.user import User
+from app.schemas.admin import LawImportOut, UsageItemOut, UsageOut
+from app.services import blob_store, law_import, usage_rollup
+from app.services.upload_stream import UploadFormError, UploadTooLarge, receive_upload
+
+router = APIRouter()
+
+# 与文件上传接口相同：直接读取请求体，手动补充 OpenAPI 描述
+_IMPORT_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+
+
+@router.post("/laws/import", response_model=LawImportOut, openapi_extra=_IMPORT_OPENAPI)
+async def import_laws(
+    request: Request,
+    law_name: str | None = Query(default=None, max_length=255, description="法律名称"),
+    format: str | None = Query(default=None, description="文件格式 text / jsonl / csv"),
+    current_user: User = Depends(get_current_admin),
+) -> LawImportOut:
+    """
+    批量导入法条
+
+    【功能说明】
+    上传的文件先流式写入临时目录，再在线程池中逐行解析、分批写入 law_articles 并更新全文索引
+    （见 services/law_import.py）。同一法律的同一条款已存在时更新内容，重复导入不会产生重复数据。
+
+    【请求参数】
+    - request: Request - 原始请求，表单字段 file 为法条文件（UTF-8）
+    - law_name: str | None - 法律名称；纯文本为空时取文件第一行，JSONL / CSV 中行内 law_name 优先
+    - format: str | None - 文件格式，为空时按扩展名判断
+    - current_user: User - 当前管理员（依赖注入）
+
+    【返回值】
+    LawImportOut: 新增 / 更新 / 跳过的条数与耗时
+
+    【异常情况】
+    - HTTP 400: 缺少文件、格式无法识别、某一行无法解析或不是 UTF-8 编码
+    - HTTP 403: 不是管理员
+    - HTTP 413: 文件超过 LAW_IMPORT_MAX_BYTES
+
+    【使用示例】
+    POST /api/v1/admin/laws/import?law_name=中华人民共和国民法典
+    Content-Type: multipart/form-data
+    Authorization: Bearer <token>
+
+    表单字段: file = 民法典.txt
+    """
+    try:
+        stored = await receive_upload(
+            request, blob_store.tmp_dir(), max_size=settings.LAW_IMPORT_MAX_BYTES
+        )
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=413,
+            detail=f"文件超过大小限制（最大 {settings.LAW_IMPORT_MAX_BYTES // (1024 * 1024)}MB）",
+        )
+    except UploadFormError:
+        raise HTTPException(status_code=400, detail="请求中缺少上传文件")
+
+    try:
+        fmt = format or law_import.detect_format(stored.filename or "")
+        result = await run_in_threadpool(
+            law_import.import_file, engine, stored.path, fmt, law_name or None
+        )
+    except law_import.LawImportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="文件不是 UTF-8 编码")
+    finally:
+        await run_in_threadpool(stored.path.unlink, missing_ok=True)
+
+    return LawImportOut(
+        format=fmt,
+        inserted=result.inserted,
+        updated=result.updated,
+        skipped=result.skipped,
+        seconds=result.seconds,
+    )
+
+
+# 单次查询允许的最大时间范围：限制结果行数
+_USAGE_MAX_RANGE = {"hour": timedelta(days=31), "day": timedelta(days=366)}
+_USAGE_DEFAULT_RANGE = {"hour": timedelta(hours=48), "day": timedelta(days=30)}
+
+
+@router.get("/usage", response_model=UsageOut)
+async def get_usage(
+    granularity: str = Query(default="day", pattern="^(hour|day)$", description="时间粒度 hour / day"),
+    group_by: str = Query(
+        default="none", pattern="^(none|user|model|user_model)$", description="分组 none / user / model / user_model"
+    ),
+    start: datetime | None = Query(default=None, description="起始时间（含），默认 end 之前 48 小时 / 30 天"),
+    end: datetime | None = Query(default=None, description="结束时间（不含），默认当前时间"),
+    user_id: int | None = Query(default=None, description="只统计该用户"),
+    model_name: str | None = Query(default=None, max_length=255, description="只统计该模型"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_admin),
+) -> UsageOut:
+    """
+    模型用量统计
+
+    【功能说明】
+    只读取 model_usage_hourly / model_usage_daily 汇总表（见 services/usage_rollup.py），
+    不扫描 model_call_logs，查询耗时与日志量无关。汇总每 USAGE_ROLLUP_INTERVAL_SECONDS 秒增量更新一次，
+    rolled_up_to_id / rolled_up_at 表示汇总进度。
+
+    【请求参数】
+    - granularity: str - hour / day
+    - group_by: str - none（每个时间桶一行）/ user / model / user_model
+    - start / end: datetime | None - 时间范围 [start, end)，不带时区时按 UTC
+    - user_id / model_name: 过滤条件（可选）
+    - db: AsyncSession - 数据库会话（依赖注入）
+    - current_user: User - 当前管理员（依赖注入）
+
+    【返回值】
+    UsageOut: 按时间桶升序的调用次数、Token、费用与耗时
+
+    【异常情况】
+    - HTTP 400: start 不早于 end，或时间范围超过上限（hour 31 天 / day 366 天）
+    - HTTP 403: 不是管理员
+
+    【使用示例】
+    GET /api/v1/admin/usage?granularity=day&group_by=model&start=2024-06-01
+    """
+    end = end or datetime.now(timezone.utc)
+    start = start or end - _USAGE_DEFAULT_RANGE[granularity]
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start 必须早于 end")
+    if end - start > _USAGE_MAX_RANGE[granularity]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"时间范围过大（{granularity} 粒度最多 {_USAGE_MAX_RANGE[granularity].days} 天）",
+        )
+
+    rows = (
+        await db.execute(usage_rollup.usage_query(granularity, start, end, user_id, model_name))
+    ).all()
+    state = (await db.execute(usage_rollup.state_query())).first()
+    return UsageOut(
+        granularity=granularity,
+        group_by=group_by,
+        rolled_up_to_id=state.last_id if state else 0,
+        rolled_up_at=state.updated_at if state else None,
+        items=[UsageItemOut(**item) for item in usage_rollup.summarize(rows, group_by)],
+    )
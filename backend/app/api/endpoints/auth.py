@@ -15,24 +15,47 @@ POST /api/v1/auth/token     - 获取 Token（OAuth2 表单格式，用于 Swagge
 1. 用户注册：提交用户名、密码、邮箱 -> 密码加密存储 -> 返回用户信息
 2. 用户登录：提交用户名、密码 -> 验证密码 -> 生成 JWT Token -> 返回 Token
 3. 访问受保护接口：携带 Token -> 验证 Token -> 获取当前用户 -> 处理请求
+
+【异步说明】
+register / login / token 为 async def：bcrypt 在密码哈希专用线程池中执行
+（见 services/security.py），数据库读写使用异步会话（get_async_db），
+二者都不会阻塞事件循环，登录高峰也不会占满共享线程池。
 """
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.user import User
 from app.schemas.auth import LoginIn, LoginOut, RegisterIn, TokenOut, UserOut
-from app.services.security import create_access_token, hash_password, verify_password
+from app.services.security import (
+    create_access_token,
+    hash_password_async,
+    verify_password_async,
+)
 
 # 创建认证模块的路由器
 router = APIRouter()
 
 
+async def _get_user(db: AsyncSession, username: str) -> User | None:
+    """按用户名查询用户。"""
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalar_one_or_none()
+
+
+async def _is_taken(db: AsyncSession, username: str, email: str | None) -> bool:
+    """用户名或邮箱是否已被使用。"""
+    if await db.scalar(select(User.id).where(User.username == username).limit(1)):
+        return True
+    return bool(email and await db.scalar(select(User.id).where(User.email == email).limit(1)))
+
+
 @router.post("/register", response_model=UserOut)
-def register(payload: RegisterIn, db: Session = Depends(get_db)) -> User:
+async def register(payload: RegisterIn, db: AsyncSession = Depends(get_async_db)) -> User:
     """
     用户注册接口
     
@@ -45,7 +68,7 @@ def register(payload: RegisterIn, db: Session = Depends(get_db)) -> User:
         - username: str - 用户名（3-50字符）
         - password: str - 密码（6-128字符）
         - email: str | None - 邮箱（可选）
-    - db: Session - 数据库会话（依赖注入）
+    - db: AsyncSession - 数据库会话（依赖注入）
     
     【返回值】
     UserOut: 注册成功的用户信息（不包含密码）
@@ -55,6 +78,7 @@ def register(payload: RegisterIn, db: Session = Depends(get_db)) -> User:
     
     【异常情况】
     - HTTP 400: 用户名或邮箱已存在
+    - HTTP 503: 密码哈希线程池繁忙
     
     【使用示例】
     POST /api/v1/auth/register
@@ -64,42 +88,35 @@ def register(payload: RegisterIn, db: Session = Depends(get_db)) -> User:
         "email": "test@example.com"
     }
     """
-    # 检查用户名是否已存在
-    existing = db.query(User).filter(User.username == payload.username).first()
-    if existing:
+    # 检查用户名、邮箱（如果提供了邮箱）是否已存在
+    if await _is_taken(db, payload.username, payload.email):
         raise HTTPException(status_code=400, detail="用户名或邮箱已存在")
-    
-    # 检查邮箱是否已存在（如果提供了邮箱）
-    if payload.email:
-        existing = db.query(User).filter(User.email == payload.email).first()
-        if existing:
-            raise HTTPException(status_code=400, detail="用户名或邮箱已存在")
 
     # 创建用户对象，密码经过 bcrypt 加密；可选角色 lawyer/client
     user = User(
         username=payload.username,
         email=payload.email,
-        hashed_password=hash_password(payload.password),  # 密码加密存储
+        hashed_password=await hash_password_async(payload.password),  # 密码加密存储
         role=payload.role if payload.role in ("lawyer", "client") else None,
     )
     
     # 保存到数据库
-    db.add(user)      # 添加到会话
-    db.commit()       # 提交事务
-    db.refresh(user)  # 刷新对象，获取数据库生成的 ID
+    db.add(user)            # 添加到会话
+    await db.commit()       # 提交事务
+    await db.refresh(user)  # 刷新对象，获取数据库生成的 ID
     return user
 
 
 @router.post("/login", response_model=LoginOut)
-def login(payload: LoginIn, db: Session = Depends(get_db)) -> LoginOut:
+async def login(payload: LoginIn, db: AsyncSession = Depends(get_async_db)) -> LoginOut:
     """
     用户登录接口（JSON 格式），返回 token + 用户信息，供前端一次拿到 token 与 userInfo。
     """
     # 根据用户名查询用户
-    user = db.query(User).filter(User.username == payload.username).first()
+    user = await _get_user(db, payload.username)
     
     # 验证用户存在且密码正确
-    if not user or not verify_password(payload.password, user.hashed_password):
+    if not user or not await verify_password_async(payload.password, user.hashed_password):
         raise HTTPException(status_code=400, detail="用户名或密码错误")
     
     # 生成 JWT Token，subject 为用户名
@@ -108,7 +125,7 @@ def login(payload: LoginIn, db: Session = Depends(get_db)) -> LoginOut:
 
 
 @router.get("/me", response_model=UserOut)
-def me(current_user: User = Depends(get_current_user)) -> User:
+async def me(current_user: User = Depends(get_current_user)) -> User:
     """
     获取当前登录用户信息（需携带 Token）。
     供前端刷新用户信息或登录后补拉 userInfo。
@@ -117,7 +134,7 @@ def me(current_user: User = Depends(get_current_user)) -> User:
 
 
 @router.post("/token", response_model=TokenOut)
-def token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)) -> TokenOut:
+async def token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)) -> TokenOut:
     """
     获取 Token 接口（OAuth2 表单格式）
     
@@ -130,7 +147,7 @@ def token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
         - username: str - 用户名
         - password: str - 密码
         （注意：这是表单格式，不是 JSON）
-    - db: Session - 数据库会话（依赖注入）
+    - db: AsyncSession - 数据库会话（依赖注入）
     
     【返回值】
     TokenOut: 访问令牌信息
@@ -145,10 +162,10 @@ def token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
     - /token 使用表单格式，符合 OAuth2 标准，适合 Swagger UI 使用
     """
     # 根据用户名查询用户
-    user = db.query(User).filter(User.username == form_data.username).first()
+    user = await _get_user(db, form_data.username)
     
     # 验证用户存在且密码正确
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(status_code=400, detail="用户名或密码错误")
     
     # 生成 JWT Token
@@ -0,0 +1,205 @@
+"""
+=============================================================================
+文件: app/api/endpoints/batch.py
+模块: 批量请求接口
+描述: 一次请求执行多个接口调用，减少小程序页面加载时的往返次数
+=============================================================================
+
+【为什么需要】
+小程序的一个页面往往依次请求 /auth/me、/cases、/lawyers、/query/laws 等多个接口，
+每个请求都要付出一次微信网络往返，以及一次 Token 解码与用户查询。
+
+【执行方式】
+1. 认证一次：批量请求本身解析 Token（可选认证），子请求携带同一 Token 时直接使用该用户（见 deps.shared_user）
+2. 子请求在进程内直接调用 ASGI 应用（经过全部中间件与路由，与单独请求的行为和状态码一致），不经过网络
+3. 按顺序分组：相邻的只读子请求（GET / HEAD）为一组并发执行（至多 BATCH_MAX_CONCURRENCY 个），
+   写请求单独一组；组与组依次执行，排在写请求之后的读请求能看到写入结果
+4. 数据库会话：单独执行的子请求共用批量请求自身的会话（见 db.session.shared_session）；
+   并发的子请求各自使用独立的会话 —— 同一个会话不能被并发使用
+5. 每个子请求的结果单独返回状态码，某个子请求失败不影响其他子请求
+6. 子请求的 JSON 响应体原样拼入批量响应，不解析、不按 BatchOut 重新校验（同 api/responses.py 的快速路径）
+
+【注意事项】
+- 子请求的请求体只支持 JSON；文件上传、文件下载请单独请求
+- 子请求不能再是批量请求
+"""
+
+import asyncio
+import logging
+from urllib.parse import urlencode, urlsplit
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user_optional, oauth2_scheme_optional, shared_user
+from app.api.responses import dumps
+from app.core.config import settings
+from app.db.session import get_async_db, shared_session
+from app.models.user import User
+from app.schemas.batch import BatchIn, BatchItemIn, BatchOut
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+_READ_METHODS = frozenset({"GET", "HEAD"})
+# 不转发给调用方的响应头
+_DROP_HEADERS = frozenset({"content-length", "server-timing"})
+
+
+def _groups(items: list[BatchItemIn]) -> list[list[int]]:
+    """按顺序分组：相邻的只读子请求为一组（组内并发），每个写请求单独一组。"""
+    groups: list[list[int]] = []
+    for i, item in enumerate(items):
+        if item.method in _READ_METHODS and groups and items[groups[-1][0]].method in _READ_METHODS:
+            groups[-1].append(i)
+        else:
+            groups.append([i])
+    return groups
+
+
+def _result(item: BatchItemIn, status: int, detail: str) -> bytes:
+    return dumps({"id": item.id, "status": status, "headers": {}, "body": {"detail": detail}})
+
+
+def _encode(item: BatchItemIn, status: int, headers: dict, raw: bytes, is_json: bool) -> bytes:
+    """编码一个子请求的结果；JSON 响应体（来自本应用，已是合法 JSON）直接拼入，不再解析。"""
+    head = dumps({"id": item.id, "status": status, "headers": headers})[:-1]
+    if not raw:
+        body = b"null"
+    elif is_json:
+        body = raw
+    else:
+        body = dumps(raw.decode("utf-8", errors="replace"))
+    return head + b',"body":' + body + b"}"
+
+
+def _sub_scope(parent: dict, item: BatchItemIn, body: bytes, authorization: str | None) -> dict:
+    """由批量请求的 scope 构造子请求的 scope（路径相对于 API_V1_STR）。"""
+    split = urlsplit(item.path)
+    path = f"{settings.API_V1_STR}/{split.path.lstrip('/')}"
+    query = "&".join(q for q in (split.query, urlencode(item.query or {}, doseq=True)) if q)
+    headers = {k.lower(): v for k, v in (item.headers or {}).items()}
+    if authorization and "authorization" not in headers:
+        headers["authorization"] = authorization
+    if body:
+        headers["content-type"] = "application/json"
+    headers["content-length"] = str(len(body))
+    host = next((v for k, v in parent["headers"] if k == b"host"), None)
+    raw_headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()]
+    if host is not None:
+        raw_headers.append((b"host", host))
+    return {
+        **{k: parent[k] for k in ("type", "http_version", "scheme", "server", "client", "root_path") if k in parent},
+        "method": item.method,
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": raw_headers,
+        "state": dict(parent.get("state") or {}),
+    }
+
+
+async def _call(app, parent_scope: dict, item: BatchItemIn, authorization: str | None) -> bytes:
+    """在进程内执行一个子请求，返回编码好的 {id, status, headers, body}。"""
+    if urlsplit(item.path).path.strip("/").split("/")[0] == "batch":
+        return _result(item, 400, "批量请求中不能嵌套批量请求")
+    body = b"" if item.body is None else dumps(item.body)
+    try:
+        scope = _sub_scope(parent_scope, item, body, authorization)
+    except UnicodeEncodeError:
+        return _result(item, 400, "请求头只能包含 ASCII 字符")
+
+    response_done = asyncio.Event()
+    request_sent = False
+    response: dict = {"status": None, "headers": [], "chunks": []}
+
+    async def receive() -> dict:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # 请求体已读完：等响应结束后再报告断开，避免流式响应提前停止
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            response["chunks"].append(message.get("body", b""))
+            if not message.get("more_body"):
+                response_done.set()
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        # 未处理的异常：ServerErrorMiddleware 已发出 500 响应后再抛出
+        logger.exception("批量请求的子请求失败：%s %s", item.method, item.path)
+        if response["status"] is None:
+            return _result(item, 500, "服务器内部错误")
+    finally:
+        response_done.set()
+
+    headers = {
+        k.decode("latin-1"): v.decode("latin-1")
+        for k, v in response["headers"]
+        if k.decode("latin-1").lower() not in _DROP_HEADERS
+    }
+    content_type = next((v for k, v in headers.items() if k.lower() == "content-type"), "")
+    return _encode(
+        item, response["status"], headers, b"".join(response["chunks"]), content_type.startswith("application/json")
+    )
+
+
+@router.post("", response_model=BatchOut)
+async def batch(
+    payload: BatchIn,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User | None = Depends(get_current_user_optional),
+    token: str | None = Depends(oauth2_scheme_optional),
+):
+    """
+    批量请求：依次 / 并发执行子请求，一次返回全部结果
+
+    【请求体示例】
+    {"requests": [
+        {"id": "me", "path": "/auth/me"},
+        {"id": "cases", "path": "/cases", "query": {"limit": 10}},
+        {"id": "laws", "path": "/query/laws", "query": {"keyword": "租赁"}}
+    ]}
+
+    【返回值】
+    {"responses": [{"id", "status", "headers", "body"}, ...]}，顺序与请求一致；
+    批量请求本身只在请求体不合法时失败，子请求的错误体现在各自的 status 中。
+    """
+    items = payload.requests
+    if len(items) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(status_code=400, detail=f"一次最多包含 {settings.BATCH_MAX_REQUESTS} 个子请求")
+    authorization = request.headers.get("authorization")
+    results: list[bytes] = [b"null"] * len(items)
+    semaphore = asyncio.Semaphore(max(1, settings.BATCH_MAX_CONCURRENCY))
+
+    async def run(i: int, share_session: bool) -> None:
+        if share_session:
+            async with shared_session(db):
+                results[i] = await _call(request.app, request.scope, items[i], authorization)
+            return
+        async with semaphore:
+            results[i] = await _call(request.app, request.scope, items[i], authorization)
+
+    async def run_all() -> None:
+        for group in _groups(items):
+            # 每个子请求在单独的任务（独立的上下文）中执行，请求监控等上下文变量互不干扰
+            share = len(group) == 1
+            await asyncio.gather(*(asyncio.create_task(run(i, share)) for i in group))
+
+    if current_user is not None and token:
+        with shared_user(token, current_user):
+            await run_all()
+    else:
+        await run_all()
+    # 返回 Response：FastAPI 不再按 BatchOut 校验；response_model 仍用于 OpenAPI 文档
+    return Response(b'{"responses":[' + b",".join(results) + b"]}", media_type="application/json")
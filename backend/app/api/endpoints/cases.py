@@ -2,24 +2,61 @@
 =============================================================================
 文件: app/api/endpoints/cases.py
 模块: 案件接口
-描述: 案件列表、详情、创建，与前端 caseList / case-detail / create-case 对接
+描述: 案件列表、详情、创建、更新进展，与前端 caseList / case-detail / create-case 对接
 =============================================================================
+
+【查询说明】
+列表与详情都通过 LEFT JOIN users（律师、客户各一次别名）直接取出用户名，
+不访问 case.lawyer / case.client 懒加载关系，避免每个案件额外两次 SELECT（N+1）。
+列表只投影前端需要的列，语句数与案件数量无关（见 scripts/check_queries.py）。
+
+【参与人】
+"我的案件" 从 case_participants 表查询（见 services/case_participants.py）：
+按 (user_id, created_at, case_id) 索引顺序读取一页再 JOIN cases，不在 cases 上做 lawyer_id OR client_id；
+列表每行按该用户在此案件中的角色（律师 / 客户）决定展示对方的姓名。
 """
 
 import re
 from datetime import date, datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.api.deps import get_current_user
-from app.db.session import get_db
+from app.api.pagination import PageParams, paginate
+from app.api.responses import page_response
+from app.db.session import get_async_db
 from app.models.case import Case
+from app.models.case_participant import PARTICIPANT_LAWYER, CaseParticipant
 from app.models.user import User
-from app.schemas.case import CaseCreateIn, CaseDetailOut, CaseListItem, CaseOut
+from app.schemas.case import CaseCreateIn, CaseDetailOut, CaseListItem, CaseOut, CaseUpdateIn
+from app.schemas.pagination import Page
+from app.services import case_participants  # noqa: F401 (注册 Case 写入事件，同步参与人)
+from app.services import lawyer_stats  # noqa: F401 (注册 Case 写入事件，同步律师统计)
 
 router = APIRouter()
 
+# 律师、客户都关联 users 表，需要两个别名分别 JOIN
+LawyerUser = aliased(User)
+ClientUser = aliased(User)
+
+# 列表投影列：只取 CaseListItem 需要的字段 + 律师/客户用户名
+_LIST_COLUMNS = (
+    Case.id,
+    Case.case_no,
+    Case.title,
+    Case.status,
+    Case.progress,
+    Case.case_type,
+    Case.filing_date,
+    Case.created_at,
+    LawyerUser.username.label("lawyer_name"),
+    ClientUser.username.label("client_name"),
+    CaseParticipant.role.label("participant_role"),
+)
+
 
 def _parse_filing_date(s: str | None) -> date | None:
     if not s or not s.strip():
@@ -44,66 +81,94 @@ def _status_type(status: str) -> str:
     return "pending"
 
 
-def _build_list_item(case: Case, is_lawyer_view: bool) -> CaseListItem:
-    status_type = _status_type(case.status)
+def _build_list_item(row, is_lawyer_view: bool) -> dict:
+    """
+    row 为 _LIST_COLUMNS 投影出的一行（Row），字段名与 Case 属性一致。
+
+    返回与 CaseListItem 字段相同的 dict，由 page_response 直接编码（数据来自本库，无需再校验）。
+    """
+    status_type = _status_type(row.status)
     date_str = (
-        case.filing_date.isoformat()
-        if case.filing_date
-        else (case.created_at.strftime("%Y-%m-%d") if case.created_at else "")
-    )
-    lawyer_name = case.lawyer.username if case.lawyer else ""
-    client_name = case.client.username if case.client else ""
-    return CaseListItem(
-        id=case.id,
-        caseNo=case.case_no,
-        title=case.title,
-        status=case.status,
-        statusType=status_type,
-        date=date_str,
-        progress=case.progress or 0,
-        type=case.case_type,
-        lawyer=lawyer_name if not is_lawyer_view else None,
-        client=client_name if is_lawyer_view else None,
+        row.filing_date.isoformat()
+        if row.filing_date
+        else (row.created_at.strftime("%Y-%m-%d") if row.created_at else "")
     )
+    return {
+        "id": row.id,
+        "caseNo": row.case_no,
+        "title": row.title,
+        "status": row.status,
+        "statusType": status_type,
+        "date": date_str,
+        "progress": row.progress or 0,
+        "type": row.case_type,
+        "lawyer": (row.lawyer_name or "") if not is_lawyer_view else None,
+        "client": (row.client_name or "") if is_lawyer_view else None,
+    }
 
 
-@router.get("", response_model=list[CaseListItem])
-def list_cases(
+@router.get("", response_model=Page[CaseListItem])
+async def list_cases(
     keyword: str | None = Query(default=None, description="搜索关键词"),
     status: str | None = Query(default=None, description="状态过滤 pending/processing/completed"),
     history: bool = Query(default=False, description="是否含已结案"),
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """案件列表：返回当前用户作为律师或客户参与的案件。"""
-    is_lawyer_view = current_user.role == "lawyer"
-    q = db.query(Case).filter(
-        (Case.lawyer_id == current_user.id) | (Case.client_id == current_user.id)
+    stmt = (
+        select(*_LIST_COLUMNS)
+        .select_from(CaseParticipant)
+        .join(Case, Case.id == CaseParticipant.case_id)
+        .outerjoin(LawyerUser, LawyerUser.id == Case.lawyer_id)
+        .outerjoin(ClientUser, ClientUser.id == Case.client_id)
+        .where(CaseParticipant.user_id == current_user.id)
     )
 
     if keyword:
         like = f"%{keyword}%"
-        q = q.filter(Case.case_no.like(like) | Case.title.like(like))
+        stmt = stmt.where(Case.case_no.like(like) | Case.title.like(like))
+    # 状态过滤用参与人表上的副本，过滤与排序都在同一个索引内完成
     if status:
-        q = q.filter(Case.status == status)
+        stmt = stmt.where(CaseParticipant.status == status)
     if not history:
-        q = q.filter(Case.status != "completed")
-    q = q.order_by(Case.id.desc())
-    cases = q.all()
-    return [_build_list_item(c, is_lawyer_view) for c in cases]
+        stmt = stmt.where(CaseParticipant.status != "completed")
+    cases, next_cursor = await paginate(
+        db, stmt, page, CaseParticipant.created_at, CaseParticipant.case_id, scalars=False
+    )
+    return page_response(
+        [_build_list_item(c, c.participant_role == PARTICIPANT_LAWYER) for c in cases], next_cursor
+    )
 
 
 @router.get("/{case_id}", response_model=CaseDetailOut)
-def get_case(
+async def get_case(
     case_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    """案件详情：仅案件律师或客户可访问。"""
-    case = db.query(Case).filter(Case.id == case_id).first()
-    if not case:
+    """案件详情：仅案件参与人可访问；案件、双方用户名与当前用户的参与角色一次查询取出。"""
+    result = await db.execute(
+        select(
+            Case,
+            LawyerUser.username.label("lawyer_name"),
+            ClientUser.username.label("client_name"),
+            CaseParticipant.role.label("participant_role"),
+        )
+        .outerjoin(LawyerUser, LawyerUser.id == Case.lawyer_id)
+        .outerjoin(ClientUser, ClientUser.id == Case.client_id)
+        .outerjoin(
+            CaseParticipant,
+            and_(CaseParticipant.case_id == Case.id, CaseParticipant.user_id == current_user.id),
+        )
+        .where(Case.id == case_id)
+    )
+    row = result.first()
+    if not row:
         raise HTTPException(status_code=404, detail="案件不存在")
-    if case.lawyer_id != current_user.id and case.client_id != current_user.id:
+    case = row.Case
+    if row.participant_role is None:
         raise HTTPException(status_code=403, detail="无权限查看该案件")
     filing_str = (
         case.filing_date.strftime("%Y年%m月%d日")
@@ -120,10 +185,11 @@ def get_case(
         filingDate=filing_str,
         amount=case.amount,
         applicableLaw=case.applicable_law,
-        client=case.client.username if case.client else None,
-        lawyer=case.lawyer.username if case.lawyer else None,
+        client=row.client_name,
+        lawyer=row.lawyer_name,
         status=case.status,
         statusType=_status_type(case.status),
+        outcome=case.outcome,
         progress=case.progress or 0,
         created_at=case.created_at,
         timeline=[],
@@ -133,9 +199,9 @@ def get_case(
 
 
 @router.post("", response_model=CaseOut, status_code=201)
-def create_case(
+async def create_case(
     payload: CaseCreateIn,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """创建案件：仅律师可创建。"""
@@ -157,8 +223,8 @@ def create_case(
         progress=0,
     )
     db.add(case)
-    db.commit()
-    db.refresh(case)
+    await db.commit()
+    await db.refresh(case)
     return CaseOut(
         id=case.id,
         caseNo=case.case_no,
@@ -170,3 +236,53 @@ def create_case(
         filingDate=case.filing_date.isoformat() if case.filing_date else None,
         created_at=case.created_at,
     )
+
+
+@router.patch("/{case_id}", response_model=CaseOut)
+async def update_case(
+    case_id: int,
+    payload: CaseUpdateIn,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    更新案件进展：状态、结案结果、进度（仅承办律师）
+
+    【功能说明】
+    只修改请求体中提交了的字段。结案（status=completed）时可同时提交 outcome；
+    案件改回未结案状态时结果一并清空。参与人状态、首页计数、律师胜诉率由写入事件在同一事务中同步。
+
+    【异常情况】
+    - 400: 未结案的案件设置 outcome
+    - 403: 不是该案件的承办律师
+    - 404: 案件不存在
+    """
+    case = await db.get(Case, case_id)
+    if case is None:
+        raise HTTPException(status_code=404, detail="案件不存在")
+    if case.lawyer_id != current_user.id:
+        raise HTTPException(status_code=403, detail="仅承办律师可更新案件")
+    fields = payload.model_fields_set
+    if payload.status is not None:
+        case.status = payload.status
+    if payload.progress is not None:
+        case.progress = payload.progress
+    if case.status != "completed":
+        if payload.outcome is not None:
+            raise HTTPException(status_code=400, detail="只有已结案的案件可以设置结案结果")
+        case.outcome = None
+    elif "outcome" in fields:
+        case.outcome = payload.outcome
+    await db.commit()
+    return CaseOut(
+        id=case.id,
+        caseNo=case.case_no,
+        title=case.title,
+        status=case.status,
+        statusType=_status_type(case.status),
+        outcome=case.outcome,
+        progress=case.progress or 0,
+        caseType=case.case_type,
+        filingDate=case.filing_date.isoformat() if case.filing_date else None,
+        created_at=case.created_at,
+    )
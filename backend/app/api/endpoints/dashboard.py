@@ -0,0 +1,57 @@
+"""
+=============================================================================
+文件: app/api/endpoints/dashboard.py
+模块: 首页汇总接口
+描述: 当前用户的案件 / 合同分状态计数，供小程序首页展示
+=============================================================================
+
+【查询说明】
+计数由 services/dashboard_counters.py 在案件、合同写入时同步维护，
+接口只按主键读取 dashboard_counters 中当前用户的一行，不扫描案件表与合同表。
+"""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.db.session import get_async_db
+from app.models.dashboard_counter import DashboardCounter
+from app.models.user import User
+from app.schemas.dashboard import DashboardSummaryOut
+from app.services import dashboard_counters
+
+router = APIRouter()
+
+
+@router.get("/summary", response_model=DashboardSummaryOut)
+async def dashboard_summary(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    首页汇总：我参与的案件、我的合同按状态的个数
+
+    【功能说明】
+    按主键读取 dashboard_counters 中当前用户的一行（见 services/dashboard_counters.py），
+    不扫描案件表与合同表。计数随案件、合同写入在同一事务中更新，并定时对账修正。
+    案件按参与人计数：律师与客户各自计入自己的计数。
+
+    【请求参数】
+    - db: AsyncSession - 数据库会话（依赖注入）
+    - current_user: User - 当前用户（依赖注入）
+
+    【返回值】
+    DashboardSummaryOut: 案件与合同的分状态计数
+        - cases: pending / processing / completed / other / total
+        - contracts: draft / active / expired / terminated / other / total
+    还没有案件与合同的用户全部为 0。
+
+    【异常情况】
+    - HTTP 401: 未登录或 Token 无效
+
+    【使用示例】
+    GET /api/v1/dashboard/summary
+    Authorization: Bearer <token>
+    """
+    row = await db.get(DashboardCounter, current_user.id)
+    return dashboard_counters.summary(row)
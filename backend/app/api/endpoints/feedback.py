@@ -2,39 +2,98 @@
 =============================================================================
 文件: app/api/endpoints/feedback.py
 模块: 反馈接口
-描述: 提交用户反馈，与前端帮助与反馈页对接
+描述: 提交用户反馈，与前端帮助与反馈页对接；带 lawyerId、caseId 与 rating 时同时作为对律师的评价
+      （计入律师满意度，见 services/lawyer_stats.py）
 =============================================================================
+
+【评价律师的限制】
+满意度公开展示在律师列表与详情中，评价必须有据可查：
+- 需要登录，且 caseId 是当前用户作为客户、由该律师承办的案件
+- 每个案件只能评价一次（feedbacks.case_id 唯一）
 """
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user_optional
-from app.db.session import get_db
+from app.db.session import get_async_db
+from app.models.case import Case
 from app.models.feedback import Feedback
 from app.models.user import User
 from app.schemas.feedback import FeedbackCreateIn, FeedbackOut
+from app.services import lawyer_stats  # noqa: F401 (注册 Case / Feedback 写入事件，同步律师统计)
 
 router = APIRouter()
 
 
+async def _check_rating(db: AsyncSession, payload: FeedbackCreateIn, current_user: User | None) -> None:
+    """校验对律师的评价：参数齐全、已登录、律师存在、案件属于当前用户与该律师且尚未评价。"""
+    fields = (payload.lawyer_id, payload.case_id, payload.rating)
+    if all(f is None for f in fields):
+        return
+    if any(f is None for f in fields):
+        raise HTTPException(status_code=400, detail="评价律师需同时提供 lawyerId、caseId 与 rating")
+    if current_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="评价律师需要登录",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    lawyer = await db.execute(
+        select(User.id).where(User.id == payload.lawyer_id, User.role == "lawyer")
+    )
+    if lawyer.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="律师不存在")
+    case = await db.execute(
+        select(Case.id).where(
+            Case.id == payload.case_id,
+            Case.lawyer_id == payload.lawyer_id,
+            Case.client_id == current_user.id,
+        )
+    )
+    if case.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="未找到您由该律师承办的案件")
+    rated = await db.execute(select(Feedback.id).where(Feedback.case_id == payload.case_id))
+    if rated.first() is not None:
+        raise HTTPException(status_code=409, detail="该案件已评价过")
+
+
 @router.post("", response_model=FeedbackOut, status_code=201)
-def create_feedback(
+async def create_feedback(
     payload: FeedbackCreateIn,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User | None = Depends(get_current_user_optional),
 ):
-    """提交反馈；已登录则记录 user_id，未登录也可提交。"""
+    """
+    提交反馈；已登录则记录 user_id，未登录也可提交
+
+    【异常情况】
+    - 400: lawyerId、caseId、rating 没有一同提交
+    - 401: 评价律师但未登录
+    - 404: 律师不存在，或案件不是当前用户由该律师承办的案件
+    - 409: 该案件已评价过
+    """
+    await _check_rating(db, payload, current_user)
     fb = Feedback(
         user_id=current_user.id if current_user else None,
         type=payload.type,
         content=payload.content,
         contact=payload.contact,
         images=payload.images[:3] if payload.images else None,
+        lawyer_id=payload.lawyer_id,
+        case_id=payload.case_id,
+        rating=payload.rating,
     )
     db.add(fb)
-    db.commit()
-    db.refresh(fb)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # 同一案件的两次评价并发提交：后提交的一方违反 uq_feedbacks_case
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="该案件已评价过")
+    await db.refresh(fb)
     return FeedbackOut(
         id=fb.id,
         type=fb.type,
@@ -2,44 +2,86 @@
 =============================================================================
 文件: app/api/endpoints/files.py
 模块: 文件管理端点
-描述: 提供文件上传和文件列表查询功能
+描述: 提供文件上传、文件列表查询与文件内容下载功能
       用于管理用户上传的合同文件等文档
 =============================================================================
 
 【接口列表】
 POST /api/v1/files/upload  - 上传文件（需要认证）
-GET  /api/v1/files         - 获取当前用户的文件列表（需要认证）
+GET  /api/v1/files         - 获取当前用户的文件列表（需要认证，游标分页）
+GET  /api/v1/files/{id}/content - 下载/预览文件内容（需要认证，支持 Range 与 ETag）
 
 【文件存储策略】
-1. 文件保存在服务器的 uploads/ 目录下
-2. 文件名格式: {UUID}_{原始文件名}，避免文件名冲突
-3. 文件元数据（大小、类型等）存储在数据库中
+1. 请求体流式写入 uploads/tmp/，同时计算 SHA-256
+2. 按内容寻址去重：内容文件保存在 uploads/blobs/ab/cd/<sha256>，
+   相同内容只保存一份，重复上传直接引用已有文件（见 services/blob_store.py）
+3. 每次上传仍生成一条记录，存储名格式: {UUID}_{原始文件名}
+4. 文件元数据（大小、类型、SHA-256 等）存储在数据库中
+5. 单个文件不超过 UPLOAD_MAX_BYTES，超出返回 413
 
 【安全机制】
 所有接口都需要 JWT Token 认证，用户只能访问自己上传的文件。
 """
 
-from pathlib import Path
+import os
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, File, UploadFile
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from app.api.deps import get_current_user
+from app.api.http_cache import not_modified
+from app.api.pagination import PageParams, paginate
+from app.api.responses import page_response, rows_to_dicts
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.uploaded_file import UploadedFile as UploadedFileModel
 from app.models.user import User
 from app.schemas.files import UploadedFileOut
+from app.schemas.pagination import Page
+from app.services import blob_store
+from app.services.upload_stream import UploadFormError, UploadTooLarge, receive_upload
 
 # 创建文件模块的路由器
 router = APIRouter()
 
+# 列表投影列：与 UploadedFileOut 的字段一一对应
+_LIST_COLUMNS = (
+    UploadedFileModel.id,
+    UploadedFileModel.original_filename,
+    UploadedFileModel.stored_filename,
+    UploadedFileModel.content_type,
+    UploadedFileModel.size,
+    UploadedFileModel.sha256,
+    UploadedFileModel.path,
+    UploadedFileModel.created_at,
+)
 
-@router.post("/upload", response_model=UploadedFileOut)
-def upload_file(
-    file: UploadFile = File(...),  # File(...) 表示必填参数，"..." 是 FastAPI 的占位符
-    db: Session = Depends(get_db),
+# 接口直接读取请求体而不声明 File 参数，手动补充 OpenAPI 描述，保证 Swagger UI 仍可上传
+_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+
+
+@router.post("/upload", response_model=UploadedFileOut, openapi_extra=_UPLOAD_OPENAPI)
+async def upload_file(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ) -> UploadedFileModel:
     """
@@ -47,106 +89,183 @@ def upload_file(
     
     【功能说明】
     接收用户上传的文件，保存到服务器并记录文件元数据到数据库。
-    文件以流的方式读取，支持大文件上传。
+    请求体以流的方式直接写入磁盘（见 services/upload_stream.py）：
+    不经过 UploadFile 的临时文件、不占用线程池 worker，大小与 SHA-256 在写盘的同一遍中算出。
+    内容已存在时不再保存新副本，新记录引用已有的内容文件。
     
     【请求参数】
-    - file: UploadFile - 上传的文件（multipart/form-data 格式）
-    - db: Session - 数据库会话（依赖注入）
+    - request: Request - 原始请求，表单字段 file 为上传的文件（multipart/form-data 格式）
+    - db: AsyncSession - 数据库会话（依赖注入）
     - current_user: User - 当前登录用户（依赖注入，需要 Token）
     
     【返回值】
     UploadedFileOut: 上传文件的信息
         - id: int - 文件记录ID
         - original_filename: str - 原始文件名
-        - stored_filename: str - 存储文件名（带UUID前缀）
+        - stored_filename: str - 记录的唯一存储名（带UUID前缀）
         - content_type: str - 文件MIME类型
         - size: int - 文件大小（字节）
-        - path: str - 服务器存储路径
+        - sha256: str - 文件内容的 SHA-256 摘要
+        - path: str - 服务器存储路径（内容相同的记录指向同一文件）
         - created_at: datetime - 创建时间
     
+    【异常情况】
+    - HTTP 400: 不是 multipart 请求或缺少 file 字段
+    - HTTP 413: 文件超过 UPLOAD_MAX_BYTES
+    
     【使用示例】
     POST /api/v1/files/upload
     Content-Type: multipart/form-data
     Authorization: Bearer <token>
     
     表单字段: file = <文件内容>
-    
-    【注意事项】（与Java的区别）
-    Python 中使用 := 海象运算符进行赋值的同时判断，这在 Java 中没有对应语法。
-    例如: while chunk := file.file.read(1024) 等同于先 chunk=read()，再判断 chunk 是否为真
     """
-    # 确保上传目录存在
-    # Path 是 Python 标准库 pathlib 提供的路径操作类，比字符串拼接更安全
-    upload_dir = Path(settings.UPLOAD_DIR)
-    upload_dir.mkdir(parents=True, exist_ok=True)  # 递归创建目录，已存在则忽略
-
-    # 生成唯一的存储文件名，格式: UUID_原始文件名
-    # uuid4() 生成随机 UUID，hex 属性返回无连字符的十六进制字符串
-    stored_name = f"{uuid4().hex}_{file.filename}"
-    stored_path = upload_dir / stored_name  # Path 支持 / 运算符拼接路径
-
-    # 以二进制写模式打开文件，分块读取上传内容
-    size = 0
-    with stored_path.open("wb") as f:
-        # := 是 Python 3.8+ 的海象运算符（Walrus Operator）
-        # 它在赋值的同时返回赋的值，用于循环条件判断
-        # Java 中没有这个语法，需要分两步: chunk = read(); while(chunk != null)
-        while chunk := file.file.read(1024 * 1024):  # 每次读取 1MB
-            f.write(chunk)
-            size += len(chunk)
-
-    # 创建数据库记录
-    record = UploadedFileModel(
-        user_id=current_user.id,
-        original_filename=file.filename or "unknown",  # or 运算符用于默认值，类似 Java 的三元运算符
-        stored_filename=stored_name,
-        content_type=file.content_type,
-        size=size,
-        path=str(stored_path),  # 将 Path 对象转为字符串
-    )
-    
-    # 保存到数据库
-    db.add(record)
-    db.commit()
-    db.refresh(record)
+    try:
+        stored = await receive_upload(request, blob_store.tmp_dir())
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=413,
+            detail=f"文件超过大小限制（最大 {settings.UPLOAD_MAX_BYTES // (1024 * 1024)}MB）",
+        )
+    except UploadFormError:
+        raise HTTPException(status_code=400, detail="请求中缺少上传文件")
+
+    original_filename = stored.filename or "unknown"  # or 运算符用于默认值，类似 Java 的三元运算符
+    # 最多尝试两次：并发上传同一新内容时，第一次可能因 file_blobs 主键冲突失败
+    for attempt in range(2):
+        blob = await blob_store.link_upload(db, stored)
+        record = UploadedFileModel(
+            user_id=current_user.id,
+            original_filename=original_filename,
+            # uuid4() 生成随机 UUID，hex 属性返回无连字符的十六进制字符串
+            stored_filename=f"{uuid4().hex}_{original_filename}",
+            content_type=stored.content_type,
+            size=stored.size,
+            sha256=blob.sha256,
+            path=blob.path,
+        )
+        db.add(record)
+        try:
+            await db.commit()
+            break
+        except Exception as exc:
+            await db.rollback()
+            # 新内容已放入 blobs/：没有提交成功的记录引用它时删除，不留孤儿文件
+            await blob_store.discard_orphans(db)
+            if attempt or not isinstance(exc, IntegrityError):
+                raise
+    await db.refresh(record)
 
     return record
 
 
-@router.get("", response_model=list[UploadedFileOut])
-def list_my_files(
-    db: Session = Depends(get_db),
+@router.get("", response_model=Page[UploadedFileOut])
+async def list_my_files(
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
-) -> list[UploadedFileModel]:
+) -> Response:
     """
     获取当前用户的文件列表
     
     【功能说明】
-    查询并返回当前登录用户上传的所有文件，按上传时间倒序排列（最新的在前）。
+    分页查询当前登录用户上传的文件，按上传时间倒序排列（最新的在前）。
     用户只能看到自己上传的文件，无法访问其他用户的文件。
+    只查询响应需要的列，由 orjson 直接编码返回（见 app/api/responses.py）。
     
     【请求参数】
-    - db: Session - 数据库会话（依赖注入）
+    - page: PageParams - 分页参数 cursor / limit（见 app/api/pagination.py）
+    - db: AsyncSession - 数据库会话（依赖注入）
     - current_user: User - 当前登录用户（依赖注入，需要 Token）
     
     【返回值】
-    list[UploadedFileOut]: 文件信息列表
+    Page[UploadedFileOut]: 分页信封 {items, next_cursor}
     
     【使用示例】
-    GET /api/v1/files
+    GET /api/v1/files?limit=20
+    GET /api/v1/files?limit=20&cursor=<上一页的 next_cursor>
     Authorization: Bearer <token>
     
     【注意事项】（与Java的区别）
-    list[UploadedFileOut] 是 Python 3.9+ 的泛型语法
-    在 Java 中对应 List<UploadedFileOut>
+    Page[UploadedFileOut] 是 Pydantic 泛型模型的具体化
+    在 Java 中对应 Page<UploadedFileOut>
+    """
+    # 使用 SQLAlchemy 2.0 风格的 select() 构建查询
+    # where() 相当于 SQL 的 WHERE 子句，只查询当前用户的文件
+    # paginate() 追加游标条件、ORDER BY created_at DESC, id DESC 与 LIMIT
+    stmt = select(*_LIST_COLUMNS).where(UploadedFileModel.user_id == current_user.id)
+    rows, next_cursor = await paginate(
+        db, stmt, page, UploadedFileModel.created_at, UploadedFileModel.id, scalars=False
+    )
+    return page_response(rows_to_dicts(rows), next_cursor)
+
+
+@router.get("/{file_id}/content")
+@router.head("/{file_id}/content", include_in_schema=False)
+async def download_file(
+    file_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """
+    下载 / 预览文件内容
+    
+    【功能说明】
+    校验文件属于当前用户后，直接从磁盘流式返回文件内容，不整体读入内存。
+    - Range: 支持 bytes=0-1023 等单段/多段范围请求（206），便于大文件分页预览
+    - ETag: 内容的 SHA-256（强校验值）；旧数据没有摘要时退化为基于修改时间与大小的弱校验值
+    - If-None-Match 命中时返回 304，不再传输内容；If-Range 不匹配时返回完整内容
+    支持 http.response.pathsend 扩展的服务器会由服务器直接发送文件（零拷贝）。
+    
+    【请求参数】
+    - file_id: int - 文件记录ID（路径参数）
+    - request: Request - 原始请求，用于读取 Range / If-None-Match 等请求头
+    - db: AsyncSession - 数据库会话（依赖注入）
+    - current_user: User - 当前登录用户（依赖注入，需要 Token）
+    
+    【返回值】
+    文件内容：200（完整）/ 206（范围）/ 304（未修改），
+    Content-Type 为上传时的 MIME 类型，Content-Disposition 为 inline（可直接预览）
+    
+    【异常情况】
+    - HTTP 404: 文件记录不存在，或磁盘文件已丢失
+    - HTTP 403: 文件不属于当前用户
+    - HTTP 416: Range 超出文件大小
+    
+    【使用示例】
+    GET /api/v1/files/1/content
+    Range: bytes=0-1048575
+    If-None-Match: "9f86d08..."
+    Authorization: Bearer <token>
     """
-    # 使用 SQLAlchemy 的链式查询
-    # filter() 相当于 SQL 的 WHERE 子句
-    # order_by() 相当于 SQL 的 ORDER BY 子句，desc() 表示降序
-    # all() 执行查询并返回所有结果
-    return (
-        db.query(UploadedFileModel)
-        .filter(UploadedFileModel.user_id == current_user.id)  # 只查询当前用户的文件
-        .order_by(UploadedFileModel.id.desc())  # 按 ID 降序（最新的在前）
-        .all()
+    record = await db.get(UploadedFileModel, file_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="文件不存在")
+    if record.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="无权限访问该文件")
+
+    try:
+        stat_result = await run_in_threadpool(os.stat, record.path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="文件不存在")
+
+    etag = (
+        f'"{record.sha256}"'
+        if record.sha256
+        else f'W/"{int(stat_result.st_mtime)}-{stat_result.st_size}"'
+    )
+    # private：内容属于个人，只允许客户端缓存；no-cache：每次使用前用 ETag 再验证一次
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(
+        record.path,
+        headers=headers,
+        media_type=record.content_type or None,
+        filename=record.original_filename,
+        stat_result=stat_result,
+        content_disposition_type="inline",
     )
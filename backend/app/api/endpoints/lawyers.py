@@ -4,74 +4,170 @@
 模块: 律师接口
 描述: 律师列表、律师详情，与前端 find-lawyer / lawyer-detail 对接
 =============================================================================
+
+【查询说明】
+列表按分类/标签过滤时使用 lawyer_facets 索引（见 services/lawyer_index.py），
+不再把整页律师资料取出后在 Python 中解析 JSON 过滤。
+stats（案件数、胜诉率、满意度）来自 lawyer_stats（见 services/lawyer_stats.py），
+与律师资料在同一条查询中按主键 LEFT JOIN，不在请求时聚合案件与评价。
+
+【响应缓存】
+两个接口都是公开、读多写少的接口：序列化好的 JSON 按查询参数缓存在进程内（TTL + LRU），
+律师资料写入时清空；响应带 ETag 与 Cache-Control: public, max-age=N，
+客户端 / CDN 再验证时 If-None-Match 命中返回 304。
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.api.http_cache import cached_json_response
+from app.api.pagination import PageParams, paginate
+from app.api.responses import dumps
+from app.core.config import settings
+from app.db.session import get_async_db
+from app.models.lawyer_facet import FACET_CATEGORY, FACET_TAG
 from app.models.lawyer_profile import LawyerProfile
+from app.models.lawyer_stat import LawyerStat
 from app.models.user import User
 from app.schemas.lawyer import LawyerDetailOut, LawyerEducation, LawyerListItem, LawyerStats
+from app.schemas.pagination import Page
+from app.services import lawyer_index, lawyer_stats
+from app.services.response_cache import lawyer_cache
 
 router = APIRouter()
 
+# 列表投影列：只取 LawyerListItem 需要的字段 + 排序键 created_at
+_LIST_COLUMNS = (
+    LawyerProfile.user_id,
+    LawyerProfile.name,
+    LawyerProfile.title,
+    LawyerProfile.avatar_emoji,
+    LawyerProfile.introduction,
+    LawyerProfile.tags,
+    LawyerProfile.categories,
+    LawyerProfile.practice_years,
+    LawyerStat.case_count,
+    LawyerStat.decided_count,
+    LawyerStat.won_count,
+    LawyerStat.rating_count,
+    LawyerStat.satisfied_count,
+    User.created_at,
+)
+
 
-@router.get("", response_model=list[LawyerListItem])
-def list_lawyers(
+@router.get("", response_model=Page[LawyerListItem])
+async def list_lawyers(
+    request: Request,
     keyword: str | None = Query(default=None, description="搜索关键词"),
     category: str | None = Query(default=None, description="专业领域/分类"),
-    db: Session = Depends(get_db),
-):
-    """律师列表：可公开访问；支持关键词与分类过滤。"""
-    q = (
-        db.query(LawyerProfile)
+    tag: str | None = Query(default=None, description="标签"),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    """
+    律师列表：可公开访问；支持关键词、分类与标签过滤；按律师注册时间 (created_at, user_id) 倒序分页。
+
+    分类/标签过滤通过 lawyer_facets 索引在 SQL 中完成，与分页在同一条查询里，
+    只取出命中律师的列表字段，每页条数不会因过滤而减少。
+    响应按查询参数缓存（见 services/response_cache.py），带 ETag 与 Cache-Control。
+    """
+    key = ("list", keyword, category, tag, page.cursor, page.limit)
+    cached = lawyer_cache.get(key)
+    if cached is None:
+        generation = lawyer_cache.generation
+        result = await _load_page(db, keyword, category, tag, page)
+        cached = lawyer_cache.put(key, dumps(result), generation)
+    return cached_json_response(request, cached, _cache_control())
+
+
+@router.get("/{lawyer_id}", response_model=LawyerDetailOut)
+async def get_lawyer(
+    lawyer_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    """律师详情：可公开访问；lawyer_id 为 user_id；响应缓存与 ETag 同律师列表。"""
+    key = ("detail", lawyer_id)
+    cached = lawyer_cache.get(key)
+    if cached is None:
+        generation = lawyer_cache.generation
+        detail = await _load_detail(db, lawyer_id)
+        cached = lawyer_cache.put(key, detail.model_dump_json().encode(), generation)
+    return cached_json_response(request, cached, _cache_control())
+
+
+def _cache_control() -> str:
+    """公开缓存：允许客户端与 CDN 缓存 N 秒，过期后凭 ETag 再验证。"""
+    return f"public, max-age={settings.LAWYER_CACHE_MAX_AGE}"
+
+
+async def _load_page(
+    db: AsyncSession,
+    keyword: str | None,
+    category: str | None,
+    tag: str | None,
+    page: PageParams,
+) -> dict:
+    """查询一页律师列表（缓存未命中时调用），返回与 Page[LawyerListItem] 结构相同的 dict。"""
+    stmt = (
+        select(*_LIST_COLUMNS)
         .join(User, User.id == LawyerProfile.user_id)
-        .filter(User.role == "lawyer")
+        .outerjoin(LawyerStat, LawyerStat.user_id == LawyerProfile.user_id)
+        .where(User.role == "lawyer")
     )
     if keyword:
         like = f"%{keyword}%"
-        q = q.filter(
+        stmt = stmt.where(
             LawyerProfile.name.like(like)
             | (LawyerProfile.introduction.like(like) if LawyerProfile.introduction else False)
             | (LawyerProfile.expertise.like(like) if LawyerProfile.expertise else False)
         )
-    profiles = q.all()
     if category:
-        profiles = [
-            p
-            for p in profiles
-            if p.categories and category in p.categories
-        ]
-    out = []
-    for p in profiles:
-        out.append(
-            LawyerListItem(
-                id=p.user_id,
-                name=p.name,
-                title=p.title,
-                avatarEmoji=p.avatar_emoji,
-                introduction=p.introduction,
-                tags=p.tags or [],
-                categories=p.categories or [],
-            )
-        )
-    return out
+        stmt = stmt.where(lawyer_index.facet_filter(FACET_CATEGORY, category.strip()))
+    if tag:
+        stmt = stmt.where(lawyer_index.facet_filter(FACET_TAG, tag.strip()))
+    rows, next_cursor = await paginate(
+        db,
+        stmt,
+        page,
+        User.created_at,
+        User.id,
+        key=lambda row: (row.created_at, row.user_id),
+        scalars=False,
+    )
+    out = [
+        {
+            "id": row.user_id,
+            "name": row.name,
+            "title": row.title,
+            "avatarEmoji": row.avatar_emoji,
+            "introduction": row.introduction,
+            "tags": row.tags or [],
+            "categories": row.categories or [],
+            "stats": lawyer_stats.format_stats(row, row.practice_years),
+        }
+        for row in rows
+    ]
+    return {"items": out, "next_cursor": next_cursor}
 
 
-@router.get("/{lawyer_id}", response_model=LawyerDetailOut)
-def get_lawyer(
-    lawyer_id: int,
-    db: Session = Depends(get_db),
-):
-    """律师详情：可公开访问；lawyer_id 为 user_id。"""
-    profile = (
-        db.query(LawyerProfile)
-        .filter(LawyerProfile.user_id == lawyer_id)
-        .first()
+async def _load_detail(db: AsyncSession, lawyer_id: int) -> LawyerDetailOut:
+    """
+    查询律师详情（缓存未命中时调用）
+
+    【异常情况】
+    - HTTP 404: 律师不存在（不缓存）
+    """
+    result = await db.execute(
+        select(LawyerProfile, LawyerStat)
+        .outerjoin(LawyerStat, LawyerStat.user_id == LawyerProfile.user_id)
+        .where(LawyerProfile.user_id == lawyer_id)
     )
-    if not profile:
+    row = result.first()
+    if not row:
         raise HTTPException(status_code=404, detail="律师不存在")
+    profile, stats = row
     edu = profile.education
     if isinstance(edu, dict):
         edu_out = LawyerEducation(
@@ -90,12 +186,7 @@ def get_lawyer(
         practiceYears=profile.practice_years,
         practiceArea=profile.practice_area,
         expertise=profile.expertise,
-        stats=LawyerStats(
-            years=profile.practice_years,
-            caseCount=None,
-            winRate=None,
-            clientSatisfaction=None,
-        ),
+        stats=LawyerStats(**lawyer_stats.format_stats(stats, profile.practice_years)),
         education=edu_out,
         languageSkills=profile.language_skills,
         introduction=profile.introduction,
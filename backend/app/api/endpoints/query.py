@@ -12,30 +12,57 @@ GET /api/v1/query/laws       - 搜索法条（公开接口）
 
 【查询功能】
 1. 合同查询：支持按标题/描述关键字搜索，按状态过滤
-2. 法条搜索：支持按法律名称过滤，按内容关键字搜索
+2. 法条搜索：支持按法律名称过滤，按内容关键字全文检索（BM25 排序，见 services/law_search.py）
+
+【响应编码】
+两个列表接口只投影响应需要的列，由 orjson 直接编码返回（见 app/api/responses.py），
+不再构造 ORM 对象、也不再按 response_model 逐行校验。
 """
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
-from app.db.session import get_db
+from app.api.pagination import PageParams, decode_rank_cursor, encode_cursor, paginate
+from app.api.responses import page_response, rows_to_dicts
+from app.db.session import get_async_db
 from app.models.contract import Contract as ContractModel
 from app.models.law_article import LawArticle as LawArticleModel
 from app.models.user import User
+from app.schemas.pagination import Page
 from app.schemas.query import ContractOut, LawArticleOut
+from app.services import law_search
 
 # 创建查询模块的路由器
 router = APIRouter()
 
+# 列表投影列：与 ContractOut / LawArticleOut 的字段一一对应
+_CONTRACT_COLUMNS = (
+    ContractModel.id,
+    ContractModel.title,
+    ContractModel.description,
+    ContractModel.status,
+    ContractModel.file_id,
+    ContractModel.created_at,
+)
+_LAW_COLUMNS = (
+    LawArticleModel.id,
+    LawArticleModel.law_name,
+    LawArticleModel.article_no,
+    LawArticleModel.content,
+    LawArticleModel.created_at,
+)
+
 
-@router.get("/contracts", response_model=list[ContractOut])
-def list_contracts(
+@router.get("/contracts", response_model=Page[ContractOut])
+async def list_contracts(
     q: str | None = Query(default=None, description="标题/描述关键字"),
     status: str | None = Query(default=None, description="合同状态过滤"),
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
-) -> list[ContractModel]:
+) -> Response:
     """
     查询合同列表
     
@@ -47,11 +74,12 @@ def list_contracts(
     【请求参数】
     - q: str | None - 搜索关键字（可选），在标题和描述中模糊查询
     - status: str | None - 状态过滤（可选），如 "draft"、"active" 等
-    - db: Session - 数据库会话（依赖注入）
+    - page: PageParams - 分页参数 cursor / limit（见 app/api/pagination.py）
+    - db: AsyncSession - 数据库会话（依赖注入）
     - current_user: User - 当前登录用户（依赖注入，需要 Token）
     
     【返回值】
-    list[ContractOut]: 合同信息列表
+    Page[ContractOut]: 分页信封 {items, next_cursor}，items 为合同信息列表
         - id: int - 合同ID
         - title: str - 合同标题
         - description: str | None - 合同描述
@@ -68,47 +96,52 @@ def list_contracts(
     default=None 设置默认值为 None，description 用于 API 文档
     """
     # 构建基础查询：只查询当前用户的合同
-    query = db.query(ContractModel).filter(ContractModel.user_id == current_user.id)
+    stmt = select(*_CONTRACT_COLUMNS).where(ContractModel.user_id == current_user.id)
     
     # 如果指定了状态，添加状态过滤条件
     if status:
-        query = query.filter(ContractModel.status == status)
+        stmt = stmt.where(ContractModel.status == status)
     
     # 如果指定了关键字，添加模糊查询条件
     if q:
         like = f"%{q}%"  # 构建 LIKE 模式：%关键字%
         # 使用 | 运算符组合 OR 条件（标题包含关键字 OR 描述包含关键字）
-        query = query.filter(
+        stmt = stmt.where(
             (ContractModel.title.like(like)) | (ContractModel.description.like(like))
         )
     
-    # 按 ID 降序返回结果（最新的在前）
-    return query.order_by(ContractModel.id.desc()).all()
+    # 按 (created_at, id) 降序游标分页（最新的在前）
+    rows, next_cursor = await paginate(
+        db, stmt, page, ContractModel.created_at, ContractModel.id, scalars=False
+    )
+    return page_response(rows_to_dicts(rows), next_cursor)
 
 
-@router.get("/laws", response_model=list[LawArticleOut])
-def search_laws(
+@router.get("/laws", response_model=Page[LawArticleOut])
+async def search_laws(
     keyword: str | None = Query(default=None, description="内容关键字"),
     law_name: str | None = Query(default=None, description="法律名称过滤"),
-    db: Session = Depends(get_db),
-) -> list[LawArticleModel]:
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
     """
     搜索法条
     
     【功能说明】
     搜索法条数据库，支持以下过滤条件：
     1. 法律名称：按法律名称精确过滤
-    2. 关键字搜索：在法条内容中模糊匹配
+    2. 关键字搜索：基于倒排索引的全文检索，按 BM25 相关度排序
     
     注意：此接口为公开接口，无需登录即可访问。
     
     【请求参数】
-    - keyword: str | None - 搜索关键字（可选），在法条内容中模糊查询
+    - keyword: str | None - 搜索关键字（可选），在法条内容中全文检索
     - law_name: str | None - 法律名称（可选），精确匹配
-    - db: Session - 数据库会话（依赖注入）
+    - page: PageParams - 分页参数 cursor / limit
+    - db: AsyncSession - 数据库会话（依赖注入）
     
     【返回值】
-    list[LawArticleOut]: 法条信息列表（最多返回50条）
+    Page[LawArticleOut]: 分页信封 {items, next_cursor}，items 为法条信息列表
         - id: int - 法条ID
         - law_name: str - 法律名称
         - article_no: str | None - 条款号
@@ -120,20 +153,40 @@ def search_laws(
     
     【设计说明】
     1. 此接口不需要认证，方便用户快速查询法条
-    2. 结果限制为50条，防止返回过多数据影响性能
+    2. 游标分页，每页最多 PAGE_SIZE_MAX 条，防止返回过多数据影响性能
+    3. 有关键字时结果按相关度排序（游标为 (得分, id)），无关键字时按 (created_at, id) 降序
     """
+    # 有可检索的关键字：走全文索引，先拿到按相关度排好序的法条 ID
+    if keyword and law_search.query_terms(keyword):
+        after = decode_rank_cursor(page.cursor) if page.cursor else None
+        # 检索服务为同步实现（FTS5 原生 SQL / 纯 Python 索引），通过 run_sync 在会话连接上执行
+        hits = await db.run_sync(
+            law_search.search, keyword, law_name=law_name, limit=page.limit + 1, after=after
+        )
+        next_cursor = None
+        if len(hits) > page.limit:
+            hits = hits[: page.limit]
+            next_cursor = encode_cursor(hits[-1][1], hits[-1][0])
+        ids = [article_id for article_id, _ in hits]
+        result = await db.execute(select(*_LAW_COLUMNS).where(LawArticleModel.id.in_(ids)))
+        articles = {a["id"]: a for a in rows_to_dicts(result.all())}
+        # IN 查询不保证顺序，按相关度顺序重新排列
+        return page_response([articles[i] for i in ids if i in articles], next_cursor)
+
     # 构建基础查询
-    query = db.query(LawArticleModel)
+    stmt = select(*_LAW_COLUMNS)
     
     # 如果指定了法律名称，添加精确过滤条件
     if law_name:
-        query = query.filter(LawArticleModel.law_name == law_name)
+        stmt = stmt.where(LawArticleModel.law_name == law_name)
     
-    # 如果指定了关键字，添加内容模糊查询条件
+    # 关键字只含标点等无法分词的字符时，退回模糊查询
     if keyword:
         like = f"%{keyword}%"
-        query = query.filter(LawArticleModel.content.like(like))
+        stmt = stmt.where(LawArticleModel.content.like(like))
     
-    # 按 ID 降序返回结果，限制最多返回50条
-    # limit(50) 相当于 SQL 的 LIMIT 50
-    return query.order_by(LawArticleModel.id.desc()).limit(50).all()
+    # 按 (created_at, id) 降序游标分页
+    rows, next_cursor = await paginate(
+        db, stmt, page, LawArticleModel.created_at, LawArticleModel.id, scalars=False
+    )
+    return page_response(rows_to_dicts(rows), next_cursor)
@@ -0,0 +1,44 @@
+"""
+=============================================================================
+文件: app/api/http_cache.py
+模块: HTTP 条件请求
+描述: ETag 比较与 304 响应的公共函数，供文件下载、律师缓存等接口共用
+=============================================================================
+
+【条件请求流程】
+1. 服务端在响应中返回 ETag（内容的摘要）
+2. 客户端再次请求时携带 If-None-Match: <上次的 ETag>
+3. 内容未变化时返回 304 Not Modified（无响应体），客户端使用本地缓存
+"""
+
+from fastapi import Request, Response
+
+from app.services.response_cache import CachedResponse
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 比较（弱比较：忽略 W/ 前缀），支持逗号分隔的多个值与 *。"""
+    if if_none_match.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == target for tag in if_none_match.split(","))
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """请求携带的 If-None-Match 是否与当前 ETag 匹配。"""
+    if_none_match = request.headers.get("if-none-match")
+    return bool(if_none_match) and etag_matches(if_none_match, etag)
+
+
+def cached_json_response(request: Request, cached: CachedResponse, cache_control: str) -> Response:
+    """
+    返回已序列化的 JSON 响应；If-None-Match 命中时返回 304
+
+    【参数说明】
+    - cached: CachedResponse - 响应体字节串与 ETag
+    - cache_control: str - Cache-Control 响应头，如 "public, max-age=30"
+    """
+    headers = {"ETag": cached.etag, "Cache-Control": cache_control}
+    if not_modified(request, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
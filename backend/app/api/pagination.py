@@ -0,0 +1,155 @@
+"""
+=============================================================================
+文件: app/api/pagination.py
+模块: 游标分页（Keyset Pagination）
+描述: 所有列表接口共用的分页层
+      使用 (created_at, id) 作为排序键，按"上一页最后一条"定位下一页
+=============================================================================
+
+【为什么不用 OFFSET】
+OFFSET n 需要数据库先扫描并丢弃前 n 行，翻页越深越慢；
+游标分页把上一页最后一行的 (created_at, id) 编码进游标，
+下一页查询变为 WHERE (created_at, id) < (上一页末行) ORDER BY created_at DESC, id DESC LIMIT n，
+配合索引每一页的代价都是常数。
+
+【游标格式】
+URL 安全的 Base64(JSON 数组)，如 ["2026-01-25T09:00:00", 42]，对客户端不透明。
+
+【使用示例】
+@router.get("", response_model=Page[ContractOut])
+async def list_contracts(page: PageParams = Depends(), db: AsyncSession = Depends(get_async_db)):
+    stmt = select(Contract).where(...)
+    items, next_cursor = await paginate(db, stmt, page, Contract.created_at, Contract.id)
+    return Page(items=items, next_cursor=next_cursor)
+"""
+
+import base64
+import json
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, Query
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+
+class PageParams:
+    """
+    分页查询参数（依赖注入类）
+
+    【参数说明】
+    - cursor: str | None - 上一页响应中的 next_cursor，首页不传
+    - limit: int - 每页条数，默认 PAGE_SIZE_DEFAULT，最大 PAGE_SIZE_MAX
+    """
+
+    def __init__(
+        self,
+        cursor: str | None = Query(default=None, description="分页游标（上一页的 next_cursor）"),
+        limit: int = Query(
+            default=settings.PAGE_SIZE_DEFAULT,
+            ge=1,
+            le=settings.PAGE_SIZE_MAX,
+            description="每页条数",
+        ),
+    ) -> None:
+        self.cursor = cursor
+        self.limit = limit
+
+
+def encode_cursor(*values: Any) -> str:
+    """将排序键编码为不透明游标；datetime 转为 ISO 字符串。"""
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int = 2) -> list:
+    """
+    解码游标
+
+    【异常情况】
+    - HTTP 400: 游标被篡改或格式不正确
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, UnicodeDecodeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+    return values
+
+
+def decode_keyset_cursor(cursor: str) -> tuple[datetime, int]:
+    """解码 (created_at, id) 游标。"""
+    created, row_id = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(created), int(row_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, int]:
+    """解码 (相关度得分, id) 游标，用于按相关度排序的搜索结果。"""
+    score, row_id = decode_cursor(cursor)
+    try:
+        return float(score), int(row_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+
+
+def apply_keyset(stmt: Select, page: PageParams, created_col, id_col) -> Select:
+    """
+    为查询加上 seek 条件、排序与 LIMIT（多取一条用于判断是否还有下一页）
+
+    【参数说明】
+    - stmt: Select - 已带业务过滤条件的查询
+    - created_col / id_col: 排序键列，如 Contract.created_at, Contract.id
+    """
+    if page.cursor:
+        created, row_id = decode_keyset_cursor(page.cursor)
+        # 行值比较 (created_at, id) < (?, ?)：与 (过滤列, created_at, id) 复合索引配合时是一次索引范围查找，
+        # 写成 created_at < ? OR (created_at = ? AND id < ?) 时只能从范围起点逐行过滤
+        stmt = stmt.where(tuple_(created_col, id_col) < tuple_(created, row_id))
+    return stmt.order_by(created_col.desc(), id_col.desc()).limit(page.limit + 1)
+
+
+def split_page(
+    rows: list, page: PageParams, key: Callable[[Any], tuple]
+) -> tuple[list, str | None]:
+    """
+    截取当前页并生成 next_cursor
+
+    【返回值】
+    tuple[list, str | None]: (当前页数据, 下一页游标)；没有下一页时游标为 None
+    """
+    if len(rows) <= page.limit:
+        return rows, None
+    rows = rows[: page.limit]
+    return rows, encode_cursor(*key(rows[-1]))
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    page: PageParams,
+    created_col,
+    id_col,
+    key: Callable[[Any], tuple] = lambda row: (row.created_at, row.id),
+    scalars: bool = True,
+) -> tuple[list, str | None]:
+    """
+    apply_keyset + 执行查询 + split_page 的便捷组合
+
+    【参数说明】
+    - scalars: 查询单个实体（如 select(Contract)）时为 True，返回实体对象；
+      多列投影时传 False，返回 Row
+    """
+    result = await db.execute(apply_keyset(stmt, page, created_col, id_col))
+    rows = result.scalars().all() if scalars else result.all()
+    return split_page(list(rows), page, key)
@@ -0,0 +1,62 @@
+"""
+=============================================================================
+文件: app/api/responses.py
+模块: JSON 响应快速路径
+描述: 基于 orjson 的 JSON 响应类，以及把投影查询结果直接编码为分页响应的辅助函数
+=============================================================================
+
+【为什么需要】
+接口声明 response_model 后，FastAPI 会把处理函数的返回值按模型重新校验一遍再序列化：
+ORM 对象逐个读取属性、逐字段校验，再输出 JSON。对每页上百行的列表接口，
+这部分耗时与 SQL 查询本身相当，而这些数据本来就来自我们自己的数据库，无需再校验。
+
+【快速路径】
+1. 列表接口只投影响应需要的列（select(*_XXX_COLUMNS)），得到 Row 而不是 ORM 对象
+2. rows_to_dicts 按列名把 Row 转为 dict（列名与响应模型字段名一致）
+3. page_response 用 orjson 直接编码为 {items, next_cursor} 并返回 Response，
+   FastAPI 对返回的 Response 不再校验与序列化；response_model 仍保留，用于 OpenAPI 文档
+
+【为什么不设为全局默认响应类】
+FastAPI 在声明 response_model 且未自定义响应类时，已由 pydantic-core 直接输出 JSON 字节；
+全局改用自定义响应类反而会关闭这一路径（先转 dict 再编码），其余接口因此变慢。
+所以 ORJSONResponse 只用于上述可信数据的列表接口。
+
+【使用方法】
+rows, next_cursor = await paginate(db, select(*_COLUMNS), page, ..., scalars=False)
+return page_response(rows_to_dicts(rows), next_cursor)
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from sqlalchemy.engine import Row
+
+# OPT_UTC_Z：带时区的 UTC 时间输出为 "...Z"，与 pydantic 的输出一致
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def dumps(content: Any) -> bytes:
+    """用 orjson 编码（datetime / date 输出为 ISO 8601 字符串，与 pydantic 相同）。"""
+    return orjson.dumps(content, option=_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """使用 orjson 编码的 JSONResponse。"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def rows_to_dicts(rows: Sequence[Row]) -> list[dict]:
+    """把投影查询的结果行转为 dict（键为列名 / label）。"""
+    if not rows:
+        return []
+    keys = rows[0]._fields
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def page_response(items: list[dict], next_cursor: str | None) -> ORJSONResponse:
+    """分页信封 {items, next_cursor}，结构与 schemas/pagination.py 的 Page 相同。"""
+    return ORJSONResponse({"items": items, "next_cursor": next_cursor})
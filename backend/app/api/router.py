@@ -11,18 +11,38 @@
 ├── /auth/      # 认证相关接口
 │   ├── POST /register  # 用户注册
 │   ├── POST /login     # 用户登录
-│   └── POST /token     # 获取 Token（OAuth2 标准格式）
+│   ├── POST /token     # 获取 Token（OAuth2 标准格式）
+│   └── GET /me         # 当前用户信息
+├── /cases/     # 案件接口
+│   ├── GET /                # 我参与的案件列表
+│   ├── POST /               # 新建案件
+│   ├── GET /{case_id}       # 案件详情
+│   └── PATCH /{case_id}     # 更新案件进展：状态、结案结果、进度（仅承办律师）
 ├── /files/     # 文件管理接口
-│   ├── POST /upload    # 上传文件
-│   └── GET /           # 获取文件列表
-└── /query/     # 数据查询接口
-    ├── GET /contracts  # 查询合同列表
-    └── GET /laws       # 查询法条列表
+│   ├── POST /upload              # 上传文件
+│   ├── GET /                     # 获取文件列表
+│   └── GET /{file_id}/content    # 下载文件内容（支持 ETag / Range）
+├── /lawyers/   # 律师接口
+│   ├── GET /                # 律师列表
+│   └── GET /{lawyer_id}     # 律师详情
+├── /feedback   # 反馈接口
+│   └── POST            # 提交反馈 / 评价律师
+├── /dashboard/ # 首页汇总
+│   └── GET /summary    # 案件、合同分状态计数
+├── /query/     # 数据查询接口
+│   ├── GET /contracts  # 查询合同列表
+│   └── GET /laws       # 查询法条列表
+├── /admin/     # 管理接口（仅管理员）
+│   ├── POST /laws/import  # 批量导入法条
+│   └── GET /usage         # 模型用量统计（读取汇总表）
+└── /batch      # 批量请求
+    └── POST            # 一次执行多个子请求，逐个返回状态码与响应体
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, FastAPI
 
-from app.api.endpoints import auth, cases, feedback, files, lawyers, query
+from app.api.endpoints import admin, auth, batch, cases, dashboard, feedback, files, lawyers, query
+from app.core.config import settings
 
 # 创建 API 主路由器
 # 类似于 Java Spring 中的 @RequestMapping 注解在控制器类上的效果
@@ -37,4 +57,29 @@ api_router.include_router(cases.router, prefix="/cases", tags=["cases"])
 api_router.include_router(files.router, prefix="/files", tags=["files"])
 api_router.include_router(lawyers.router, prefix="/lawyers", tags=["lawyers"])
 api_router.include_router(feedback.router, prefix="/feedback", tags=["feedback"])
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
 api_router.include_router(query.router, prefix="/query", tags=["query"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
+api_router.include_router(batch.router, prefix="/batch", tags=["batch"])
+
+
+_HTTP_METHODS = ("get", "post", "put", "patch", "delete")
+
+
+def api_routes(app: FastAPI) -> set[str]:
+    """
+    app 中 API_V1_STR 下的全部接口："METHOD /path"（路径去掉 API_V1_STR 前缀）
+
+    【注意事项】
+    取自 app.openapi() 的 paths：include_router 注册的子路由在 app.routes 中
+    被包装为一个整体（不是逐个 APIRoute），遍历 app.routes 取不到这些接口。
+    压测（scripts/benchmark.py）与查询计划检查（scripts/check_query_plans.py）据此检查覆盖率。
+    """
+    prefix = settings.API_V1_STR
+    return {
+        f"{method.upper()} {path[len(prefix):]}"
+        for path, operations in app.openapi()["paths"].items()
+        if path.startswith(prefix + "/")
+        for method in operations
+        if method in _HTTP_METHODS
+    }
@@ -8,6 +8,7 @@
 
 【子模块说明】
 - config.py: 应用配置类，管理环境变量和默认配置
+- metrics.py: 请求监控（每请求 SQL 条数与耗时，Server-Timing、JSON 日志、/metrics 直方图）
 
 【配置加载优先级】
 1. 环境变量（优先级最高）
@@ -0,0 +1,286 @@
+"""
+=============================================================================
+文件: app/core/metrics.py
+模块: 请求监控
+描述: 统计每个请求执行的 SQL 条数、数据库耗时与处理耗时，
+      通过 Server-Timing 响应头、结构化日志与 /metrics（Prometheus 文本格式）输出
+=============================================================================
+
+【工作原理】
+1. RequestMetricsMiddleware 为每个 HTTP 请求创建一个 RequestStats，放入 contextvar
+2. instrument_engine 在引擎上注册 before_cursor_execute / after_cursor_execute 事件，
+   每条 SQL 执行完成后把条数与耗时累加到当前请求的 RequestStats
+   （异步会话的 greenlet、run_in_threadpool 的线程都会继承 contextvar，统计不会丢失）
+3. 响应头发出时写入 Server-Timing：db（数据库耗时与 SQL 条数）、app（处理到开始响应的耗时）
+4. 响应结束后按路由模板（如 /api/v1/cases/{case_id}）记入直方图；耗时不低于 REQUEST_LOG_SLOW_MS 的慢请求另输出一行 JSON 日志
+
+【组件状态指标】
+register_stats(prefix, stats, counters) 登记一个返回 {名称: 数值} 的函数（如缓存、线程池、队列的 stats()），
+/metrics 输出时调用：counters 中的键输出为 <prefix>_<名称>_total（counter），其余为 <prefix>_<名称>（gauge）。
+
+【输出示例】
+Server-Timing: db;dur=1.84;desc="3 queries", app;dur=6.21
+日志: {"method": "GET", "route": "/api/v1/cases", "status": 200, "duration_ms": 6.9, "db_ms": 1.84, "db_statements": 3, ...}
+/metrics: http_request_duration_seconds_bucket{method="GET",route="/api/v1/cases",le="0.01"} 42
+
+【注意事项】
+- 指标保存在进程内存中，多 worker 部署时每个 worker 各自统计，由 Prometheus 按实例抓取后汇总
+- 未匹配到路由的请求（404）统一记为 route="unmatched"，避免路径参数导致标签无限增长
+"""
+
+import json
+import logging
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.request")
+
+# 直方图分桶（秒 / 条），与 Prometheus 客户端的默认分桶接近
+_DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+@dataclass
+class RequestStats:
+    """单个请求的统计：SQL 条数与数据库耗时（秒）。"""
+
+    statements: int = 0
+    db_seconds: float = 0.0
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+# ======================== SQL 事件 ========================
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["metrics_started"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+def _handle_error(exception_context) -> None:
+    """执行失败时不会触发 after_cursor_execute，弹出对应的开始时间。"""
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("metrics_started"):
+        conn.info["metrics_started"].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """在同步引擎上注册计时事件（异步引擎传入 async_engine.sync_engine）。"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+# ======================== 直方图 ========================
+
+
+class Histogram:
+    """
+    按标签分组的直方图（Prometheus histogram 语义：le 为累计计数）
+
+    只在事件循环线程中更新与输出，无需加锁。
+    """
+
+    def __init__(self, name: str, help_text: str, buckets: tuple) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}  # labels -> [各桶计数..., +Inf 计数, sum]
+
+    def observe(self, labels: tuple, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self, label_names: tuple) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base}}} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative}")
+        return lines
+
+    def clear(self) -> None:
+        self._series.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_LABELS = ("method", "route")
+_requests_total: dict[tuple, int] = {}  # (method, route, status) -> 次数
+request_duration = Histogram("http_request_duration_seconds", "请求总耗时（秒）", _DURATION_BUCKETS)
+request_db_duration = Histogram("http_request_db_seconds", "请求内数据库耗时（秒）", _DURATION_BUCKETS)
+request_db_statements = Histogram("http_request_db_statements", "请求内执行的 SQL 条数", _STATEMENT_BUCKETS)
+
+
+def record(method: str, route: str, status: int, duration: float, stats: RequestStats) -> None:
+    """把一个已完成的请求记入各项指标。"""
+    key = (method, route, str(status))
+    _requests_total[key] = _requests_total.get(key, 0) + 1
+    labels = (method, route)
+    request_duration.observe(labels, duration)
+    request_db_duration.observe(labels, stats.db_seconds)
+    request_db_statements.observe(labels, stats.statements)
+
+
+# 组件状态指标：(前缀, 说明, 取值函数, 计数器键)
+_stats_sources: list[tuple[str, str, Callable[[], dict], frozenset[str]]] = []
+
+
+def register_stats(prefix: str, help_text: str, stats: Callable[[], dict], counters: tuple[str, ...] = ()) -> None:
+    """
+    登记一组组件状态指标，/metrics 输出时调用 stats() 读取
+
+    【参数说明】
+    - prefix: 指标名前缀，如 password_hash_pool
+    - stats: 返回 {名称: 数值} 的函数；非数值的项忽略
+    - counters: 只增不减的键（输出为 <prefix>_<名称>_total），其余按 gauge 输出
+    """
+    _stats_sources[:] = [s for s in _stats_sources if s[0] != prefix]
+    _stats_sources.append((prefix, help_text, stats, frozenset(counters)))
+
+
+def _render_stats() -> list[str]:
+    lines = []
+    for prefix, help_text, stats, counters in _stats_sources:
+        for key, value in stats().items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f"{prefix}_{key}_total" if key in counters else f"{prefix}_{key}"
+            lines.append(f"# HELP {name} {help_text}：{key}")
+            lines.append(f"# TYPE {name} {'counter' if key in counters else 'gauge'}")
+            lines.append(f"{name} {value}")
+    return lines
+
+
+def render_prometheus() -> str:
+    """以 Prometheus 文本格式（0.0.4）输出全部指标。"""
+    lines = ["# HELP http_requests_total 请求次数", "# TYPE http_requests_total counter"]
+    for (method, route, status), count in sorted(_requests_total.items()):
+        lines.append(
+            f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}'
+        )
+    for histogram in (request_duration, request_db_duration, request_db_statements):
+        lines.extend(histogram.render(_LABELS))
+    lines.extend(_render_stats())
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    """清空全部指标（测试与压测脚本使用）。"""
+    _requests_total.clear()
+    for histogram in (request_duration, request_db_duration, request_db_statements):
+        histogram.clear()
+
+
+def configure_request_log() -> None:
+    """请求日志未配置处理器时（如直接用 uvicorn 启动），输出到标准错误，每个请求一行 JSON。"""
+    logger.setLevel(logging.INFO)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+
+
+# ======================== 中间件 ========================
+
+
+def _route_template(scope: Scope) -> str:
+    """
+    取请求匹配到的完整路径模板（如 /api/v1/cases/{case_id}），作为指标标签
+
+    路由匹配后 scope 中会有 route；include_router 的子路由在新版 FastAPI 中不再展开，
+    route 只带子路由内的相对路径，完整路径在 scope["fastapi"]["effective_route_context"] 中。
+    """
+    for candidate in (scope.get("fastapi", {}).get("effective_route_context"), scope.get("route")):
+        template = getattr(candidate, "path_format", None)
+        if template:
+            return template
+    return "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """
+    请求计时中间件（纯 ASGI 实现，不包装请求 / 响应对象，开销只有几次计时调用）
+
+    【使用方法】
+    app.add_middleware(RequestMetricsMiddleware)   # 最后添加，位于最外层
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        state = {"status": 500, "app_seconds": 0.0}
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                state["app_seconds"] = time.perf_counter() - started
+                if settings.SERVER_TIMING_ENABLED:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing",
+                        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.statements} queries", '
+                        f"app;dur={state['app_seconds'] * 1000:.2f}",
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            duration = time.perf_counter() - started
+            _current.reset(token)
+            route_path = _route_template(scope)
+            record(scope["method"], route_path, state["status"], duration, stats)
+            if settings.REQUEST_LOG_ENABLED and duration * 1000 >= settings.REQUEST_LOG_SLOW_MS:
+                logger.info(
+                    json.dumps(
+                        {
+                            "method": scope["method"],
+                            "route": route_path,
+                            "path": scope["path"],
+                            "status": state["status"],
+                            "duration_ms": round(duration * 1000, 2),
+                            "app_ms": round(state["app_seconds"] * 1000, 2),
+                            "db_ms": round(stats.db_seconds * 1000, 2),
+                            "db_statements": stats.statements,
+                        },
+                        ensure_ascii=False,
+                    )
+                )
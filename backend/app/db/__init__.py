@@ -9,6 +9,7 @@
 【子模块说明】
 - base.py: SQLAlchemy 声明式基类，所有模型都继承自它
 - session.py: 数据库引擎和会话管理
+- migrations.py: 版本化迁移（schema_version），由 scripts/migrate.py 或启动时执行
 
 【技术栈】
 - SQLAlchemy 2.0: Python 最流行的 ORM 框架
@@ -0,0 +1,200 @@
+"""
+=============================================================================
+文件: app/db/migrations.py
+模块: 数据库版本化迁移
+描述: 按版本号顺序执行数据库结构变更，并在 schema_version 表中记录已执行的版本
+=============================================================================
+
+【为什么需要】
+原先每次启动 init_db 都要：create_all 逐表探测、PRAGMA table_info 探测 SQLite 缺失列再 ALTER、
+统计法条全文索引与律师分类索引的行数。这些检查在结构早已就绪时也全部重做，
+表越多、数据越多启动越慢，多个 worker 同时启动还会重复执行同样的探测。
+
+【工作方式】
+1. MIGRATIONS：(版本号, 说明, 函数) 列表，版本号从 1 连续递增；函数在迁移所在事务的连接上执行
+2. migrate(engine)：
+   - create_all 创建缺失的表（新库直接得到最新结构，之后的迁移应为空操作）
+   - 依次执行高于当前版本的迁移，迁移与它的 schema_version 行在同一事务中提交
+   - 确保法条全文索引、律师分类索引与数据一致
+3. current_version(engine)：一条查询读出当前版本，schema_version 表不存在时为 0
+
+启动时（session.init_db）先比较 current_version 与 SCHEMA_VERSION，一致则跳过以上全部检查，
+见 config.py 的 DB_SCHEMA_STARTUP。生产环境建议部署时执行一次 scripts/migrate.py。
+
+【新增迁移】
+在 MIGRATIONS 末尾追加 (SCHEMA_VERSION + 1, "说明", 函数)。
+函数必须幂等：新库上 create_all 已建出最新结构，迁移不能因列或索引已存在而报错。
+"""
+
+import logging
+from collections.abc import Callable
+
+from sqlalchemy import Index, func, inspect, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.db.base import Base
+
+logger = logging.getLogger(__name__)
+
+
+def _add_columns(conn: Connection, table: str, columns: list[tuple[str, str]]) -> None:
+    """为已有表补充缺失的列（列已存在时跳过）。"""
+    existing = {c["name"] for c in inspect(conn).get_columns(table)}
+    for name, spec in columns:
+        if name not in existing:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {spec}"))
+
+
+def _m001_user_and_file_columns(conn: Connection) -> None:
+    """早期数据库的 users 表没有 role/avatar/phone 列，uploaded_files 表没有 sha256 列。"""
+    _add_columns(
+        conn, "users", [("role", "VARCHAR(20)"), ("avatar", "VARCHAR(500)"), ("phone", "VARCHAR(20)")]
+    )
+    _add_columns(conn, "uploaded_files", [("sha256", "VARCHAR(64)")])
+
+
+def _replace_indexes(conn: Connection, table: str, create: list[str], drop: list[tuple[str, str]]) -> None:
+    """
+    按模型定义创建复合索引，并删除被它们取代的单列索引
+
+    【参数说明】
+    - create: 模型 __table_args__ 中的索引名（已存在时跳过）
+    - drop: (索引名, 列名)，不存在时跳过
+    """
+    t = Base.metadata.tables[table]
+    existing = {ix["name"] for ix in inspect(conn).get_indexes(table)}
+    for index in t.indexes:
+        if index.name in create and index.name not in existing:
+            index.create(conn)
+    for name, column in drop:
+        if name in existing:
+            Index(name, t.c[column]).drop(conn)
+
+
+def _m002_list_indexes(conn: Connection) -> None:
+    """列表接口的 "按某列过滤 + 按 (created_at, id) 倒序" 改用复合索引，避免临时排序。"""
+    _replace_indexes(conn, "contracts", ["ix_contracts_user_created"], [("ix_contracts_user_id", "user_id")])
+    _replace_indexes(
+        conn, "uploaded_files", ["ix_uploaded_files_user_created"], [("ix_uploaded_files_user_id", "user_id")]
+    )
+    _replace_indexes(
+        conn,
+        "law_articles",
+        ["ix_law_articles_law_created", "ix_law_articles_created"],
+        [("ix_law_articles_law_name", "law_name")],
+    )
+    _replace_indexes(conn, "users", ["ix_users_role_created"], [("ix_users_role", "role")])
+
+
+def _m003_case_participants(conn: Connection) -> None:
+    """case_participants 表由 create_all 创建，这里按已有案件回填参与人。"""
+    from app.services import case_participants
+
+    case_participants.rebuild(conn)
+
+
+def _m004_dashboard_counters(conn: Connection) -> None:
+    """dashboard_counters 表由 create_all 创建，这里按已有案件与合同回填计数。"""
+    from app.services import dashboard_counters
+
+    dashboard_counters.reconcile(conn)
+
+
+def _m005_lawyer_stats(conn: Connection) -> None:
+    """
+    cases 增加结案结果 outcome，feedbacks 增加被评价律师与评分（lawyer_stats 表由 create_all 创建）。
+
+    这里不重建 lawyer_stats：rebuild() 按最新模型查询 feedbacks.case_id，该列到迁移 6 才增加，
+    由迁移 6 在补齐列之后重建。
+    """
+    _add_columns(conn, "cases", [("outcome", "VARCHAR(16)")])
+    _add_columns(conn, "feedbacks", [("lawyer_id", "INTEGER REFERENCES users (id)"), ("rating", "INTEGER")])
+
+
+def _m006_feedback_case(conn: Connection) -> None:
+    """feedbacks 增加评价所依据的案件 case_id（每个案件只能评价一次）；没有案件的旧评分不再计入律师统计。"""
+    from app.services import lawyer_stats
+
+    _add_columns(conn, "feedbacks", [("case_id", "INTEGER REFERENCES cases (id)")])
+    _replace_indexes(conn, "feedbacks", ["uq_feedbacks_case"], [])
+    lawyer_stats.rebuild(conn)
+
+
+def _m007_dashboard_reconcile(conn: Connection) -> None:
+    """首页计数对账改用自己的锁行（dashboard_reconcile 表由 create_all 创建），删除它在 rollup_state 中的旧行。"""
+    state = Base.metadata.tables["rollup_state"]
+    lock = Base.metadata.tables["dashboard_reconcile"]
+    old = conn.execute(select(state.c.updated_at).where(state.c.name == "dashboard_counters")).first()
+    if old is None:
+        return
+    if conn.execute(select(lock.c.id).where(lock.c.id == 1)).first() is None:
+        conn.execute(insert(lock).values(id=1, reconciled_at=old.updated_at))
+    conn.execute(state.delete().where(state.c.name == "dashboard_counters"))
+
+
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "users 增加 role/avatar/phone，uploaded_files 增加 sha256", _m001_user_and_file_columns),
+    (2, "列表接口的复合索引（过滤列, created_at, id），替换对应的单列索引", _m002_list_indexes),
+    (3, "案件参与人表 case_participants，按已有案件回填", _m003_case_participants),
+    (4, "首页计数表 dashboard_counters，按已有案件与合同回填", _m004_dashboard_counters),
+    (5, "律师统计表 lawyer_stats；cases.outcome、feedbacks.lawyer_id/rating", _m005_lawyer_stats),
+    (6, "feedbacks 增加 case_id（唯一），律师评分只统计有案件的评价", _m006_feedback_case),
+    (7, "首页计数对账的锁行移到 dashboard_reconcile 表，不再借用 rollup_state", _m007_dashboard_reconcile),
+]
+
+# 代码期望的数据库结构版本
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(engine: Engine) -> int:
+    """数据库当前的结构版本；schema_version 表不存在（未迁移过的库）时返回 0。"""
+    from app.models.schema_version import SchemaVersion
+
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(func.max(SchemaVersion.version))).scalar() or 0
+    except DBAPIError:
+        return 0
+
+
+def pending(engine: Engine) -> list[tuple[int, str]]:
+    """尚未执行的迁移：[(版本号, 说明), ...]。"""
+    version = current_version(engine)
+    return [(v, desc) for v, desc, _ in MIGRATIONS if v > version]
+
+
+def migrate(engine: Engine) -> int:
+    """
+    把数据库迁移到 SCHEMA_VERSION，并确保全文索引与律师分类索引就绪
+
+    【返回值】
+    int: 本次执行的迁移个数
+
+    【注意事项】
+    每个迁移在单独的事务中执行；某个迁移失败时已提交的迁移保留，重新执行会从失败处继续。
+    多个进程同时迁移时，后提交者在写入 schema_version 时主键冲突而回滚；
+    多 worker 部署应在启动前单独执行 scripts/migrate.py。
+    """
+    from app import models  # noqa: F401 (导入以注册全部模型)
+    from app.models.schema_version import SchemaVersion
+    from app.services import law_search, lawyer_index
+
+    Base.metadata.create_all(bind=engine)
+
+    applied = 0
+    for version, description, upgrade in MIGRATIONS:
+        with engine.begin() as conn:
+            done = conn.execute(select(func.max(SchemaVersion.version))).scalar() or 0
+            if version <= done:
+                continue
+            logger.info("执行数据库迁移 %d：%s", version, description)
+            upgrade(conn)
+            conn.execute(insert(SchemaVersion), {"version": version, "description": description})
+        applied += 1
+
+    # 法条全文索引（SQLite FTS5 虚拟表，或纯 Python 倒排索引）
+    law_search.init_index(engine)
+    # 律师分类/标签索引：升级前已有律师数据时全量构建一次
+    lawyer_index.ensure(engine)
+    return applied
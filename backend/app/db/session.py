@@ -15,15 +15,83 @@
 - Engine 类似于 DataSource（数据源/连接池）
 - Session 类似于 JPA 的 EntityManager
 - SessionLocal 类似于 EntityManagerFactory
+
+【同步 / 异步两条路径】
+1. 同步：engine + SessionLocal + get_db，供 init_db、脚本使用
+2. 异步：async_engine + AsyncSessionLocal + get_async_db，供所有接口使用
+   - DB_ASYNC=True（默认）：AsyncSession（SQLite 使用 aiosqlite 驱动），
+     数据库 I/O 不占用线程，单个 worker 可同时挂起大量 I/O 密集请求
+   - DB_ASYNC=False：get_async_db 返回 SyncSessionAdapter，
+     以相同的 await 接口在线程池中驱动同步 Session，适合未安装异步驱动的 SQLite 开发环境
+
+【连接池与 SQLite 调优】
+两个引擎使用相同的连接池参数（DB_POOL_SIZE 等，见 config.py）。
+SQLite 的每个新连接都会执行 PRAGMA：journal_mode=WAL、synchronous、busy_timeout、
+mmap_size、cache_size。WAL 让读不阻塞写、写不阻塞读，
+并发写入（上传、反馈）在 busy_timeout 内排队等待，而不是立即抛出 "database is locked"。
+
+【请求监控】
+两个引擎都注册了 SQL 计时事件（core/metrics.py），每个请求的 SQL 条数与数据库耗时
+通过 Server-Timing 响应头、请求日志与 /metrics 输出。
 """
 
-from collections.abc import Generator
+import logging
+from collections.abc import AsyncGenerator, AsyncIterator, Generator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 
+from app.core import metrics
 from app.core.config import settings
-from app.db.base import Base
+
+logger = logging.getLogger(__name__)
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    """内存库（sqlite:// 或 :memory:）使用单连接池，不支持连接池大小等参数。"""
+    return _is_sqlite(url) and (url.split("://", 1)[-1] in ("", "/") or ":memory:" in url)
+
+
+def _pool_options(url: str) -> dict:
+    """由配置生成连接池参数（create_engine / create_async_engine 共用）。"""
+    options: dict = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if _is_sqlite_memory(url):
+        return options
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    SQLite 连接建立时执行的 PRAGMA（"connect" 事件回调）
+
+    【注意事项】
+    journal_mode=WAL 会持久化到数据库文件；内存库不支持 WAL，会保持 memory 模式。
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        if settings.SQLITE_WAL:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    finally:
+        cursor.close()
+
 
 # ======================== 创建数据库引擎 ========================
 # create_engine 创建数据库引擎（连接池）
@@ -32,12 +100,18 @@ from app.db.base import Base
 # - connect_args: 额外的连接参数
 #   - check_same_thread=False: SQLite 专用参数，允许多线程访问
 #     （SQLite 默认不允许跨线程使用连接，但 FastAPI 是多线程的）
+# - _pool_options: 连接池大小、溢出、超时、回收与 pre-ping（见 config.py）
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args={"check_same_thread": False}  # 仅 SQLite 需要此参数
-    if settings.DATABASE_URL.startswith("sqlite")
+    if _is_sqlite(settings.DATABASE_URL)
     else {},  # 其他数据库不需要此参数
+    **_pool_options(settings.DATABASE_URL),
 )
+if _is_sqlite(settings.DATABASE_URL):
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+# 每条 SQL 的条数与耗时计入当前请求（见 core/metrics.py）
+metrics.instrument_engine(engine)
 
 # ======================== 创建会话工厂 ========================
 # sessionmaker 创建一个会话工厂类
@@ -48,21 +122,56 @@ engine = create_engine(
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 
+def _to_async_url(url: str) -> str:
+    """把同步驱动的连接串换成对应的异步驱动（已指定异步驱动的保持不变）。"""
+    for sync_prefix, async_prefix in (
+        ("sqlite://", "sqlite+aiosqlite://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("mysql://", "mysql+aiomysql://"),
+        ("mysql+pymysql://", "mysql+aiomysql://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+
+# ======================== 创建异步引擎 ========================
+# 仅在 DB_ASYNC=True 时创建，避免未安装异步驱动时导入失败
+# expire_on_commit=False: 提交后不让对象过期，
+#   否则在响应序列化时访问属性会触发隐式 I/O（异步会话中不允许）
+_ASYNC_URL = settings.ASYNC_DATABASE_URL or _to_async_url(settings.DATABASE_URL)
+async_engine = (
+    create_async_engine(_ASYNC_URL, **_pool_options(_ASYNC_URL)) if settings.DB_ASYNC else None
+)
+if async_engine is not None and _is_sqlite(_ASYNC_URL):
+    # 异步引擎的事件注册在其内部的同步引擎上
+    event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+if async_engine is not None:
+    metrics.instrument_engine(async_engine.sync_engine)
+AsyncSessionLocal = (
+    async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None
+    else None
+)
+
+
 def init_db() -> None:
     """
     初始化数据库
     
     【功能说明】
-    创建所有在 Base 上注册的模型对应的数据库表。
-    如果表已存在则跳过，不会删除现有数据。
+    确保数据库结构与代码一致（建表、版本化迁移、全文索引与律师分类索引，见 db/migrations.py）。
+    表已存在则跳过，不会删除现有数据。
     
     【调用时机】
     通常在应用启动时调用（见 main.py 的 startup 事件）
     
-    【实现原理】
-    1. 导入 models 模块，触发所有模型类的定义
-    2. 模型类继承 Base 时会自动注册到 Base.metadata
-    3. create_all() 根据 metadata 中的表定义创建表
+    【启动模式】（DB_SCHEMA_STARTUP）
+    - auto（默认）：schema_version 已是 SCHEMA_VERSION 时跳过建表探测与全部结构检查，
+      只用一条查询读版本号；版本落后（含从未迁移过的库）时在启动时执行迁移
+    - check：版本落后时拒绝启动，提示先执行 scripts/migrate.py（多 worker 部署）
+    - full：每次启动都完整执行 migrate()
     
     【返回值】
     None
@@ -74,31 +183,29 @@ def init_db() -> None:
     # 导入 models 模块，确保所有模型类都被加载和注册
     # 这一步是必须的，否则 Base.metadata 中不会有任何表定义
     from app import models  # noqa: F401 (忽略"导入但未使用"的警告)
+    from app.db import migrations
+    from app.services import law_search
+
+    mode = settings.DB_SCHEMA_STARTUP
+    if mode == "full":
+        migrations.migrate(engine)
+        return
 
-    # 根据所有已注册的模型创建数据库表
-    # checkfirst=True（默认）: 如果表已存在则跳过
-    Base.metadata.create_all(bind=engine)
-
-    # SQLite 已有表不会自动加新列，为 users 表补充 role/avatar/phone 列（幂等）
-    if settings.DATABASE_URL.startswith("sqlite"):
-        from sqlalchemy import text
-        with engine.connect() as conn:
-            try:
-                r = conn.execute(text("PRAGMA table_info(users)"))
-                cols = [row[1] for row in r.fetchall()]
-            except Exception:
-                cols = []
-            for col, spec in [
-                ("role", "VARCHAR(20)"),
-                ("avatar", "VARCHAR(500)"),
-                ("phone", "VARCHAR(20)"),
-            ]:
-                if col not in cols:
-                    try:
-                        conn.execute(text(f"ALTER TABLE users ADD COLUMN {col} {spec}"))
-                        conn.commit()
-                    except Exception:
-                        pass
+    version = migrations.current_version(engine)
+    if version < migrations.SCHEMA_VERSION:
+        if mode == "check":
+            raise RuntimeError(
+                f"数据库结构版本为 {version}，需要 {migrations.SCHEMA_VERSION}，"
+                "请先执行 python scripts/migrate.py"
+            )
+        migrations.migrate(engine)
+        return
+    if version > migrations.SCHEMA_VERSION:
+        logger.warning(
+            "数据库结构版本 %d 高于代码版本 %d，可能正在滚动升级", version, migrations.SCHEMA_VERSION
+        )
+    # 结构已是最新：只选择法条检索后端，不建表、不核对索引
+    law_search.init_index(engine, ensure=False)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -143,3 +250,121 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         # 无论如何都会执行：关闭会话，释放数据库连接
         db.close()
+
+
+class SyncSessionAdapter:
+    """
+    同步 Session 的异步外观（DB_ASYNC=False 时由 get_async_db 返回）
+
+    【功能说明】
+    提供与 AsyncSession 相同的常用方法（execute / scalar / get / commit / refresh / run_sync 等），
+    内部在线程池中调用同步 Session，使接口代码只需按 AsyncSession 的写法编写一次。
+
+    【注意事项】
+    execute 返回的结果在线程池中已全部取出（freeze），与 AsyncSession 的缓冲结果行为一致。
+    """
+
+    def __init__(self, session: Session) -> None:
+        self.sync_session = session
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances) -> None:
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement, params=None, **kw):
+        def _execute():
+            return self.sync_session.execute(statement, params, **kw).freeze()()
+
+        return await run_in_threadpool(_execute)
+
+    async def scalar(self, statement, params=None, **kw):
+        return await run_in_threadpool(self.sync_session.scalar, statement, params, **kw)
+
+    async def scalars(self, statement, params=None, **kw):
+        return (await self.execute(statement, params, **kw)).scalars()
+
+    async def get(self, entity, ident, **kw):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kw)
+
+    async def delete(self, instance) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def refresh(self, instance, **kw) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, **kw)
+
+    async def run_sync(self, fn, *args, **kw):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kw)
+
+    def expunge_all(self) -> None:
+        self.sync_session.expunge_all()
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+# 批量请求中依次执行的子请求共用批量请求自身的会话（见 shared_session）
+_shared_session: ContextVar[AsyncSession | SyncSessionAdapter | None] = ContextVar(
+    "shared_session", default=None
+)
+
+
+@asynccontextmanager
+async def shared_session(session: AsyncSession | SyncSessionAdapter) -> AsyncIterator[None]:
+    """
+    在当前上下文中让 get_async_db 返回给定的会话（用完不关闭），供批量请求的子请求复用
+
+    【注意事项】
+    会话不能被并发使用：只在同一时刻只有一个子请求执行时共享。
+    退出时清空会话并回滚未提交的改动，下一个子请求看到的是数据库中的最新数据。
+    """
+    token = _shared_session.set(session)
+    try:
+        yield
+    finally:
+        _shared_session.reset(token)
+        # 先移出对象再回滚：回滚会让会话中的对象过期，移出后已加载的数据（如当前用户）仍可访问
+        session.expunge_all()
+        await session.rollback()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    获取异步数据库会话（依赖注入函数，接口统一使用）
+
+    【返回值】
+    AsyncGenerator[AsyncSession, None]: DB_ASYNC=True 时为 AsyncSession，
+    否则为接口兼容的 SyncSessionAdapter
+
+    【使用示例】
+    @router.get("/users")
+    async def get_users(db: AsyncSession = Depends(get_async_db)):
+        return (await db.execute(select(User))).scalars().all()
+
+    【注意事项】
+    异步会话中不能触发懒加载（如 case.lawyer），关联数据需在查询中 JOIN 或预加载。
+    在 shared_session 中（批量请求的子请求）返回共享的会话，不新建也不关闭。
+    """
+    shared = _shared_session.get()
+    if shared is not None:
+        yield shared
+        return
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield session
+        return
+    adapter = SyncSessionAdapter(SessionLocal(expire_on_commit=False))
+    try:
+        yield adapter
+    finally:
+        await adapter.close()
@@ -7,12 +7,19 @@
 =============================================================================
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 
 from app.api.router import api_router
+from app.core import metrics
 from app.core.config import settings
-from app.db.session import init_db
+from app.db.session import async_engine, engine, init_db
+from app.services import ai_service, dashboard_counters, usage_rollup
+from app.services.auth_cache import auth_cache
+from app.services.model_call_logger import model_call_logger
+from app.services.security import PasswordHasherBusy, password_pool_stats, shutdown_password_pool
 
 
 def create_app() -> FastAPI:
@@ -23,8 +30,9 @@ def create_app() -> FastAPI:
     1. 创建 FastAPI 应用，设置项目名称和版本
     2. 配置 CORS（跨域资源共享）中间件，允许前端跨域访问
     3. 注册启动事件，在应用启动时初始化数据库
-    4. 添加健康检查端点
+    4. 添加健康检查端点与监控指标端点
     5. 注册 API 路由
+    6. 添加请求计时中间件（SQL 条数、数据库耗时，见 core/metrics.py）
     
     【返回值】
     FastAPI: 配置完成的 FastAPI 应用实例
@@ -47,7 +55,7 @@ def create_app() -> FastAPI:
         )
 
     @app.on_event("startup")
-    def _startup() -> None:
+    async def _startup() -> None:
         """
         应用启动事件处理器
         
@@ -55,9 +63,35 @@ def create_app() -> FastAPI:
         FastAPI 应用启动时自动调用
         
         【功能说明】
-        调用 init_db() 初始化数据库，创建所有表结构
+        1. 调用 init_db() 检查数据库结构版本，版本落后时建表并执行迁移（见 db/migrations.py）
+        2. 在线程池中清理已过期的模型响应缓存（同步删除，缓存表很大时不阻塞事件循环）
+        3. 启动模型调用日志的后台写入任务、用量定时汇总与首页计数定时对账
         """
         init_db()
+        await run_in_threadpool(ai_service.purge_expired)
+        model_call_logger.start()
+        usage_rollup.start(engine)
+        dashboard_counters.start(engine)
+
+    @app.on_event("shutdown")
+    async def _shutdown() -> None:
+        """应用关闭事件处理器：写完排队的模型调用日志，等待进行中的密码哈希任务结束，关闭连接池。"""
+        await ai_service.aclose()
+        await usage_rollup.stop()
+        await dashboard_counters.stop()
+        await model_call_logger.stop()
+        shutdown_password_pool()
+        if async_engine is not None:
+            await async_engine.dispose()
+
+    @app.exception_handler(PasswordHasherBusy)
+    async def _password_hasher_busy(request: Request, exc: PasswordHasherBusy) -> JSONResponse:
+        """密码哈希线程池排队已满：返回 503，提示客户端稍后重试。"""
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "服务繁忙，请稍后重试"},
+            headers={"Retry-After": "1"},
+        )
 
     @app.get("/health")
     def health() -> dict:
@@ -72,8 +106,51 @@ def create_app() -> FastAPI:
         """
         return {"status": "ok"}
 
+    if settings.METRICS_ENABLED:
+        # 组件状态指标：排队深度、拒绝次数等，随请求指标一同输出
+        metrics.register_stats(
+            "password_hash_pool",
+            "密码哈希线程池",
+            password_pool_stats,
+            counters=("completed", "rejected"),
+        )
+        metrics.register_stats(
+            "model_call_log",
+            "模型调用记录写入队列",
+            model_call_logger.stats,
+            counters=("written", "batches", "dropped", "failed"),
+        )
+        metrics.register_stats(
+            "model_response_cache",
+            "模型响应缓存",
+            ai_service.cache_stats,
+            counters=("memory_hits", "db_hits", "shared", "misses"),
+        )
+        metrics.register_stats(
+            "auth_cache", "认证缓存", auth_cache.stats, counters=("hits", "misses", "invalidations")
+        )
+
+        @app.get("/metrics", response_class=PlainTextResponse)
+        def prometheus_metrics() -> PlainTextResponse:
+            """
+            监控指标端点（Prometheus 文本格式）
+
+            【返回值】
+            按路由统计的请求次数，总耗时、数据库耗时、SQL 条数的直方图，
+            以及 register_stats 登记的组件状态（如密码哈希线程池的排队深度与拒绝次数）
+            """
+            return PlainTextResponse(
+                metrics.render_prometheus(), media_type="text/plain; version=0.0.4"
+            )
+
     # 注册 API 路由，所有接口都以 /api/v1 为前缀
     app.include_router(api_router, prefix=settings.API_V1_STR)
+
+    # 请求计时中间件最后添加，位于最外层，统计的耗时包含其余中间件
+    if settings.METRICS_ENABLED:
+        if settings.REQUEST_LOG_ENABLED:
+            metrics.configure_request_log()
+        app.add_middleware(metrics.RequestMetricsMiddleware)
     return app
 
 
@@ -9,9 +9,17 @@
 【子模块说明】
 - user.py: 用户模型 - 存储用户账户信息
 - uploaded_file.py: 上传文件模型 - 存储文件元数据
+- file_blob.py: 文件内容块模型 - 按内容摘要去重存储，带引用计数
 - contract.py: 合同模型 - 存储合同信息
 - law_article.py: 法条模型 - 存储法律条文
 - model_call_log.py: 模型调用日志 - 记录AI模型调用情况
+- model_response_cache.py: 模型响应缓存 - 相同模型/prompt/参数的调用结果
+- model_usage_rollup.py: 模型用量汇总 - 按小时/天汇总的调用次数、Token 与耗时分布，及汇总进度
+- lawyer_facet.py: 律师分类/标签索引 - 由 LawyerProfile 的 JSON 列展开，供列表过滤
+- lawyer_stat.py: 律师统计 - 案件数、胜诉与评分计数，随案件/反馈写入同步，供律师列表/详情的 stats
+- case_participant.py: 案件参与人 - 用户以律师/客户角色参与案件，供案件列表按参与人查询
+- dashboard_counter.py: 首页计数 - 每个用户的案件/合同分状态计数，随写入同步并定时对账
+- schema_version.py: 数据库结构版本 - 已执行的迁移记录（见 app/db/migrations.py）
 
 【导入方式】
 推荐从此包统一导入：
@@ -26,11 +34,19 @@ __all__ 列表定义了使用 from app.models import * 时会导出的名称。
 """
 
 from app.models.case import Case
+from app.models.case_participant import CaseParticipant
 from app.models.contract import Contract
+from app.models.dashboard_counter import DashboardCounter, DashboardReconcile
 from app.models.feedback import Feedback
+from app.models.file_blob import FileBlob
 from app.models.law_article import LawArticle
+from app.models.lawyer_facet import LawyerFacet
 from app.models.lawyer_profile import LawyerProfile
+from app.models.lawyer_stat import LawyerStat
 from app.models.model_call_log import ModelCallLog
+from app.models.model_response_cache import ModelResponseCache
+from app.models.model_usage_rollup import ModelUsageDaily, ModelUsageHourly, RollupState
+from app.models.schema_version import SchemaVersion
 from app.models.uploaded_file import UploadedFile
 from app.models.user import User
 
@@ -39,10 +55,21 @@ from app.models.user import User
 __all__ = [
     "User",
     "UploadedFile",
+    "FileBlob",
     "Contract",
     "LawArticle",
     "ModelCallLog",
+    "ModelResponseCache",
+    "ModelUsageHourly",
+    "ModelUsageDaily",
+    "RollupState",
     "Case",
+    "CaseParticipant",
+    "DashboardCounter",
+    "DashboardReconcile",
     "LawyerProfile",
+    "LawyerFacet",
+    "LawyerStat",
+    "SchemaVersion",
     "Feedback",
 ]
@@ -13,6 +13,7 @@ cases 表
 ├── title          - 案件标题
 ├── case_type      - 案件类型（合同纠纷、婚姻家庭等）
 ├── status         - pending/processing/completed（对应前端 statusType）
+├── outcome        - 结案结果 won/lost/settled（胜诉/败诉/调解，可空；律师胜诉率据此统计）
 ├── progress       - 进度 0-100
 ├── court          - 受理法院
 ├── judge          - 承办法官
@@ -41,15 +42,18 @@ class Case(Base):
     case_no: Mapped[str] = mapped_column(String(64), index=True)
     title: Mapped[str] = mapped_column(String(255))
     case_type: Mapped[str | None] = mapped_column(String(64), default=None)
-    status: Mapped[str] = mapped_column(String(32), default="pending", index=True)
+    status: Mapped[str] = mapped_column(String(32), default="pending", index=True, active_history=True)
+    outcome: Mapped[str | None] = mapped_column(String(16), default=None, active_history=True)
     progress: Mapped[int] = mapped_column(Integer, default=0)
     court: Mapped[str | None] = mapped_column(String(255), default=None)
     judge: Mapped[str | None] = mapped_column(String(64), default=None)
     filing_date: Mapped[date | None] = mapped_column(Date, default=None)
     amount: Mapped[str | None] = mapped_column(String(64), default=None)
     applicable_law: Mapped[str | None] = mapped_column(Text, default=None)
-    lawyer_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), index=True)
-    client_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("users.id"), index=True, default=None)
+    lawyer_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), index=True, active_history=True)
+    client_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("users.id"), index=True, default=None, active_history=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=lambda: datetime.now(timezone.utc)
     )
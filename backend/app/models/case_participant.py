@@ -0,0 +1,53 @@
+"""
+=============================================================================
+文件: app/models/case_participant.py
+模块: 案件参与人
+描述: 用户与案件的参与关系（case_participants 表），一行表示某用户以某角色参与某案件
+      案件列表按 "我参与的案件，最新的在前" 查这张表，而不是在 cases 上做 lawyer_id OR client_id
+=============================================================================
+
+【表结构】
+case_participants 表
+├── id              - 主键
+├── case_id         - 外键，关联 cases 表
+├── user_id         - 外键，参与人（律师或客户）
+├── role            - 参与角色：lawyer（承办律师）/ client（客户）
+├── status          - 案件状态（cases.status 的副本，随案件同步）
+└── created_at      - 案件创建时间（cases.created_at 的副本，列表排序键）
+唯一约束 (case_id, user_id)：同一用户在同一案件中只有一个角色
+INDEX (user_id, created_at, case_id, status)：我的案件（含已结案 / 排除已结案），最新的在前
+INDEX (user_id, status, created_at, case_id)：我的某状态案件，最新的在前
+
+【数据来源】
+由 app/services/case_participants.py 监听 Case 的写入事件，在同一事务中同步维护；
+目前参与人由 cases.lawyer_id / client_id 派生，不要直接修改这两种角色的行。
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+# role 的取值
+PARTICIPANT_LAWYER = "lawyer"
+PARTICIPANT_CLIENT = "client"
+
+
+class CaseParticipant(Base):
+    """案件参与关系：一行表示某用户以某角色参与某案件。"""
+
+    __tablename__ = "case_participants"
+    __table_args__ = (
+        UniqueConstraint("case_id", "user_id", name="uq_case_participants_case_user"),
+        Index("ix_case_participants_user_created", "user_id", "created_at", "case_id", "status"),
+        Index("ix_case_participants_user_status", "user_id", "status", "created_at", "case_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    case_id: Mapped[int] = mapped_column(Integer, ForeignKey("cases.id"))
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
+    role: Mapped[str] = mapped_column(String(16))
+    status: Mapped[str] = mapped_column(String(32))
+    created_at: Mapped[datetime] = mapped_column(DateTime)
@@ -9,7 +9,7 @@
 【表结构】
 contracts 表
 ├── id          - 主键，自增整数
-├── user_id     - 外键，关联 users 表
+├── user_id     - 外键，关联 users 表（INDEX (user_id, created_at, id)）
 ├── file_id     - 外键，关联 uploaded_files 表（可空）
 ├── title       - 合同标题
 ├── description - 合同描述
@@ -23,7 +23,7 @@ contracts 表
 
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -55,13 +55,17 @@ class Contract(Base):
     """
     
     __tablename__ = "contracts"
+    # 合同列表："我的合同，最新的在前"（WHERE user_id = ? ORDER BY created_at DESC, id DESC），
+    # 过滤、排序与游标 seek 条件由同一个索引提供，也替代了 user_id 单列索引
+    __table_args__ = (Index("ix_contracts_user_created", "user_id", "created_at", "id"),)
 
     # ======================== 主键 ========================
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     
     # ======================== 外键关联 ========================
     # 合同所有者
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), index=True)
+    # active_history：修改前未加载时先读出旧值，首页计数据此扣减旧所有者 / 旧状态
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), active_history=True)
     
     # 关联的文件（可空）
     # Mapped[int | None] 表示此字段可以为 NULL
@@ -79,7 +83,7 @@ class Contract(Base):
     
     # 合同状态，默认为 "draft"（草稿）
     # index=True: 为状态字段创建索引，因为经常按状态查询
-    status: Mapped[str] = mapped_column(String(50), default="draft", index=True)
+    status: Mapped[str] = mapped_column(String(50), default="draft", index=True, active_history=True)
 
     # ======================== 时间戳字段 ========================
     created_at: Mapped[datetime] = mapped_column(
@@ -0,0 +1,69 @@
+"""
+=============================================================================
+文件: app/models/dashboard_counter.py
+模块: 首页计数
+描述: 每个用户一行的案件 / 合同分状态计数（dashboard_counters 表），
+      首页汇总接口按主键读取这一行，不再拉取完整列表在客户端计数
+=============================================================================
+
+【表结构】
+dashboard_counters 表
+├── user_id                 - 主键，用户ID
+├── cases_pending           - 参与的案件中 待处理 的个数
+├── cases_processing        - 处理中
+├── cases_completed         - 已结案
+├── cases_other             - 其他状态
+├── contracts_draft         - 名下合同中 草稿 的个数
+├── contracts_active        - 生效中
+├── contracts_expired       - 已过期
+├── contracts_terminated    - 已终止
+├── contracts_other         - 其他状态
+└── reconciled_at           - 最近一次被对账修正的时间（可空）
+
+dashboard_reconcile 表（只有一行）
+├── id                      - 主键，固定为 1
+└── reconciled_at           - 最近一次对账的时间
+对账事务的第一条语句写这一行取得写锁，见 services/dashboard_counters.py 的 reconcile()
+
+【数据来源】
+由 app/services/dashboard_counters.py 在案件、合同写入的同一事务中增减，
+并定时与 case_participants / contracts 对账修正，不要直接修改。
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+# 单独计数的状态；其余状态计入 *_other
+CASE_STATUSES = ("pending", "processing", "completed")
+CONTRACT_STATUSES = ("draft", "active", "expired", "terminated")
+
+
+class DashboardCounter(Base):
+    """用户的案件 / 合同分状态计数。"""
+
+    __tablename__ = "dashboard_counters"
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    cases_pending: Mapped[int] = mapped_column(Integer, default=0)
+    cases_processing: Mapped[int] = mapped_column(Integer, default=0)
+    cases_completed: Mapped[int] = mapped_column(Integer, default=0)
+    cases_other: Mapped[int] = mapped_column(Integer, default=0)
+    contracts_draft: Mapped[int] = mapped_column(Integer, default=0)
+    contracts_active: Mapped[int] = mapped_column(Integer, default=0)
+    contracts_expired: Mapped[int] = mapped_column(Integer, default=0)
+    contracts_terminated: Mapped[int] = mapped_column(Integer, default=0)
+    contracts_other: Mapped[int] = mapped_column(Integer, default=0)
+    reconciled_at: Mapped[datetime | None] = mapped_column(DateTime, default=None)
+
+
+class DashboardReconcile(Base):
+    """计数对账的锁行：对账事务先写这一行，同一时间只有一个对账在执行。"""
+
+    __tablename__ = "dashboard_reconcile"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    reconciled_at: Mapped[datetime | None] = mapped_column(DateTime, default=None)
@@ -3,12 +3,14 @@
 文件: app/models/feedback.py
 模块: 反馈模型
 描述: 用户反馈表，与前端帮助与反馈页提交结构对齐
+      客户对律师的评价也记为反馈：lawyer_id 为被评价的律师，case_id 为评价所依据的案件（每个案件只能评价一次），
+      rating 为 1-5 分（律师满意度据此统计）
 =============================================================================
 """
 
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, JSON, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -18,6 +20,10 @@ class Feedback(Base):
     """反馈：type 1-5，content，contact，images 为 URL 或路径列表（JSON）。"""
 
     __tablename__ = "feedbacks"
+    __table_args__ = (
+        # 每个案件只能评价一次；普通反馈的 case_id 为空，不受限制
+        Index("uq_feedbacks_case", "case_id", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("users.id"), index=True, default=None)
@@ -25,8 +31,15 @@ class Feedback(Base):
     content: Mapped[str] = mapped_column(Text)
     contact: Mapped[str | None] = mapped_column(String(128), default=None)
     images: Mapped[list | None] = mapped_column(JSON, default=None)
+    lawyer_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("users.id"), default=None, active_history=True
+    )
+    case_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("cases.id"), default=None, active_history=True
+    )
+    rating: Mapped[int | None] = mapped_column(Integer, default=None, active_history=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=lambda: datetime.now(timezone.utc)
     )
 
-    user = relationship("User")
+    user = relationship("User", foreign_keys=[user_id])
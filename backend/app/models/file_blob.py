@@ -0,0 +1,65 @@
+"""
+=============================================================================
+文件: app/models/file_blob.py
+模块: 文件内容块模型
+描述: 定义按内容寻址的文件存储表结构（file_blobs 表）
+      相同内容的文件在磁盘上只保存一份，由多条 uploaded_files 记录共同引用
+=============================================================================
+
+【表结构】
+file_blobs 表
+├── sha256          - 主键，文件内容的 SHA-256 摘要（十六进制）
+├── size            - 文件大小（字节）
+├── path            - 磁盘路径：{UPLOAD_DIR}/blobs/ab/cd/abcd...
+├── ref_count       - 引用计数：引用该内容的 uploaded_files 记录数
+└── created_at      - 首次上传时间
+
+【关联关系】
+- FileBlob 1:N UploadedFile (同一份内容可被多次上传引用)
+
+【引用计数维护】
+由 app/services/blob_store.py 监听 UploadedFile 的插入/删除事件，
+在同一事务中原子地加减 ref_count，降为 0 时删除记录并在提交后删除磁盘文件。
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class FileBlob(Base):
+    """
+    文件内容块模型类
+
+    【类说明】
+    ORM 映射类，对应数据库中的 file_blobs 表。
+    以内容摘要为主键，同样内容的上传只在磁盘上保存一份。
+
+    【字段说明】
+    - sha256: 主键，文件内容的 SHA-256 摘要
+    - size: 文件大小，单位：字节
+    - path: 文件在服务器上的完整路径
+    - ref_count: 引用该内容的上传记录数
+    - created_at: 首次写入时间
+    """
+
+    __tablename__ = "file_blobs"
+
+    # ======================== 主键 ========================
+    # 内容摘要即主键：相同内容只会有一条记录
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    # ======================== 内容信息字段 ========================
+    size: Mapped[int] = mapped_column(Integer, default=0)
+    path: Mapped[str] = mapped_column(String(500))
+
+    # 引用计数，由 UploadedFile 插入/删除事件在 SQL 层原子更新，不要在 Python 中直接修改
+    ref_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    # ======================== 时间戳字段 ========================
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc)
+    )
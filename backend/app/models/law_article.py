@@ -15,14 +15,14 @@ law_articles 表
 └── created_at  - 创建时间
 
 【使用场景】
-1. 法条搜索：用户输入关键词，在 content 中模糊匹配
+1. 法条搜索：用户输入关键词，在 content 中全文检索（BM25 排序）
 2. 法律浏览：按法律名称筛选，查看该法律的所有条款
 3. 合同审查：AI 引用相关法条作为法律依据
 """
 
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy import DateTime, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -50,20 +50,27 @@ class LawArticle(Base):
     - created_at: 数据创建/导入时间
     
     【查询优化】
-    - law_name 和 article_no 都有索引，支持快速精确查询
-    - 对于 content 的全文搜索，简单场景使用 LIKE
-    - 生产环境建议使用专门的全文搜索引擎（如 Elasticsearch）
+    - (law_name, created_at, id) 复合索引：按法律名称过滤并按时间倒序分页，无需额外排序
+    - (created_at, id) 索引：不带过滤条件的法条列表按索引顺序读取前 N 条
+    - article_no 有单列索引，批量导入时按条款号查找已有法条
+    - content 的全文搜索由 app/services/law_search.py 维护倒排索引
+      （SQLite 使用 FTS5 虚拟表 law_articles_fts，其他数据库使用纯 Python 索引），
+      通过 ORM 事件在插入/更新/删除时同步
     """
     
     __tablename__ = "law_articles"
+    __table_args__ = (
+        Index("ix_law_articles_law_created", "law_name", "created_at", "id"),
+        Index("ix_law_articles_created", "created_at", "id"),
+    )
 
     # ======================== 主键 ========================
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     
     # ======================== 法条标识字段 ========================
     # 法律名称，如 "民法典"、"刑法"、"合同法" 等
-    # 索引用于快速按法律名称过滤
-    law_name: Mapped[str] = mapped_column(String(255), index=True)
+    # 按法律名称过滤由复合索引 ix_law_articles_law_created 提供
+    law_name: Mapped[str] = mapped_column(String(255))
     
     # 条款编号，如 "第一条"、"第一百二十三条" 等
     # 可空，因为有些法规可能没有明确的条款编号
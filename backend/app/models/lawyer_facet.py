@@ -0,0 +1,40 @@
+"""
+=============================================================================
+文件: app/models/lawyer_facet.py
+模块: 律师分类/标签索引
+描述: 把 LawyerProfile.categories / tags（JSON 列）展开为一行一个值的关联表（lawyer_facets 表）
+      律师列表按分类或标签过滤时走索引查找，而不是逐行解析 JSON
+=============================================================================
+
+【表结构】
+lawyer_facets 表
+├── kind            - 类型：category（专业领域/分类）或 tag（标签）
+├── value           - 分类名或标签名
+└── user_id         - 律师的用户ID（与 LawyerProfile.user_id 相同）
+主键 (kind, value, user_id)：按分类/标签查律师是主键前缀查找
+
+【数据来源】
+由 app/services/lawyer_index.py 监听 LawyerProfile 的写入事件同步维护，
+不要直接修改；LawyerProfile 的 JSON 列仍是唯一的数据源。
+"""
+
+from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+# kind 的取值
+FACET_CATEGORY = "category"
+FACET_TAG = "tag"
+
+
+class LawyerFacet(Base):
+    """律师分类/标签关联：一行表示某位律师属于某个分类或带有某个标签。"""
+
+    __tablename__ = "lawyer_facets"
+
+    kind: Mapped[str] = mapped_column(String(16), primary_key=True)
+    value: Mapped[str] = mapped_column(String(64), primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id"), primary_key=True, index=True
+    )
@@ -0,0 +1,46 @@
+"""
+=============================================================================
+文件: app/models/lawyer_stat.py
+模块: 律师统计
+描述: 每位律师一行的办案与评价计数（lawyer_stats 表），
+      律师列表 / 详情的 stats（案件数、胜诉率、客户满意度）由此按主键读取，不在查询时聚合 cases
+=============================================================================
+
+【表结构】
+lawyer_stats 表
+├── user_id          - 主键，律师的用户ID
+├── case_count       - 承办的案件数
+├── decided_count    - 已结案且记录了结果（outcome）的案件数
+├── won_count        - 其中胜诉的案件数
+├── rating_count     - 收到的评分（反馈中的 rating）条数
+└── satisfied_count  - 其中 4 分及以上的条数
+胜诉率 = won_count / decided_count，满意度 = satisfied_count / rating_count（均为百分比）
+
+【数据来源】
+由 app/services/lawyer_stats.py 在案件、反馈写入的同一事务中增减；
+scripts/rebuild_lawyer_stats.py 按 cases 与 feedbacks 全量重建，不要直接修改。
+"""
+
+from sqlalchemy import Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+# 计入胜诉率的结案结果（cases.outcome）；其中 won 为胜诉
+CASE_OUTCOMES = ("won", "lost", "settled")
+OUTCOME_WON = "won"
+# 评分达到该值视为满意
+SATISFIED_RATING = 4
+
+
+class LawyerStat(Base):
+    """律师的办案与评价计数。"""
+
+    __tablename__ = "lawyer_stats"
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    case_count: Mapped[int] = mapped_column(Integer, default=0)
+    decided_count: Mapped[int] = mapped_column(Integer, default=0)
+    won_count: Mapped[int] = mapped_column(Integer, default=0)
+    rating_count: Mapped[int] = mapped_column(Integer, default=0)
+    satisfied_count: Mapped[int] = mapped_column(Integer, default=0)
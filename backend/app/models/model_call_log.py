@@ -15,7 +15,7 @@ model_call_logs 表
 ├── prompt_hash     - 输入内容的哈希值（用于去重统计）
 ├── input_tokens    - 输入 Token 数
 ├── output_tokens   - 输出 Token 数
-├── status          - 调用状态（ok/error）
+├── status          - 调用状态（ok/error/cache_hit）
 ├── error_message   - 错误信息
 ├── duration_ms     - 调用耗时（毫秒）
 └── created_at      - 调用时间
@@ -57,7 +57,7 @@ class ModelCallLog(Base):
     - prompt_hash: 输入 prompt 的 SHA256 哈希，用于去重分析
     - input_tokens: 输入消耗的 Token 数
     - output_tokens: 输出生成的 Token 数
-    - status: 调用结果状态，"ok" 或 "error"
+    - status: 调用结果状态，"ok"、"error" 或 "cache_hit"（命中响应缓存，Token 数为 0）
     - error_message: 失败时的错误信息
     - duration_ms: 调用耗时（毫秒）
     - created_at: 调用发生时间
@@ -95,7 +95,7 @@ class ModelCallLog(Base):
     output_tokens: Mapped[int] = mapped_column(Integer, default=0)
     
     # ======================== 调用状态 ========================
-    # 调用状态：ok（成功）或 error（失败）
+    # 调用状态：ok（成功）、error（失败）或 cache_hit（命中响应缓存，未实际调用模型）
     status: Mapped[str] = mapped_column(String(50), default="ok")
     
     # 错误信息，仅在 status="error" 时有值
@@ -0,0 +1,46 @@
+"""
+=============================================================================
+文件: app/models/model_response_cache.py
+模块: 模型响应缓存
+描述: AI 模型调用结果的持久化缓存（model_response_cache 表）
+      相同模型 + 相同 prompt + 相同参数的调用直接返回已保存的结果
+=============================================================================
+
+【表结构】
+model_response_cache 表
+├── cache_key       - 主键，SHA-256(model_name, prompt_hash, 参数) 的十六进制
+├── model_name      - 模型名称
+├── prompt_hash     - prompt 的 SHA-256（与 model_call_logs.prompt_hash 相同）
+├── response        - 模型输出文本
+├── input_tokens    - 首次调用时的输入 Token 数
+├── output_tokens   - 首次调用时的输出 Token 数
+├── created_at      - 写入时间
+└── expires_at      - 过期时间（INDEX，清理过期条目时按此列范围删除）
+
+【数据来源】
+由 app/services/ai_service.py 在模型调用成功后写入，读取时忽略已过期的条目。
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ModelResponseCache(Base):
+    """模型响应缓存条目：一行对应一个 (模型, prompt, 参数) 组合的输出。"""
+
+    __tablename__ = "model_response_cache"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model_name: Mapped[str] = mapped_column(String(255))
+    prompt_hash: Mapped[str] = mapped_column(String(64))
+    response: Mapped[str] = mapped_column(Text)
+    input_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    output_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc)
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True)
@@ -0,0 +1,86 @@
+"""
+=============================================================================
+文件: app/models/model_usage_rollup.py
+模块: 模型用量汇总
+描述: 按小时 / 按天汇总的模型调用用量（model_usage_hourly / model_usage_daily 表），
+      以及汇总进度（rollup_state 表）
+=============================================================================
+
+【表结构】（两张汇总表结构相同）
+model_usage_hourly / model_usage_daily 表
+├── bucket_start    - 时间桶起点（UTC，整点或零点）
+├── user_id         - 用户ID（匿名调用记为 0）
+├── model_name      - 模型名称（未知记为空字符串）
+├── calls           - 调用次数（含缓存命中与失败）
+├── cache_hits      - 命中响应缓存的次数
+├── errors          - 失败次数
+├── input_tokens    - 输入 Token 合计
+├── output_tokens   - 输出 Token 合计
+├── duration_ms     - 耗时合计（毫秒，用于计算平均值）
+└── lat_*           - 耗时分布：落在各区间（≤100ms、≤250ms … ≤30s、>30s）的调用次数
+主键 (bucket_start, user_id, model_name)
+
+rollup_state 表
+├── name            - 汇总任务名（如 model_usage）
+├── last_id         - 已汇总到的 model_call_logs.id（高水位）
+└── updated_at      - 最近一次汇总时间
+
+【数据来源】
+由 app/services/usage_rollup.py 从 model_call_logs 增量汇总，不要直接修改。
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+# 耗时分布的区间上界（毫秒）；列名 lat_le_<上界>，超过最后一个上界的记入 lat_inf
+LATENCY_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+LATENCY_COLUMNS = tuple(f"lat_le_{ms}" for ms in LATENCY_BUCKETS_MS) + ("lat_inf",)
+
+
+class _UsageColumns:
+    """两张汇总表共用的列定义。"""
+
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    model_name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    calls: Mapped[int] = mapped_column(Integer, default=0)
+    cache_hits: Mapped[int] = mapped_column(Integer, default=0)
+    errors: Mapped[int] = mapped_column(Integer, default=0)
+    input_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    output_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    duration_ms: Mapped[int] = mapped_column(Integer, default=0)
+    lat_le_100: Mapped[int] = mapped_column(Integer, default=0)
+    lat_le_250: Mapped[int] = mapped_column(Integer, default=0)
+    lat_le_500: Mapped[int] = mapped_column(Integer, default=0)
+    lat_le_1000: Mapped[int] = mapped_column(Integer, default=0)
+    lat_le_2500: Mapped[int] = mapped_column(Integer, default=0)
+    lat_le_5000: Mapped[int] = mapped_column(Integer, default=0)
+    lat_le_10000: Mapped[int] = mapped_column(Integer, default=0)
+    lat_le_30000: Mapped[int] = mapped_column(Integer, default=0)
+    lat_inf: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class ModelUsageHourly(_UsageColumns, Base):
+    """按小时汇总的模型用量。"""
+
+    __tablename__ = "model_usage_hourly"
+
+
+class ModelUsageDaily(_UsageColumns, Base):
+    """按天（UTC）汇总的模型用量。"""
+
+    __tablename__ = "model_usage_daily"
+
+
+class RollupState(Base):
+    """增量汇总任务的进度：已处理到的源表主键。"""
+
+    __tablename__ = "rollup_state"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_id: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime, default=None)
@@ -0,0 +1,35 @@
+"""
+=============================================================================
+文件: app/models/schema_version.py
+模块: 数据库结构版本
+描述: 已执行的数据库迁移记录（schema_version 表），当前结构版本为其中最大的 version
+=============================================================================
+
+【表结构】
+schema_version 表
+├── version         - 迁移版本号（主键）
+├── description     - 迁移说明
+└── applied_at      - 执行时间
+
+【数据来源】
+由 app/db/migrations.py 在每个迁移提交时写入，不要手工修改。
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class SchemaVersion(Base):
+    """一次已执行的数据库迁移。"""
+
+    __tablename__ = "schema_version"
+
+    version: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    description: Mapped[str] = mapped_column(String(255), default="")
+    applied_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc)
+    )
@@ -9,22 +9,24 @@
 【表结构】
 uploaded_files 表
 ├── id              - 主键，自增整数
-├── user_id         - 外键，关联 users 表
+├── user_id         - 外键，关联 users 表（INDEX (user_id, created_at, id)）
 ├── original_filename - 原始文件名
-├── stored_filename - 存储文件名（带UUID前缀）
+├── stored_filename - 记录的唯一存储名（带UUID前缀）
 ├── content_type    - MIME 类型
 ├── size            - 文件大小（字节）
-├── path            - 服务器存储路径
+├── sha256          - 外键，关联 file_blobs 表（文件内容的 SHA-256 摘要）
+├── path            - 服务器存储路径（即 file_blobs.path）
 └── created_at      - 上传时间
 
 【关联关系】
 - UploadedFile N:1 User (多个文件属于一个用户)
+- UploadedFile N:1 FileBlob (内容相同的上传共用一份磁盘文件)
 - UploadedFile 1:1 Contract (一个文件可以关联一个合同)
 """
 
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -40,21 +42,24 @@ class UploadedFile(Base):
     
     【设计说明】
     - 文件内容不存入数据库，避免数据库膨胀
-    - stored_filename 使用 UUID 前缀，避免文件名冲突
-    - path 记录文件的绝对路径，方便后续读取
+    - stored_filename 使用 UUID 前缀，作为每条上传记录的唯一名称
+    - 文件内容按 SHA-256 去重存储在 file_blobs 中，path 指向共享的内容文件
     
     【字段说明】
     - id: 主键
     - user_id: 上传者的用户ID，外键关联 users 表
     - original_filename: 用户上传时的原始文件名
-    - stored_filename: 服务器上的存储文件名
+    - stored_filename: 上传记录的唯一存储名
     - content_type: 文件的 MIME 类型（如 application/pdf）
     - size: 文件大小，单位：字节
+    - sha256: 文件内容的 SHA-256 摘要，引用 file_blobs.sha256
     - path: 文件在服务器上的完整路径
     - created_at: 上传时间
     """
     
     __tablename__ = "uploaded_files"
+    # 文件列表："我的文件，最新的在前"，过滤、排序与游标 seek 由同一个索引提供（替代 user_id 单列索引）
+    __table_args__ = (Index("ix_uploaded_files_user_created", "user_id", "created_at", "id"),)
 
     # ======================== 主键 ========================
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -62,14 +67,14 @@ class UploadedFile(Base):
     # ======================== 外键关联 ========================
     # ForeignKey 定义外键约束，关联到 users 表的 id 字段
     # 类似于 Java JPA 的 @ManyToOne + @JoinColumn
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), index=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
 
     # ======================== 文件信息字段 ========================
     # 用户上传时的原始文件名
     original_filename: Mapped[str] = mapped_column(String(255))
     
-    # 服务器上的存储文件名，格式：{UUID}_{原始文件名}
-    # unique=True: 确保存储文件名唯一，避免覆盖
+    # 上传记录的唯一存储名，格式：{UUID}_{原始文件名}
+    # unique=True: 确保存储名唯一
     stored_filename: Mapped[str] = mapped_column(String(255), unique=True, index=True)
     
     # 文件的 MIME 类型，如 "application/pdf", "image/png" 等
@@ -78,8 +83,13 @@ class UploadedFile(Base):
     
     # 文件大小，单位：字节
     size: Mapped[int] = mapped_column(Integer, default=0)
+
+    # 文件内容的 SHA-256 摘要（64 位十六进制），指向 file_blobs；去重存储之前的旧数据为空
+    sha256: Mapped[str | None] = mapped_column(
+        String(64), ForeignKey("file_blobs.sha256"), index=True
+    )
     
-    # 文件在服务器上的完整存储路径
+    # 文件在服务器上的完整存储路径（去重存储时与 file_blobs.path 相同）
     path: Mapped[str] = mapped_column(String(500))
 
     # ======================== 时间戳字段 ========================
@@ -22,7 +22,7 @@ users 表
 
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, Integer, String
+from sqlalchemy import Boolean, DateTime, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -57,6 +57,8 @@ class User(Base):
     
     # 指定对应的数据库表名
     __tablename__ = "users"
+    # 律师列表：WHERE role = 'lawyer' ORDER BY created_at DESC, id DESC（替代 role 单列索引）
+    __table_args__ = (Index("ix_users_role_created", "role", "created_at", "id"),)
 
     # ======================== 主键 ========================
     # primary_key=True: 主键
@@ -81,8 +83,8 @@ class User(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     
     # ======================== 扩展字段（前端对接）========================
-    # 角色：lawyer=律师 / client=客户，可选，注册或角色选择后设置
-    role: Mapped[str | None] = mapped_column(String(20), index=True, default=None)
+    # 角色：lawyer=律师 / client=客户 / admin=管理员（只能在数据库中设置），可选，注册或角色选择后设置
+    role: Mapped[str | None] = mapped_column(String(20), default=None)
     # 头像 URL，可选
     avatar: Mapped[str | None] = mapped_column(String(500), default=None)
     # 手机号，可选
@@ -10,6 +10,10 @@
 - auth.py: 认证相关的数据模式（注册、登录、Token）
 - files.py: 文件相关的数据模式（文件信息）
 - query.py: 查询相关的数据模式（合同、法条）
+- dashboard.py: 首页汇总的数据模式（案件、合同分状态计数）
+- pagination.py: 列表接口统一的分页响应信封 Page[T]
+- admin.py: 管理接口的数据模式（法条导入结果）
+- batch.py: 批量请求的数据模式（子请求列表、各子请求的结果）
 
 【Schema vs Model 的区别】
 - Model (models/): ORM 模型，映射到数据库表，负责持久化
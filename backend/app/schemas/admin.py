@@ -0,0 +1,82 @@
+"""
+=============================================================================
+文件: app/schemas/admin.py
+模块: 管理接口数据模式
+描述: 定义管理员接口（法条导入等）的响应数据结构
+=============================================================================
+
+【数据模式列表】
+- LawImportOut: 法条批量导入结果
+- UsageItemOut / UsageOut: 模型用量统计（来自小时 / 天汇总表）
+"""
+
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class LawImportOut(BaseModel):
+    """
+    法条批量导入结果
+
+    【字段说明】
+    - format: 实际使用的文件格式（text / jsonl / csv）
+    - inserted: 新增的法条数
+    - updated: 内容有变化而更新的法条数（同一法律的同一条款）
+    - skipped: 跳过的条数（内容为空、内容未变化或文件内重复）
+    - seconds: 解析与写入耗时（秒）
+    """
+
+    format: str
+    inserted: int
+    updated: int
+    skipped: int
+    seconds: float
+
+
+class UsageItemOut(BaseModel):
+    """
+    一个时间桶（及用户 / 模型）的模型用量
+
+    【字段说明】
+    - bucket: 时间桶起点（UTC，整点或零点）
+    - user_id / model_name: 按用户 / 模型分组时的维度值，未按该维度分组时为 null（匿名调用的 user_id 为 0）
+    - calls / cache_hits / errors: 调用次数（含缓存命中与失败）/ 命中缓存次数 / 失败次数
+    - input_tokens / output_tokens: Token 合计
+    - cost: 按 LLM_PRICES 计算的费用，未配置价格的模型计 0
+    - avg_ms: 平均耗时（毫秒）
+    - p50_ms / p95_ms / p99_ms: 由耗时分布估算的百分位（所在区间的上界，超过 30 秒时为 null）
+    """
+
+    bucket: datetime
+    user_id: int | None = None
+    model_name: str | None = None
+    calls: int
+    cache_hits: int
+    errors: int
+    input_tokens: int
+    output_tokens: int
+    cost: float
+    avg_ms: float | None = None
+    p50_ms: int | None = None
+    p95_ms: int | None = None
+    p99_ms: int | None = None
+
+
+class UsageOut(BaseModel):
+    """
+    模型用量统计结果
+
+    【字段说明】
+    - granularity: hour / day
+    - group_by: none / user / model / user_model
+    - rolled_up_to_id: 汇总表已包含的最大 model_call_logs.id
+    - rolled_up_at: 最近一次汇总时间（尚未汇总过时为 null）
+    - items: 按时间桶升序的用量
+    """
+
+    granularity: str
+    group_by: str
+    rolled_up_to_id: int
+    rolled_up_at: datetime | None = None
+    items: list[UsageItemOut]
@@ -0,0 +1,39 @@
+"""
+=============================================================================
+文件: app/schemas/batch.py
+模块: 批量请求数据模式
+描述: 批量请求的请求体（子请求列表）与响应（各子请求的状态码与响应体）
+=============================================================================
+"""
+
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class BatchItemIn(BaseModel):
+    """子请求：path 相对于 /api/v1（如 /cases?limit=10），body 为 JSON 请求体。"""
+    id: str | None = Field(default=None, max_length=64, description="调用方自定义的标识，原样返回")
+    method: str = Field(default="GET", pattern="^(GET|HEAD|POST|PUT|PATCH|DELETE)$")
+    path: str = Field(..., min_length=1, max_length=2048, description="接口路径，如 /auth/me")
+    query: dict[str, Any] | None = Field(default=None, description="查询参数，值为列表时重复该参数")
+    headers: dict[str, str] | None = Field(default=None, description="额外请求头，如 If-None-Match")
+    body: Any = None
+
+
+class BatchIn(BaseModel):
+    """批量请求体。"""
+    requests: list[BatchItemIn] = Field(..., min_length=1)
+
+
+class BatchItemOut(BaseModel):
+    """子请求的结果：JSON 响应解析为对象，其他响应为文本。"""
+    id: str | None = None
+    status: int
+    headers: dict[str, str]
+    body: Any = None
+
+
+class BatchOut(BaseModel):
+    """批量响应：顺序与请求中的子请求一致。"""
+    responses: list[BatchItemOut]
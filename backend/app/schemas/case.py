@@ -24,6 +24,15 @@ class CaseCreateIn(BaseModel):
     client_id: int | None = Field(default=None, alias="clientId", description="客户用户ID，可选")
 
 
+class CaseUpdateIn(BaseModel):
+    """更新案件进展（承办律师）：只修改提交了的字段；outcome 只能在已结案（completed）时设置。"""
+    status: str | None = Field(default=None, pattern="^(pending|processing|completed)$")
+    outcome: str | None = Field(
+        default=None, pattern="^(won|lost|settled)$", description="结案结果：won 胜诉 / lost 败诉 / settled 调解"
+    )
+    progress: int | None = Field(default=None, ge=0, le=100)
+
+
 class CaseListItem(BaseModel):
     """案件列表项，与前端 caseList 项一致（camelCase 输出）。"""
     model_config = ConfigDict(populate_by_name=True)
@@ -57,6 +66,7 @@ class CaseDetailOut(BaseModel):
     lawyer: str | None = None
     status: str
     statusType: str
+    outcome: str | None = None
     progress: int
     created_at: datetime | None = None
     timeline: list[dict] | None = None
@@ -73,6 +83,7 @@ class CaseOut(BaseModel):
     title: str
     status: str
     statusType: str = "pending"
+    outcome: str | None = None
     progress: int = 0
     caseType: str | None = None
     filingDate: str | None = None
@@ -0,0 +1,34 @@
+"""
+=============================================================================
+文件: app/schemas/dashboard.py
+模块: 首页汇总数据模式
+描述: 首页的案件 / 合同分状态计数
+=============================================================================
+"""
+
+from pydantic import BaseModel
+
+
+class CaseCounts(BaseModel):
+    """我参与的案件：各状态的个数（other 为其他状态），total 为合计。"""
+    pending: int = 0
+    processing: int = 0
+    completed: int = 0
+    other: int = 0
+    total: int = 0
+
+
+class ContractCounts(BaseModel):
+    """我的合同：各状态的个数（other 为其他状态），total 为合计。"""
+    draft: int = 0
+    active: int = 0
+    expired: int = 0
+    terminated: int = 0
+    other: int = 0
+    total: int = 0
+
+
+class DashboardSummaryOut(BaseModel):
+    """首页汇总响应。"""
+    cases: CaseCounts
+    contracts: ContractCounts
@@ -12,11 +12,16 @@ from pydantic import BaseModel, ConfigDict, Field
 
 
 class FeedbackCreateIn(BaseModel):
-    """提交反馈请求体：type 1-5，content 必填，contact、images 可选。"""
+    """提交反馈请求体：type 1-5，content 必填，contact、images 可选；评价律师时同时带 lawyerId、caseId 与 rating。"""
+    model_config = ConfigDict(populate_by_name=True)
+
     type: int = Field(..., ge=1, le=5, description="1:功能建议 2:使用问题 3:投诉举报 4:合作咨询 5:认证问题")
     content: str = Field(..., min_length=10, max_length=500)
     contact: str | None = Field(default=None, max_length=128)
     images: list[str] | None = Field(default=None, max_length=3, description="最多3张图片 URL")
+    lawyer_id: int | None = Field(default=None, alias="lawyerId", description="评价的律师用户ID，可选")
+    case_id: int | None = Field(default=None, alias="caseId", description="评价所依据的案件ID（须为当前用户与该律师的案件）")
+    rating: int | None = Field(default=None, ge=1, le=5, description="对律师的评分 1-5，与 lawyerId、caseId 一同提交")
 
 
 class FeedbackOut(BaseModel):
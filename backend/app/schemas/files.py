@@ -33,6 +33,7 @@ class UploadedFileOut(BaseModel):
     - stored_filename: 存储文件名（带 UUID 前缀，服务器上的实际文件名）
     - content_type: MIME 类型（如 "application/pdf"）
     - size: 文件大小（字节）
+    - sha256: 文件内容的 SHA-256 摘要
     - path: 服务器存储路径
     - created_at: 上传时间
     
@@ -65,6 +66,9 @@ class UploadedFileOut(BaseModel):
     # 文件大小，单位：字节
     # 可用于显示文件大小或限制下载
     size: int
+
+    # 文件内容的 SHA-256 摘要，客户端可用于校验完整性
+    sha256: str | None = None
     
     # 文件在服务器上的存储路径
     # 内部使用，可用于后续的文件读取操作
@@ -9,6 +9,14 @@
 from pydantic import BaseModel, ConfigDict
 
 
+class LawyerStats(BaseModel):
+    """律师统计数据（前端 stats）：胜诉率、满意度为不带 % 的百分数，尚无数据时为空。"""
+    caseCount: str | None = None
+    winRate: str | None = None
+    clientSatisfaction: str | None = None
+    years: str | None = None
+
+
 class LawyerListItem(BaseModel):
     """律师列表项，与前端 allLawyers 项一致。"""
     model_config = ConfigDict(populate_by_name=True)
@@ -20,14 +28,7 @@ class LawyerListItem(BaseModel):
     introduction: str | None = None
     tags: list[str] | None = None
     categories: list[str] | None = None
-
-
-class LawyerStats(BaseModel):
-    """律师统计数据（前端 stats）。"""
-    caseCount: str | None = None
-    winRate: str | None = None
-    clientSatisfaction: str | None = None
-    years: str | None = None
+    stats: LawyerStats | None = None
 
 
 class LawyerEducation(BaseModel):
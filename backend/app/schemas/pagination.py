@@ -0,0 +1,39 @@
+"""
+=============================================================================
+文件: app/schemas/pagination.py
+模块: 分页数据模式
+描述: 定义列表接口统一的分页响应信封
+=============================================================================
+
+【响应结构】
+{
+    "items": [...],          # 当前页数据
+    "next_cursor": "xxx"     # 下一页游标，为 null 表示已是最后一页
+}
+
+【使用方式】
+客户端把 next_cursor 原样作为下一次请求的 cursor 参数即可翻页，
+游标内容对客户端不透明，不应解析或拼接。
+"""
+
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """
+    分页响应信封（泛型）
+
+    【使用示例】
+    @router.get("", response_model=Page[ContractOut])
+
+    【注意事项】（与Java的区别）
+    Generic[T] 类似于 Java 的泛型类 Page<T>，
+    Page[ContractOut] 会生成一个具体的 Pydantic 模型用于校验和文档。
+    """
+
+    items: list[T]
+    next_cursor: str | None = None
@@ -8,6 +8,19 @@
 
 【子模块说明】
 - security.py: 安全相关服务（密码加密、JWT Token 生成）
+- law_search.py: 法条全文检索服务（n-gram 分词、倒排索引、BM25 排序）
+- law_import.py: 法条批量导入（流式解析 文本/JSONL/CSV，分批事务写入并更新索引）
+- auth_cache.py: 认证用户缓存（Token -> 用户快照，TTL + LRU，User 写入时失效）
+- upload_stream.py: 流式文件上传（请求体直接写盘，同时计算大小与 SHA-256，原子改名）
+- blob_store.py: 内容寻址文件存储（按 SHA-256 去重、分级目录、引用计数）
+- lawyer_index.py: 律师分类/标签索引（lawyer_facets 表，随律师资料写入同步）
+- lawyer_stats.py: 律师统计（lawyer_stats 表，随案件/反馈写入增减，可全量重建）
+- case_participants.py: 案件参与人（case_participants 表，随案件写入同步，案件列表按参与人查询）
+- dashboard_counters.py: 首页计数（dashboard_counters 表，随案件/合同写入增减，定时对账修正）
+- response_cache.py: 公开接口响应缓存（律师列表/详情，TTL + LRU + ETag，律师资料写入时失效）
+- model_call_logger.py: 模型调用日志攒批写入（内存队列 + 后台任务批量 INSERT，队列满时丢弃计数）
+- ai_service.py: AI 模型调用服务（按模型 + prompt 摘要 + 参数的两级响应缓存，调用记入日志）
+- usage_rollup.py: 模型用量汇总（按 id 高水位把调用日志增量汇总为小时 / 天用量表）
 
 【设计原则】
 服务层（Service Layer）负责处理业务逻辑，使 API 端点保持简洁。
@@ -21,6 +34,5 @@
 【扩展建议】
 随着业务增长，可以添加更多服务模块：
 - contract_service.py: 合同处理服务
-- ai_service.py: AI 模型调用服务
 - notification_service.py: 通知服务
 """
@@ -0,0 +1,391 @@
+"""
+=============================================================================
+文件: app/services/ai_service.py
+模块: AI 模型调用服务
+描述: 统一的大模型调用入口：按 (模型, prompt 摘要, 参数) 缓存结果，
+      并把每次调用（含缓存命中）记入 model_call_logs
+=============================================================================
+
+【为什么需要缓存】
+合同审查、法条解读的 prompt 大量重复（同一份模板合同、同一条法条），
+模型调用动辄数秒且按 Token 计费；相同输入的结果可以直接复用。
+
+【缓存键】
+cache_key = SHA-256(model_name, prompt_hash, 参数)，参数按键排序后序列化，
+prompt_hash 即 prompt 的 SHA-256（与 model_call_logs.prompt_hash 相同）。
+temperature、max_tokens 等参数不同视为不同的调用。
+
+【两级缓存】
+1. 内存：进程内 TTL + LRU（LLM_CACHE_MAXSIZE 条），命中时不做任何 I/O
+2. 数据库：model_response_cache 表（默认即 SQLite 主库），进程重启与多 worker 之间共享；
+   命中后回填内存。两级的有效期都是 LLM_CACHE_TTL_SECONDS
+同一进程内相同缓存键的并发调用只请求模型一次，其余调用等待同一个结果；
+发起调用的请求被取消（如客户端断开）时，等待者中的一个重新发起调用，其余继续等待它。
+
+【调用日志】
+每次 invoke 都通过 model_call_logger 记一条日志（攒批写入，不阻塞请求）：
+- 调用模型成功：status="ok"，记录 Token 数与耗时
+- 命中缓存：status="cache_hit"，Token 数为 0（没有产生费用），耗时为本次等待时间
+- 调用失败：status="error"，记录错误信息
+
+【模型后端】
+默认使用 OpenAI 兼容的 Chat Completions 接口（LLM_API_BASE / LLM_API_KEY），
+未配置 LLM_API_BASE 时调用抛出 ModelUnavailable。其他供应商可通过 set_backend 替换。
+
+【使用方法】
+from app.services import ai_service
+result = await ai_service.invoke("contract_review", prompt, user_id=user.id, params={"temperature": 0})
+result.text, result.cached
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+from sqlalchemy import delete, insert, select
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.session import engine
+from app.models.model_response_cache import ModelResponseCache
+from app.services.model_call_logger import hash_prompt, model_call_logger
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class ModelUnavailable(Exception):
+    """未配置模型接口（LLM_API_BASE 为空）。"""
+
+
+class ModelCallError(Exception):
+    """模型接口调用失败（网络错误、非 2xx 响应或响应格式不正确）。"""
+
+
+@dataclass(frozen=True)
+class ModelOutput:
+    """模型后端的一次输出。"""
+
+    text: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+@dataclass(frozen=True)
+class ModelResult:
+    """invoke 的返回值：cached 为 True 时结果来自缓存，Token 数为首次调用时的用量。"""
+
+    text: str
+    model_name: str
+    prompt_hash: str
+    input_tokens: int
+    output_tokens: int
+    cached: bool
+    duration_ms: int
+
+
+# 模型后端：(model_name, prompt, params) -> ModelOutput
+Backend = Callable[[str, str, dict], Awaitable[ModelOutput]]
+
+
+def cache_key(model_name: str, prompt_hash: str, params: dict | None) -> str:
+    """由模型名、prompt 摘要与参数计算缓存键（参数顺序不影响结果）。"""
+    payload = json.dumps(
+        [model_name, prompt_hash, params or {}], sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ======================== 内存缓存 ========================
+
+
+class _MemoryCache:
+    """线程安全的 TTL + LRU 缓存：cache_key -> (过期时间戳, ModelOutput)。"""
+
+    def __init__(self, maxsize: int, ttl_seconds: int) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, ModelOutput]] = OrderedDict()
+
+    def get(self, key: str) -> ModelOutput | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, output: ModelOutput, ttl_seconds: float) -> None:
+        if self.maxsize <= 0 or ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, output)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# ======================== 数据库缓存 ========================
+# 过期时间统一按不带时区的 UTC 存储与比较（SQLite 的 DateTime 不保存时区）
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _db_get(key: str) -> tuple[ModelOutput, datetime] | None:
+    """读取未过期的缓存条目，返回 (输出, 过期时间)。"""
+    t = ModelResponseCache.__table__
+    with engine.connect() as conn:
+        row = conn.execute(
+            select(t.c.response, t.c.input_tokens, t.c.output_tokens, t.c.expires_at).where(
+                t.c.cache_key == key, t.c.expires_at > _utcnow()
+            )
+        ).first()
+    if row is None:
+        return None
+    return ModelOutput(row.response, row.input_tokens, row.output_tokens), row.expires_at
+
+
+def _db_put(key: str, model_name: str, prompt_hash: str, output: ModelOutput) -> None:
+    """写入（或覆盖）缓存条目。"""
+    t = ModelResponseCache.__table__
+    now = _utcnow()
+    with engine.begin() as conn:
+        conn.execute(delete(t).where(t.c.cache_key == key))
+        conn.execute(
+            insert(t).values(
+                cache_key=key,
+                model_name=model_name,
+                prompt_hash=prompt_hash,
+                response=output.text,
+                input_tokens=output.input_tokens,
+                output_tokens=output.output_tokens,
+                created_at=now,
+                expires_at=now + timedelta(seconds=settings.LLM_CACHE_TTL_SECONDS),
+            )
+        )
+
+
+def purge_expired() -> int:
+    """删除已过期的数据库缓存条目，返回删除条数（应用启动时调用一次）。"""
+    t = ModelResponseCache.__table__
+    with engine.begin() as conn:
+        return conn.execute(delete(t).where(t.c.expires_at <= _utcnow())).rowcount
+
+
+# ======================== 模型后端 ========================
+
+# httpx 在第一次调用模型接口时才导入（约 50ms），不计入应用启动时间
+_http_client: "httpx.AsyncClient | None" = None
+
+
+async def _openai_compatible_backend(model_name: str, prompt: str, params: dict) -> ModelOutput:
+    """OpenAI 兼容的 Chat Completions 接口（POST {LLM_API_BASE}/chat/completions）。"""
+    global _http_client
+    if not settings.LLM_API_BASE:
+        raise ModelUnavailable("未配置模型接口 LLM_API_BASE")
+    import httpx
+
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(timeout=settings.LLM_TIMEOUT_SECONDS)
+    headers = {"Authorization": f"Bearer {settings.LLM_API_KEY}"} if settings.LLM_API_KEY else {}
+    try:
+        r = await _http_client.post(
+            settings.LLM_API_BASE.rstrip("/") + "/chat/completions",
+            headers=headers,
+            json={"model": model_name, "messages": [{"role": "user", "content": prompt}], **params},
+        )
+        r.raise_for_status()
+        data = r.json()
+        usage = data.get("usage") or {}
+        return ModelOutput(
+            text=data["choices"][0]["message"]["content"],
+            input_tokens=usage.get("prompt_tokens", 0),
+            output_tokens=usage.get("completion_tokens", 0),
+        )
+    except (httpx.HTTPError, ValueError, KeyError, IndexError, TypeError) as e:
+        raise ModelCallError(f"模型接口调用失败：{e}") from e
+
+
+_backend: Backend = _openai_compatible_backend
+
+
+def set_backend(backend: Backend | None) -> None:
+    """替换模型后端（传入 None 恢复默认的 OpenAI 兼容接口）。"""
+    global _backend
+    _backend = backend or _openai_compatible_backend
+
+
+async def aclose() -> None:
+    """关闭默认后端的 HTTP 连接池（应用关闭时调用）。"""
+    global _http_client
+    client, _http_client = _http_client, None
+    if client is not None:
+        await client.aclose()
+
+
+# ======================== 调用入口 ========================
+
+_memory = _MemoryCache(maxsize=settings.LLM_CACHE_MAXSIZE, ttl_seconds=settings.LLM_CACHE_TTL_SECONDS)
+# 进行中的模型调用：cache_key -> Future，相同键的并发调用共享结果
+_inflight: dict[str, asyncio.Future] = {}
+_stats = {"memory_hits": 0, "db_hits": 0, "shared": 0, "misses": 0}
+
+
+async def _lookup(key: str) -> ModelOutput | None:
+    output = _memory.get(key)
+    if output is not None:
+        _stats["memory_hits"] += 1
+        return output
+    found = await run_in_threadpool(_db_get, key)
+    if found is None:
+        return None
+    output, expires_at = found
+    _stats["db_hits"] += 1
+    # 回填内存，有效期不超过数据库条目的剩余时间
+    _memory.put(key, output, (expires_at - _utcnow()).total_seconds())
+    return output
+
+
+async def _call_backend(key: str, model_name: str, prompt: str, prompt_hash: str, params: dict) -> ModelOutput:
+    output = await _backend(model_name, prompt, params)
+    _memory.put(key, output, settings.LLM_CACHE_TTL_SECONDS)
+    if settings.LLM_CACHE_TTL_SECONDS > 0:
+        try:
+            await run_in_threadpool(_db_put, key, model_name, prompt_hash, output)
+        except Exception:
+            # 缓存写入失败不影响本次调用的结果
+            logger.exception("写入模型响应缓存失败")
+    return output
+
+
+async def invoke(
+    endpoint: str,
+    prompt: str,
+    *,
+    model_name: str | None = None,
+    params: dict | None = None,
+    user_id: int | None = None,
+    use_cache: bool = True,
+) -> ModelResult:
+    """
+    调用大模型（带缓存与调用日志）
+
+    【参数说明】
+    - endpoint: str - 调用场景标识，如 "contract_review"、"law_explain"（写入日志）
+    - prompt: str - 完整的输入文本
+    - model_name: str | None - 模型名称，为空时使用 LLM_DEFAULT_MODEL
+    - params: dict | None - 传给模型接口的其他参数（temperature、max_tokens 等），参与缓存键
+    - user_id: int | None - 调用者（写入日志）
+    - use_cache: bool - False 时不读缓存（结果仍会写入缓存）
+
+    【返回值】
+    ModelResult: 输出文本、Token 用量、是否来自缓存
+
+    【异常情况】
+    - ModelUnavailable: 未配置模型接口
+    - ModelCallError: 模型接口调用失败
+    """
+    model_name = model_name or settings.LLM_DEFAULT_MODEL
+    params = params or {}
+    prompt_hash = hash_prompt(prompt)
+    key = cache_key(model_name, prompt_hash, params)
+    started = time.perf_counter()
+
+    def result(output: ModelOutput, cached: bool) -> ModelResult:
+        duration_ms = int((time.perf_counter() - started) * 1000)
+        model_call_logger.log_call(
+            endpoint,
+            model_name=model_name,
+            user_id=user_id,
+            prompt_hash=prompt_hash,
+            input_tokens=0 if cached else output.input_tokens,
+            output_tokens=0 if cached else output.output_tokens,
+            status="cache_hit" if cached else "ok",
+            duration_ms=duration_ms,
+        )
+        return ModelResult(
+            output.text, model_name, prompt_hash, output.input_tokens, output.output_tokens, cached, duration_ms
+        )
+
+    if use_cache:
+        output = await _lookup(key)
+        if output is not None:
+            return result(output, cached=True)
+        while (pending := _inflight.get(key)) is not None:
+            _stats["shared"] += 1
+            try:
+                # shield：某个等待者被取消时不影响进行中的调用
+                return result(await asyncio.shield(pending), cached=True)
+            except asyncio.CancelledError:
+                # 发起调用的请求被取消：重新查找进行中的调用，没有则由本请求发起；本请求自身被取消时照常抛出
+                if not pending.cancelled() or _cancelling():
+                    raise
+
+    _stats["misses"] += 1
+    future = asyncio.get_running_loop().create_future()
+    if use_cache:
+        _inflight[key] = future
+    try:
+        output = await _call_backend(key, model_name, prompt, prompt_hash, params)
+    except Exception as e:
+        model_call_logger.log_call(
+            endpoint,
+            model_name=model_name,
+            user_id=user_id,
+            prompt_hash=prompt_hash,
+            status="error",
+            error_message=str(e)[:1000],
+            duration_ms=int((time.perf_counter() - started) * 1000),
+        )
+        future.set_exception(e)
+        future.exception()  # 没有其他等待者时避免 "exception was never retrieved" 警告
+        raise
+    else:
+        future.set_result(output)
+        return result(output, cached=False)
+    finally:
+        if not future.done():
+            # 本请求被取消（CancelledError 不是 Exception，不经过上面的 except）：
+            # 取消 future，否则等待同一结果的请求会一直挂起
+            future.cancel()
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+def _cancelling() -> bool:
+    """当前任务是否被请求取消（Python 3.11+ 才能区分；3.10 下按未取消处理）。"""
+    task = asyncio.current_task()
+    return bool(task is not None and getattr(task, "cancelling", lambda: 0)())
+
+
+def cache_stats() -> dict:
+    """缓存命中情况：memory_hits / db_hits / shared（并发共享）/ misses，以及内存条目数。"""
+    return {**_stats, "memory_size": len(_memory)}
+
+
+def clear_memory_cache() -> None:
+    """清空内存缓存（数据库缓存不受影响）。"""
+    _memory.clear()
@@ -0,0 +1,167 @@
+"""
+=============================================================================
+文件: app/services/auth_cache.py
+模块: 认证用户缓存
+描述: 进程内 TTL + LRU 缓存，按 Token 缓存已认证用户的快照
+      让 get_current_user 在命中时既不解码 JWT，也不查询 users 表
+=============================================================================
+
+【为什么需要】
+每个需要登录的请求都会经过 get_current_user：解码 JWT + SELECT users。
+同一个 Token 在有效期内会被反复使用，结果几乎不变，适合缓存。
+
+【缓存策略】
+1. 键：Token 字符串；值：User 各列的快照（dict）
+2. 过期：min(写入时间 + AUTH_CACHE_TTL_SECONDS, Token 自身 exp)，过期 Token 不会被命中
+3. 容量：超过 AUTH_CACHE_MAXSIZE 时淘汰最久未使用的条目（LRU）
+4. 失效：User 被更新或删除（停用、改角色等）时，按用户名清除其所有 Token 条目
+   - flush 时立即清除一次，事务提交后再清除一次，避免提交前被并发请求以旧数据回填
+   - 多进程部署时其他进程依赖 TTL 兜底，TTL 不宜设置过长
+
+【使用方法】
+from app.services.auth_cache import auth_cache
+auth_cache.stats()  # {"hits": ..., "misses": ..., "size": ...}
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+
+from app.core.config import settings
+from app.models.user import User
+
+# 记录在 Session.info 中、待事务提交后再次清除的用户名
+_PENDING_KEY = "auth_cache_pending"
+
+
+class AuthCache:
+    """
+    线程安全的 TTL + LRU 认证缓存
+
+    【属性说明】
+    - hits / misses: 命中 / 未命中次数
+    - invalidations: 因 User 写入而清除的条目数
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: int) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # token -> (过期时间戳, 用户名, 快照)
+        self._entries: OrderedDict[str, tuple[float, str, dict]] = OrderedDict()
+        # 用户名 -> 该用户已缓存的 token 集合，用于按用户失效
+        self._by_subject: dict[str, set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.maxsize > 0
+
+    def get(self, token: str) -> User | None:
+        """命中时返回一个脱离会话（detached）的 User 副本，否则返回 None。"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    self._drop(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            snapshot = entry[2]
+        return _to_user(snapshot)
+
+    def put(self, token: str, user: User, token_exp: float | None = None) -> None:
+        """缓存用户快照；token_exp 为 JWT 的 exp 声明（Unix 时间戳）。"""
+        if not self.enabled:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        snapshot = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        with self._lock:
+            if token in self._entries:
+                self._drop(token)
+            self._entries[token] = (expires_at, user.username, snapshot)
+            self._by_subject.setdefault(user.username, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_subject(self, username: str) -> None:
+        """清除某个用户的所有缓存条目。"""
+        with self._lock:
+            for token in list(self._by_subject.get(username, ())):
+                self._drop(token)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_subject.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    def _drop(self, token: str) -> None:
+        # 调用方需持有锁
+        _, username, _ = self._entries.pop(token)
+        tokens = self._by_subject.get(username)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_subject[username]
+
+
+def _to_user(snapshot: dict) -> User:
+    """由快照构造 detached 状态的 User：属性可直接读取，不会触发数据库查询。"""
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return user
+
+
+# 全局缓存实例，get_current_user 与 get_current_user_optional 共用
+auth_cache = AuthCache(
+    maxsize=settings.AUTH_CACHE_MAXSIZE, ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+
+# ======================== User 写入时失效 ========================
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper, connection, target: User) -> None:
+    # 用户名本身被修改时，旧用户名对应的条目也要清除
+    history = inspect(target).attrs.username.history
+    usernames = {target.username, *(history.deleted or ())}
+    for username in usernames:
+        auth_cache.invalidate_subject(username)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).update(usernames)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for username in session.info.pop(_PENDING_KEY, ()):
+        auth_cache.invalidate_subject(username)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
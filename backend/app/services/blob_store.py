@@ -0,0 +1,180 @@
+"""
+=============================================================================
+文件: app/services/blob_store.py
+模块: 内容寻址文件存储
+描述: 按 SHA-256 摘要去重保存上传文件，并维护 file_blobs 的引用计数
+=============================================================================
+
+【为什么需要】
+同一份合同模板会被不同用户反复上传，原先每次都生成一份 {uuid}_{文件名} 副本。
+按内容寻址后，相同内容在磁盘上只保存一份，重复上传在算出摘要后即可完成，
+临时文件直接删除，不再写入新的副本。
+
+【目录结构】
+{UPLOAD_DIR}/
+├── tmp/                      - 流式上传中的临时文件（.part）
+└── blobs/ab/cd/abcd1234...   - 内容文件，按摘要前 2+2 位分两级目录，避免单目录文件过多
+
+【引用计数】
+1. link_upload 只负责保证 file_blobs 中存在该内容（新内容 ref_count 从 0 开始）
+2. 监听 UploadedFile 的 after_insert / after_delete 事件，
+   在同一事务的连接上执行 ref_count = ref_count ± 1（SQL 层原子更新，并发安全）
+3. 计数降为 0 时删除 file_blobs 记录，事务提交后再删除磁盘文件
+
+【提交失败】
+新内容在提交前就放入 blobs/（记录可见时文件一定已存在）。提交失败回滚后，
+调用方执行 discard_orphans：数据库中没有对应 file_blobs 记录的内容文件随即删除，不留孤儿文件。
+
+【使用方法】
+stored = await receive_upload(request, blob_store.tmp_dir())
+blob = await blob_store.link_upload(db, stored)
+db.add(UploadedFile(..., sha256=blob.sha256, path=blob.path))
+try:
+    await db.commit()
+except Exception:
+    await db.rollback()
+    await blob_store.discard_orphans(db)
+    raise
+"""
+
+import os
+from pathlib import Path
+
+from sqlalchemy import delete, event, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.models.file_blob import FileBlob
+from app.models.uploaded_file import UploadedFile
+from app.services.upload_stream import StoredUpload
+
+# 记录在 Session.info 中、待事务提交后删除的内容文件路径
+_PENDING_KEY = "blob_store_unlink"
+# 记录在 Session.info 中、本会话放入 blobs/ 但尚未提交的内容：{sha256: (st_dev, st_ino)}
+_PLACED_KEY = "blob_store_placed"
+
+
+def blob_root() -> Path:
+    return Path(settings.UPLOAD_DIR) / "blobs"
+
+
+def tmp_dir() -> Path:
+    """上传临时目录：与 blobs/ 同在 UPLOAD_DIR 下，保证 os.replace 是原子操作。"""
+    return Path(settings.UPLOAD_DIR) / "tmp"
+
+
+def blob_path(sha256: str) -> Path:
+    """内容文件路径：blobs/ab/cd/abcd...。"""
+    return blob_root() / sha256[:2] / sha256[2:4] / sha256
+
+
+def _move_into_place(src: Path, dest: Path) -> tuple[int, int]:
+    """改名到 dest 并返回其 (st_dev, st_ino)，用于回滚时确认文件仍是本次放入的那一个。"""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    # 并发上传同一内容时可能已被其他请求放好，内容相同，直接覆盖即可
+    os.replace(src, dest)
+    st = dest.stat()
+    return st.st_dev, st.st_ino
+
+
+def _unlink_if_placed(path: Path, ident: tuple[int, int]) -> None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return
+    # 已被并发上传同一内容的请求替换为它的副本：对方即将提交并引用该文件，保留
+    if (st.st_dev, st.st_ino) == ident:
+        path.unlink(missing_ok=True)
+
+
+async def link_upload(db: AsyncSession, stored: StoredUpload) -> FileBlob:
+    """
+    为上传结果找到或创建对应的 FileBlob（尚未提交）
+
+    【功能说明】
+    - 内容已存在：删除临时文件，返回已有记录（不产生第二次写盘）
+    - 内容不存在：把临时文件原子改名到 blobs/ 下，新建 ref_count=0 的记录
+    引用计数由随后插入的 UploadedFile 触发事件加 1。
+
+    【注意事项】
+    两个请求并发上传同一新内容时，后提交的一方会因主键冲突失败（IntegrityError），
+    调用方回滚后重新调用本函数即可，此时会走"内容已存在"分支。
+    其他原因提交失败时，调用方回滚后执行 discard_orphans 删除已放入的内容文件。
+    """
+    blob = await db.get(FileBlob, stored.sha256)
+    if blob is not None:
+        await run_in_threadpool(stored.path.unlink, missing_ok=True)
+        return blob
+    dest = blob_path(stored.sha256)
+    ident = await run_in_threadpool(_move_into_place, stored.path, dest)
+    db.sync_session.info.setdefault(_PLACED_KEY, {})[stored.sha256] = ident
+    blob = FileBlob(sha256=stored.sha256, size=stored.size, path=str(dest), ref_count=0)
+    db.add(blob)
+    return blob
+
+
+async def discard_orphans(db: AsyncSession) -> None:
+    """
+    提交失败、回滚之后调用：删除本会话放入 blobs/ 但数据库中没有 file_blobs 记录的内容文件
+
+    【注意事项】
+    并发上传同一新内容时，对方提交的记录会引用同一路径：记录已存在则保留；
+    文件已被对方的副本替换（inode 不同）说明对方即将提交，同样保留。
+    """
+    placed = db.sync_session.info.pop(_PLACED_KEY, None)
+    if not placed:
+        return
+    result = await db.execute(select(FileBlob.sha256).where(FileBlob.sha256.in_(list(placed))))
+    referenced = set(result.scalars())
+    for sha256, ident in placed.items():
+        if sha256 not in referenced:
+            await run_in_threadpool(_unlink_if_placed, blob_path(sha256), ident)
+
+
+# ======================== 引用计数（ORM 事件） ========================
+# 事件在 flush 时触发，使用当前事务的连接，计数与 uploaded_files 同一事务提交或回滚。
+
+
+@event.listens_for(UploadedFile, "after_insert")
+def _add_ref(mapper, connection: Connection, target: UploadedFile) -> None:
+    if target.sha256:
+        connection.execute(
+            update(FileBlob)
+            .where(FileBlob.sha256 == target.sha256)
+            .values(ref_count=FileBlob.ref_count + 1)
+        )
+
+
+@event.listens_for(UploadedFile, "after_delete")
+def _drop_ref(mapper, connection: Connection, target: UploadedFile) -> None:
+    if not target.sha256:
+        return
+    connection.execute(
+        update(FileBlob)
+        .where(FileBlob.sha256 == target.sha256)
+        .values(ref_count=FileBlob.ref_count - 1)
+    )
+    row = connection.execute(
+        select(FileBlob.ref_count, FileBlob.path).where(FileBlob.sha256 == target.sha256)
+    ).first()
+    if row is not None and row.ref_count <= 0:
+        connection.execute(delete(FileBlob).where(FileBlob.sha256 == target.sha256))
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault(_PENDING_KEY, set()).add(row.path)
+
+
+@event.listens_for(Session, "after_commit")
+def _unlink_after_commit(session: Session) -> None:
+    # 已提交：放入的内容文件已被记录引用
+    session.info.pop(_PLACED_KEY, None)
+    for path in session.info.pop(_PENDING_KEY, ()):
+        Path(path).unlink(missing_ok=True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
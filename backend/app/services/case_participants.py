@@ -0,0 +1,110 @@
+"""
+=============================================================================
+文件: app/services/case_participants.py
+模块: 案件参与人维护
+描述: 维护 case_participants 表：案件写入时在同一事务中同步参与人行，并支持按 cases 全量重建
+=============================================================================
+
+【为什么需要】
+案件列表原先是 cases WHERE lawyer_id = ? OR client_id = ? ORDER BY created_at DESC。
+OR 条件只能用两个单列索引分别查找再合并（SQLite MULTI-INDEX OR / PostgreSQL BitmapOr），
+合并结果不再有序，每次都要把用户的全部案件取出来排序后才能返回一页；
+也无法表达一个案件有多位律师（协办）或多个客户。
+
+【实现方案】
+1. 关系表：每个 (案件, 参与人) 一行，带角色，以及案件状态、创建时间的副本
+2. 同步：监听 Case 的 after_insert / after_update / after_delete 事件，在同一个连接（同一事务）中更新：
+   - 新建案件：写入律师、客户（如有）两行
+   - 更换律师或客户：重写这两种角色的行
+   - 只改状态：按 case_id 更新 status
+3. 查询：案件列表从 case_participants 按 (user_id, created_at, case_id) 索引顺序读取，再按主键 JOIN cases，
+   是一次索引范围查找；每行的角色决定该行按律师视角还是客户视角展示
+
+【注意事项】
+绕过 ORM 的批量 UPDATE cases 不会触发事件，需要同时更新本表（或之后调用 rebuild）。
+
+【使用方法】
+from app.services import case_participants
+rows = case_participants.participant_rows(case)   # 由案件派生的参与人行
+case_participants.rebuild(conn)                    # 按 cases 全量重建
+"""
+
+from sqlalchemy import delete, event, insert, inspect, literal, select, update
+from sqlalchemy.engine import Connection
+
+from app.models.case import Case
+from app.models.case_participant import PARTICIPANT_CLIENT, PARTICIPANT_LAWYER, CaseParticipant
+
+_DERIVED_ROLES = (PARTICIPANT_LAWYER, PARTICIPANT_CLIENT)
+
+
+def participant_rows(case: Case) -> list[dict]:
+    """由案件的 lawyer_id / client_id 派生参与人行；律师与客户是同一用户时只保留律师角色。"""
+    rows = [
+        {
+            "case_id": case.id,
+            "user_id": case.lawyer_id,
+            "role": PARTICIPANT_LAWYER,
+            "status": case.status,
+            "created_at": case.created_at,
+        }
+    ]
+    if case.client_id is not None and case.client_id != case.lawyer_id:
+        rows.append({**rows[0], "user_id": case.client_id, "role": PARTICIPANT_CLIENT})
+    return rows
+
+
+def rebuild(conn: Connection) -> None:
+    """按 cases 全量重建律师、客户两种角色的参与人行（INSERT ... SELECT，不经过 Python）。"""
+    conn.execute(delete(CaseParticipant).where(CaseParticipant.role.in_(_DERIVED_ROLES)))
+    columns = ["case_id", "user_id", "role", "status", "created_at"]
+    conn.execute(
+        insert(CaseParticipant).from_select(
+            columns,
+            select(Case.id, Case.lawyer_id, literal(PARTICIPANT_LAWYER), Case.status, Case.created_at),
+        )
+    )
+    conn.execute(
+        insert(CaseParticipant).from_select(
+            columns,
+            select(Case.id, Case.client_id, literal(PARTICIPANT_CLIENT), Case.status, Case.created_at).where(
+                Case.client_id.is_not(None), Case.client_id != Case.lawyer_id
+            ),
+        )
+    )
+
+
+# ======================== 同步（ORM 事件） ========================
+# 事件在 flush 时触发，使用当前事务的连接，参与人行与案件同一事务提交或回滚。
+
+
+def _replace(connection: Connection, target: Case) -> None:
+    connection.execute(
+        delete(CaseParticipant).where(
+            CaseParticipant.case_id == target.id, CaseParticipant.role.in_(_DERIVED_ROLES)
+        )
+    )
+    connection.execute(insert(CaseParticipant), participant_rows(target))
+
+
+@event.listens_for(Case, "after_insert")
+def _add_participants(mapper, connection: Connection, target: Case) -> None:
+    connection.execute(insert(CaseParticipant), participant_rows(target))
+
+
+@event.listens_for(Case, "after_update")
+def _sync_participants(mapper, connection: Connection, target: Case) -> None:
+    attrs = inspect(target).attrs
+    if attrs.lawyer_id.history.has_changes() or attrs.client_id.history.has_changes():
+        _replace(connection, target)
+    elif attrs.status.history.has_changes():
+        connection.execute(
+            update(CaseParticipant)
+            .where(CaseParticipant.case_id == target.id)
+            .values(status=target.status)
+        )
+
+
+@event.listens_for(Case, "after_delete")
+def _remove_participants(mapper, connection: Connection, target: Case) -> None:
+    connection.execute(delete(CaseParticipant).where(CaseParticipant.case_id == target.id))
@@ -0,0 +1,285 @@
+"""
+=============================================================================
+文件: app/services/dashboard_counters.py
+模块: 首页计数维护
+描述: 维护 dashboard_counters 表（每个用户的案件 / 合同分状态计数），并定时对账修正
+=============================================================================
+
+【为什么需要】
+小程序首页要显示各状态的案件数、合同数。原先只能拉取完整的案件 / 合同列表在客户端计数，
+数据越多越慢；在服务端 COUNT 也要扫描用户的全部案件。计数表让汇总接口变成一次主键读取。
+
+【增量维护】
+监听 Case / Contract 的 after_insert / after_update / after_delete 事件，在同一个连接（同一事务）中
+对受影响用户的计数列做 col = col + 增量，与案件、合同一同提交或回滚：
+- 案件：律师、客户（与 case_participants 一致，同一用户只计一次）各自的 cases_<状态> 列
+- 合同：所有者的 contracts_<状态> 列
+- 状态变更 / 更换参与人：旧状态、旧参与人减一，新状态、新参与人加一
+旧值取自属性历史（相关列设置了 active_history，修改前未加载时会先读出旧值）。
+
+【对账】
+绕过 ORM 的批量 UPDATE / DELETE、手工改库、事务外的异常都可能让计数与数据不一致。
+reconcile() 按 case_participants 与 contracts 分组计数，与计数表逐行比较，只改写不一致的行：
+- 应用内：start() 启动的后台任务每 DASHBOARD_RECONCILE_INTERVAL_SECONDS 秒对账一次（0 表示不启动）
+- 命令行 / 定时任务：python scripts/reconcile_dashboard.py
+对账事务的第一条语句写 dashboard_reconcile 的锁行取得写锁（SQLite），对账期间的案件、合同写入排队等待，
+不会在计数读出与写回之间丢失增量；其他数据库下并发写入造成的偏差在下一轮对账时修正。
+
+【使用方法】
+from app.services import dashboard_counters
+dashboard_counters.summary(row)               # 计数行 -> 汇总接口的响应结构
+dashboard_counters.run_reconcile(engine)      # 对账，返回修正的用户数
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from sqlalchemy import bindparam, event, func, insert, inspect, select, update
+from sqlalchemy.engine import Connection, Engine
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.models.case import Case
+from app.models.case_participant import CaseParticipant
+from app.models.contract import Contract
+from app.models.dashboard_counter import (
+    CASE_STATUSES,
+    CONTRACT_STATUSES,
+    DashboardCounter,
+    DashboardReconcile,
+)
+
+logger = logging.getLogger(__name__)
+
+# dashboard_reconcile 表中锁行的主键（表中只有这一行）
+RECONCILE_LOCK_ID = 1
+
+_CASE_COLUMNS = tuple(f"cases_{s}" for s in CASE_STATUSES) + ("cases_other",)
+_CONTRACT_COLUMNS = tuple(f"contracts_{s}" for s in CONTRACT_STATUSES) + ("contracts_other",)
+COUNT_COLUMNS = _CASE_COLUMNS + _CONTRACT_COLUMNS
+
+
+def _case_column(status: str | None) -> str:
+    return f"cases_{status}" if status in CASE_STATUSES else "cases_other"
+
+
+def _contract_column(status: str | None) -> str:
+    return f"contracts_{status}" if status in CONTRACT_STATUSES else "contracts_other"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def summary(row: DashboardCounter | None) -> dict:
+    """计数行转换为汇总接口的响应结构；用户还没有计数行时全部为 0。"""
+
+    def counts(columns: tuple[str, ...], prefix: str) -> dict:
+        out = {c.removeprefix(prefix): (getattr(row, c) or 0) if row is not None else 0 for c in columns}
+        out["total"] = sum(out.values())
+        return out
+
+    return {"cases": counts(_CASE_COLUMNS, "cases_"), "contracts": counts(_CONTRACT_COLUMNS, "contracts_")}
+
+
+# ======================== 增量维护（ORM 事件） ========================
+
+
+def _apply(connection: Connection, deltas: dict[int, dict[str, int]]) -> None:
+    """把 {user_id: {列: 增量}} 累加到计数表；用户还没有计数行时插入一行（负增量按 0 计，由对账修正）。"""
+    t = DashboardCounter.__table__
+    for user_id, changes in deltas.items():
+        changes = {c: d for c, d in changes.items() if d}
+        if not changes:
+            continue
+        updated = connection.execute(
+            update(t).where(t.c.user_id == user_id).values({c: t.c[c] + d for c, d in changes.items()})
+        ).rowcount
+        if not updated:
+            connection.execute(
+                insert(t).values(
+                    {
+                        "user_id": user_id,
+                        **dict.fromkeys(COUNT_COLUMNS, 0),
+                        **{c: max(d, 0) for c, d in changes.items()},
+                    }
+                )
+            )
+
+
+def _old(target, name: str):
+    """属性修改前的值（未修改时为当前值）。"""
+    history = inspect(target).attrs[name].history
+    return history.deleted[0] if history.deleted else getattr(target, name)
+
+
+def _case_users(lawyer_id: int | None, client_id: int | None) -> set[int]:
+    return {u for u in (lawyer_id, client_id) if u is not None}
+
+
+def _add(deltas: dict, users, column: str, step: int) -> None:
+    for user_id in users:
+        deltas[user_id][column] += step
+
+
+@event.listens_for(Case, "after_insert")
+def _case_inserted(mapper, connection: Connection, target: Case) -> None:
+    deltas = defaultdict(lambda: defaultdict(int))
+    _add(deltas, _case_users(target.lawyer_id, target.client_id), _case_column(target.status), 1)
+    _apply(connection, deltas)
+
+
+@event.listens_for(Case, "after_update")
+def _case_updated(mapper, connection: Connection, target: Case) -> None:
+    attrs = inspect(target).attrs
+    if not any(attrs[n].history.has_changes() for n in ("status", "lawyer_id", "client_id")):
+        return
+    deltas = defaultdict(lambda: defaultdict(int))
+    old_users = _case_users(_old(target, "lawyer_id"), _old(target, "client_id"))
+    _add(deltas, old_users, _case_column(_old(target, "status")), -1)
+    _add(deltas, _case_users(target.lawyer_id, target.client_id), _case_column(target.status), 1)
+    _apply(connection, deltas)
+
+
+@event.listens_for(Case, "after_delete")
+def _case_deleted(mapper, connection: Connection, target: Case) -> None:
+    deltas = defaultdict(lambda: defaultdict(int))
+    old_users = _case_users(_old(target, "lawyer_id"), _old(target, "client_id"))
+    _add(deltas, old_users, _case_column(_old(target, "status")), -1)
+    _apply(connection, deltas)
+
+
+@event.listens_for(Contract, "after_insert")
+def _contract_inserted(mapper, connection: Connection, target: Contract) -> None:
+    _apply(connection, {target.user_id: {_contract_column(target.status): 1}})
+
+
+@event.listens_for(Contract, "after_update")
+def _contract_updated(mapper, connection: Connection, target: Contract) -> None:
+    attrs = inspect(target).attrs
+    if not (attrs.status.history.has_changes() or attrs.user_id.history.has_changes()):
+        return
+    deltas = defaultdict(lambda: defaultdict(int))
+    _add(deltas, [_old(target, "user_id")], _contract_column(_old(target, "status")), -1)
+    _add(deltas, [target.user_id], _contract_column(target.status), 1)
+    _apply(connection, deltas)
+
+
+@event.listens_for(Contract, "after_delete")
+def _contract_deleted(mapper, connection: Connection, target: Contract) -> None:
+    _apply(connection, {_old(target, "user_id"): {_contract_column(_old(target, "status")): -1}})
+
+
+# ======================== 对账 ========================
+
+
+def _expected(conn: Connection) -> dict[int, dict[str, int]]:
+    """按 case_participants 与 contracts 分组计数，得到每个用户应有的计数。"""
+    out: dict[int, dict[str, int]] = defaultdict(lambda: dict.fromkeys(COUNT_COLUMNS, 0))
+    cp = CaseParticipant.__table__
+    for user_id, status, n in conn.execute(
+        select(cp.c.user_id, cp.c.status, func.count()).group_by(cp.c.user_id, cp.c.status)
+    ):
+        out[user_id][_case_column(status)] += n
+    ct = Contract.__table__
+    for user_id, status, n in conn.execute(
+        select(ct.c.user_id, ct.c.status, func.count()).group_by(ct.c.user_id, ct.c.status)
+    ):
+        out[user_id][_contract_column(status)] += n
+    return out
+
+
+def reconcile(conn: Connection) -> int:
+    """在当前事务中把计数表改写为与数据一致，返回修正的用户数。"""
+    lock = DashboardReconcile.__table__
+    now = _utcnow()
+    # 先写锁行取得锁，再读数据
+    claimed = conn.execute(
+        update(lock).where(lock.c.id == RECONCILE_LOCK_ID).values(reconciled_at=now)
+    ).rowcount
+    if not claimed:
+        conn.execute(insert(lock).values(id=RECONCILE_LOCK_ID, reconciled_at=now))
+
+    t = DashboardCounter.__table__
+    expected = _expected(conn)
+    existing = {
+        row.user_id: row
+        for row in conn.execute(select(t.c.user_id, *(t.c[c] for c in COUNT_COLUMNS)))
+    }
+    zeros = dict.fromkeys(COUNT_COLUMNS, 0)
+    updates, inserts = [], []
+    for user_id, counts in expected.items():
+        row = existing.pop(user_id, None)
+        if row is None:
+            inserts.append({"user_id": user_id, **counts, "reconciled_at": now})
+        elif any(getattr(row, c) != counts[c] for c in COUNT_COLUMNS):
+            updates.append({"k_user_id": user_id, **counts})
+    # 计数表中有、数据中已没有案件与合同的用户：计数归零
+    for user_id, row in existing.items():
+        if any(getattr(row, c) for c in COUNT_COLUMNS):
+            updates.append({"k_user_id": user_id, **zeros})
+
+    if updates:
+        conn.execute(
+            update(t)
+            .where(t.c.user_id == bindparam("k_user_id"))
+            .values({**{c: bindparam(c) for c in COUNT_COLUMNS}, "reconciled_at": now}),
+            updates,
+        )
+    if inserts:
+        conn.execute(insert(t), inserts)
+    return len(updates) + len(inserts)
+
+
+def run_reconcile(engine: Engine) -> int:
+    """
+    对账一次（一个事务），返回修正的用户数
+
+    【使用示例】
+    from app.db.session import engine
+    run_reconcile(engine)
+    """
+    with engine.begin() as conn:
+        repaired = reconcile(conn)
+    if repaired:
+        logger.warning("首页计数与数据不一致，已修正 %d 个用户", repaired)
+    return repaired
+
+
+# ======================== 后台任务 ========================
+
+_task: asyncio.Task | None = None
+
+
+async def _run_periodically(engine: Engine, interval: float) -> None:
+    # 计数由写入事件实时维护，启动时不必先对账，等一个间隔后再开始
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(run_reconcile, engine)
+        except Exception:
+            logger.exception("首页计数对账失败，下次继续")
+
+
+def start(engine: Engine) -> None:
+    """启动定时对账（DASHBOARD_RECONCILE_INTERVAL_SECONDS 为 0 时不启动）。"""
+    global _task
+    if settings.DASHBOARD_RECONCILE_INTERVAL_SECONDS <= 0 or (_task is not None and not _task.done()):
+        return
+    _task = asyncio.get_running_loop().create_task(
+        _run_periodically(engine, settings.DASHBOARD_RECONCILE_INTERVAL_SECONDS), name="dashboard-reconcile"
+    )
+
+
+async def stop() -> None:
+    """停止定时对账（进行中的一轮会在线程中执行完并提交）。"""
+    global _task
+    task, _task = _task, None
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,282 @@
+"""
+=============================================================================
+文件: app/services/law_import.py
+模块: 法条批量导入
+描述: 把法律全文（纯文本）、JSONL 或 CSV 文件流式解析为法条，
+      分批写入 law_articles 表并同步更新全文索引
+=============================================================================
+
+【为什么需要】
+law_articles 表原先没有任何导入途径，只能手工逐条插入。
+一部民法典有 1260 条，逐条走 ORM（每条一次 INSERT + 一次索引更新 + 一次提交）既慢，
+又要先把整个文件读进内存。
+
+【实现方案】
+1. 解析：逐行读取文件，生成器逐条产出法条，内存占用与文件大小无关
+   - 纯文本：预编译正则 + 状态机，按行首的 "第X条" 切分条文（见 parse_text）
+   - JSONL：每行一个对象 {"law_name", "article_no", "content"}
+   - CSV：表头含 content 列，law_name / article_no 列可选
+2. 写入：每 batch_size 条一个事务
+   - 同一法律的同一条款已存在时更新内容，否则插入（重复导入不会产生重复数据）
+   - 插入用 executemany + RETURNING 取回 id，更新用 executemany
+   - 在同一连接上调用 law_search.index_many 更新索引，与数据同一事务提交
+3. 入口：命令行脚本 scripts/import_laws.py 与管理员接口 POST /api/v1/admin/laws/import
+
+【使用方法】
+from app.services import law_import
+result = law_import.import_file(engine, "民法典.txt", law_name="中华人民共和国民法典")
+result.inserted, result.updated, result.skipped
+"""
+
+import csv
+import json
+import re
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.models.law_article import LawArticle
+from app.services import law_search
+
+# 支持的文件格式
+FORMATS = ("text", "jsonl", "csv")
+
+_SUFFIX_FORMATS = {".txt": "text", ".text": "text", ".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+
+_NUM = r"[0-9０-９零〇一二两三四五六七八九十百千]+"
+# 条文开头：行首 "第X条"（可带 "之一" 等），其后必须是空白或行尾，
+# 以区分折行后恰好以 "第十条规定……" 开头的正文
+_ARTICLE_RE = re.compile(rf"^[\s　]*(第{_NUM}条(?:之{_NUM})?)(?:[\s　]+|$)(.*)$")
+# 编、分编、章、节标题与目录：结束当前条文，本身不属于任何条文
+_HEADING_RE = re.compile(rf"^[\s　]*(?:第{_NUM}(?:分编|编|章|节)(?:[\s　]|$)|目[\s　]*录$)")
+
+_table = LawArticle.__table__
+
+
+class LawImportError(ValueError):
+    """文件格式无法识别，或某一行无法解析（消息中包含行号）。"""
+
+
+@dataclass
+class ImportResult:
+    """导入结果统计。"""
+
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+
+# ======================== 解析 ========================
+
+
+def detect_format(filename: str) -> str:
+    """按扩展名判断文件格式。"""
+    fmt = _SUFFIX_FORMATS.get(Path(filename).suffix.lower())
+    if fmt is None:
+        raise LawImportError(f"无法识别的文件格式：{filename}（支持 .txt / .jsonl / .csv）")
+    return fmt
+
+
+def parse_text(lines: Iterable[str], law_name: str | None = None) -> Iterator[dict]:
+    """
+    解析法律全文
+
+    【状态机】
+    - 条文前（HEAD）：跳过标题、编章节与目录；未指定 law_name 时第一行非空文字作为法律名称
+    - 条文中（BODY）：后续各行（段落）追加到当前条文，直到下一个 "第X条" 或编章节标题
+
+    【参数说明】
+    - lines: 可逐行迭代的文本（如打开的文件对象）
+    - law_name: 法律名称；为空时取全文第一行
+    """
+    article_no: str | None = None
+    paragraphs: list[str] = []
+    for lineno, raw in enumerate(lines, start=1):
+        line = raw.strip().replace("　", " ").strip()
+        if not line:
+            continue
+        m = _ARTICLE_RE.match(line)
+        if m is not None:
+            if article_no is not None:
+                yield _article(law_name, article_no, paragraphs)
+            if law_name is None:
+                raise LawImportError(f"第 {lineno} 行：未指定法律名称，且全文第一行不是标题")
+            article_no, paragraphs = m.group(1), [m.group(2).strip()] if m.group(2).strip() else []
+        elif _HEADING_RE.match(line):
+            if article_no is not None:
+                yield _article(law_name, article_no, paragraphs)
+            article_no, paragraphs = None, []
+        elif article_no is not None:
+            paragraphs.append(line)
+        elif law_name is None:
+            law_name = line
+    if article_no is not None:
+        yield _article(law_name, article_no, paragraphs)
+
+
+def _article(law_name: str, article_no: str, paragraphs: list[str]) -> dict:
+    return {"law_name": law_name, "article_no": article_no, "content": "\n".join(paragraphs)}
+
+
+def parse_jsonl(lines: Iterable[str], law_name: str | None = None) -> Iterator[dict]:
+    """解析 JSONL：每行一个对象；对象中没有 law_name 时使用参数 law_name。"""
+    for lineno, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise LawImportError(f"第 {lineno} 行：JSON 格式错误（{e.msg}）") from None
+        if not isinstance(obj, dict):
+            raise LawImportError(f"第 {lineno} 行：应为 JSON 对象")
+        yield _row(obj, law_name, lineno)
+
+
+def parse_csv(lines: Iterable[str], law_name: str | None = None) -> Iterator[dict]:
+    """解析 CSV：第一行为表头，必须包含 content 列。"""
+    reader = csv.DictReader(lines)
+    if reader.fieldnames is None or "content" not in reader.fieldnames:
+        raise LawImportError("CSV 表头必须包含 content 列")
+    for obj in reader:
+        yield _row(obj, law_name, reader.line_num)
+
+
+def _row(obj: dict, law_name: str | None, lineno: int) -> dict:
+    name = (obj.get("law_name") or law_name or "").strip()
+    if not name:
+        raise LawImportError(f"第 {lineno} 行：缺少 law_name")
+    article_no = (obj.get("article_no") or "").strip() or None
+    content = obj.get("content")
+    return {
+        "law_name": name,
+        "article_no": article_no,
+        "content": content.strip() if isinstance(content, str) else "",
+    }
+
+
+_PARSERS = {"text": parse_text, "jsonl": parse_jsonl, "csv": parse_csv}
+
+
+def parse(lines: Iterable[str], fmt: str, law_name: str | None = None) -> Iterator[dict]:
+    """按格式选择解析器。"""
+    if fmt not in _PARSERS:
+        raise LawImportError(f"不支持的格式：{fmt}（可选 {', '.join(FORMATS)}）")
+    return _PARSERS[fmt](lines, law_name)
+
+
+# ======================== 写入 ========================
+
+
+def import_rows(conn: Connection, rows: list[dict], result: ImportResult) -> None:
+    """
+    在 conn 的当前事务中写入一批法条，并更新全文索引
+
+    同一法律的同一条款已存在时更新内容；同一批中重复出现的条款以最后一次为准。
+    内容为空、与已有内容相同或在同一批中被覆盖的条文计入 skipped。
+    """
+    batch: dict[tuple, dict] = {}
+    for i, row in enumerate(rows):
+        if not row["content"]:
+            result.skipped += 1
+            continue
+        # 没有条款编号的法条无法判断是否重复，总是插入
+        key = (row["law_name"], row["article_no"]) if row["article_no"] else i
+        if key in batch:
+            result.skipped += 1
+        batch[key] = row
+    if not batch:
+        return
+
+    keyed = [k for k in batch if isinstance(k, tuple)]
+    existing: dict[tuple, tuple[int, str]] = {}  # (法律名称, 条款) -> (id, 已有内容)
+    if keyed:
+        found = conn.execute(
+            # 只按 article_no 过滤：law_name 的选择性很低（一部法律上千条），
+            # 同时带上 law_name 条件时 SQLite 可能选错索引、每批都扫描整部法律
+            select(_table.c.id, _table.c.law_name, _table.c.article_no, _table.c.content).where(
+                _table.c.article_no.in_({k[1] for k in keyed})
+            )
+        )
+        for r in found:
+            key = (r.law_name, r.article_no)
+            if key in batch and r.id > existing.get(key, (0, None))[0]:
+                existing[key] = (r.id, r.content)
+
+    to_insert = [row for k, row in batch.items() if k not in existing]
+    changed = {k: i for k, (i, content) in existing.items() if content != batch[k]["content"]}
+    result.skipped += len(existing) - len(changed)
+    to_update = [{"b_id": i, "b_content": batch[k]["content"]} for k, i in changed.items()]
+    indexed: list[tuple[int, str, str]] = []
+
+    if to_update:
+        conn.execute(
+            update(_table)
+            .where(_table.c.id == bindparam("b_id"))
+            .values(content=bindparam("b_content")),
+            to_update,
+        )
+        indexed += [(i, batch[k]["law_name"], batch[k]["content"]) for k, i in changed.items()]
+        result.updated += len(to_update)
+
+    if to_insert:
+        if conn.dialect.insert_executemany_returning_sort_by_parameter_order:
+            ids = conn.execute(
+                insert(_table).returning(_table.c.id, sort_by_parameter_order=True), to_insert
+            ).scalars().all()
+        else:
+            ids = [conn.execute(insert(_table), row).inserted_primary_key[0] for row in to_insert]
+        indexed += [(i, row["law_name"], row["content"]) for i, row in zip(ids, to_insert)]
+        result.inserted += len(to_insert)
+
+    law_search.index_many(conn, indexed)
+
+
+def import_articles(
+    engine: Engine, articles: Iterable[dict], batch_size: int | None = None
+) -> ImportResult:
+    """
+    分批导入法条：每 batch_size 条一个事务
+
+    某一批失败时只回滚该批，之前已提交的批次保留（重新导入同一文件会按条款更新，不会重复）。
+    """
+    batch_size = batch_size or settings.LAW_IMPORT_BATCH_SIZE
+    result = ImportResult()
+    started = time.perf_counter()
+    it = iter(articles)
+    while batch := list(islice(it, batch_size)):
+        with engine.begin() as conn:
+            import_rows(conn, batch, result)
+    result.seconds = round(time.perf_counter() - started, 3)
+    return result
+
+
+def import_file(
+    engine: Engine,
+    path: str | Path,
+    fmt: str | None = None,
+    law_name: str | None = None,
+    batch_size: int | None = None,
+) -> ImportResult:
+    """
+    流式导入一个文件
+
+    【参数说明】
+    - path: 文件路径（UTF-8，可带 BOM）
+    - fmt: text / jsonl / csv；为空时按扩展名判断
+    - law_name: 法律名称；纯文本为空时取第一行，JSONL / CSV 中行内 law_name 优先
+    - batch_size: 每个事务写入的条数，默认 LAW_IMPORT_BATCH_SIZE
+
+    【异常情况】
+    - LawImportError: 格式无法识别或某一行无法解析
+    """
+    fmt = fmt or detect_format(str(path))
+    # newline="" 使 csv 模块能正确处理引号内的换行
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return import_articles(engine, parse(f, fmt, law_name), batch_size)
@@ -0,0 +1,374 @@
+"""
+=============================================================================
+文件: app/services/law_search.py
+模块: 法条全文检索服务
+描述: 为 law_articles 表提供中文全文检索能力
+      字符 n-gram 分词 + 倒排索引 + BM25 相关度排序
+=============================================================================
+
+【为什么不用 LIKE】
+LIKE '%关键字%' 无法使用索引，每次查询都要扫描整张 law_articles 表。
+导入完整民法典和诉讼法后，法条搜索的耗时随数据量线性增长。
+
+【实现方案】
+1. 分词：连续汉字切分为单字 + 二元组（bigram），英文/数字按整词小写
+   例如 "租赁合同" -> 租 赁 合 同 租赁 赁合 合同
+2. 索引：
+   - SQLite 且支持 FTS5：使用 FTS5 虚拟表 law_articles_fts（rowid = 法条 id）
+   - 其他数据库或 FTS5 不可用：退化为进程内纯 Python 倒排索引
+3. 同步：监听 LawArticle 的 after_insert / after_update / after_delete 事件
+   - FTS5：在同一个数据库连接（同一事务）中更新索引，随事务提交或回滚
+   - 纯 Python：进程内的索引无法回滚，变更先记在会话上（session.info），
+     事务提交后（after_commit）再应用，回滚时（after_rollback）丢弃
+   批量导入（law_import.py）绕过 ORM 写入，在同一连接上调用 index_many 批量更新
+   （纯 Python 索引同样在该连接的事务提交时才应用）
+4. 排序：BM25（FTS5 内置 bm25() 函数；纯 Python 版本按相同公式计算）
+
+【使用方法】
+from app.services import law_search
+hits = law_search.search(db, "租赁合同", law_name="民法典", limit=50)
+# hits: [(法条id, 相关度得分), ...]，得分越高越相关
+"""
+
+import math
+import re
+import threading
+
+from sqlalchemy import event, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, object_session
+
+from app.models.law_article import LawArticle
+
+# FTS5 虚拟表名
+FTS_TABLE = "law_articles_fts"
+
+# session.info 中待应用到纯 Python 索引的变更：[(法条id, 法律名称, 内容 | None), ...]，内容为 None 表示删除
+_PENDING_KEY = "law_search_pending"
+
+# 连续汉字（含扩展 A 区）或连续英文/数字
+_TOKEN_RE = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff]+|[a-z0-9]+")
+
+# BM25 参数，与 FTS5 bm25() 的默认值一致
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+
+def tokenize(content: str) -> list[str]:
+    """
+    文档分词：汉字输出单字 + 二元组，英文/数字输出整词。
+
+    同时保留单字是为了支持单字查询（如搜索 "租"）。
+    """
+    tokens: list[str] = []
+    for m in _TOKEN_RE.finditer(content.lower()):
+        run = m.group()
+        if run.isascii():
+            tokens.append(run)
+            continue
+        tokens.extend(run)
+        tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def query_terms(keyword: str) -> list[str]:
+    """
+    查询分词：汉字串长度 >= 2 时只取二元组，长度为 1 时取单字。
+
+    【返回值】
+    list[str]: 去重后的查询词，所有词都命中的法条才算匹配（AND 语义）
+    """
+    terms: list[str] = []
+    for m in _TOKEN_RE.finditer(keyword.lower()):
+        run = m.group()
+        if run.isascii() or len(run) == 1:
+            terms.append(run)
+        else:
+            terms.extend(run[i : i + 2] for i in range(len(run) - 1))
+    return list(dict.fromkeys(terms))
+
+
+class _Fts5Backend:
+    """SQLite FTS5 索引：索引列存放空格分隔的预分词结果，由 unicode61 按空格切词。"""
+
+    name = "fts5"
+
+    def ensure(self, engine: Engine) -> None:
+        """建表；若索引行数与 law_articles 不一致（如手工导入过数据）则全量重建。"""
+        with engine.begin() as conn:
+            conn.execute(
+                text(f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(tokens)")
+            )
+            n_fts = conn.execute(text(f"SELECT count(*) FROM {FTS_TABLE}")).scalar()
+            n_src = conn.execute(text("SELECT count(*) FROM law_articles")).scalar()
+            if n_fts != n_src:
+                self.rebuild(conn)
+
+    def rebuild(self, conn: Connection) -> None:
+        conn.execute(text(f"DELETE FROM {FTS_TABLE}"))
+        rows = conn.execute(select(LawArticle.id, LawArticle.content))
+        while batch := rows.fetchmany(1000):
+            conn.execute(
+                text(f"INSERT INTO {FTS_TABLE}(rowid, tokens) VALUES (:id, :tokens)"),
+                [{"id": r.id, "tokens": " ".join(tokenize(r.content or ""))} for r in batch],
+            )
+
+    def upsert(self, conn: Connection, article_id: int, law_name: str, content: str) -> None:
+        self.delete(conn, article_id)
+        conn.execute(
+            text(f"INSERT INTO {FTS_TABLE}(rowid, tokens) VALUES (:id, :tokens)"),
+            {"id": article_id, "tokens": " ".join(tokenize(content or ""))},
+        )
+
+    def delete(self, conn: Connection, article_id: int) -> None:
+        conn.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": article_id})
+
+    def upsert_many(self, conn: Connection, rows: list[tuple[int, str, str]]) -> None:
+        ids = [{"id": article_id} for article_id, _, _ in rows]
+        conn.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), ids)
+        conn.execute(
+            text(f"INSERT INTO {FTS_TABLE}(rowid, tokens) VALUES (:id, :tokens)"),
+            [{"id": i, "tokens": " ".join(tokenize(content or ""))} for i, _, content in rows],
+        )
+
+    def search(
+        self,
+        db: Session,
+        terms: list[str],
+        law_name: str | None,
+        limit: int,
+        after: tuple[float, int] | None,
+    ) -> list[tuple[int, float]]:
+        # 每个词加双引号，避免被 FTS5 解析为运算符；多个词之间 AND
+        match = " AND ".join(f'"{t}"' for t in terms)
+        sql = (
+            f"SELECT {FTS_TABLE}.rowid AS id, -bm25({FTS_TABLE}) AS score FROM {FTS_TABLE} "
+            f"JOIN law_articles ON law_articles.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH :match"
+        )
+        params: dict = {"match": match, "limit": limit}
+        if law_name:
+            sql += " AND law_articles.law_name = :law_name"
+            params["law_name"] = law_name
+        # bm25() 越小越相关，取反后统一为"越大越相关"
+        sql = f"SELECT id, score FROM ({sql})"
+        if after:
+            sql += " WHERE score < :score OR (score = :score AND id < :id)"
+            params["score"], params["id"] = after
+        sql += " ORDER BY score DESC, id DESC LIMIT :limit"
+        return [(r.id, r.score) for r in db.execute(text(sql), params)]
+
+
+class _MemoryBackend:
+    """纯 Python 倒排索引：首次查询时从数据库全量构建（避免拖慢启动），之后在事务提交后增量维护。"""
+
+    name = "memory"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._built = False
+        self._postings: dict[str, dict[int, int]] = {}  # 词 -> {法条id: 词频}
+        self._doc_terms: dict[int, set[str]] = {}
+        self._doc_len: dict[int, int] = {}
+        self._law_name: dict[int, str] = {}
+        self._total_len = 0
+
+    def _add(self, article_id: int, law_name: str, content: str) -> None:
+        tokens = tokenize(content or "")
+        for t in tokens:
+            docs = self._postings.setdefault(t, {})
+            docs[article_id] = docs.get(article_id, 0) + 1
+        self._doc_terms[article_id] = set(tokens)
+        self._doc_len[article_id] = len(tokens)
+        self._law_name[article_id] = law_name
+        self._total_len += len(tokens)
+
+    def _remove(self, article_id: int) -> None:
+        if article_id not in self._doc_len:
+            return
+        self._total_len -= self._doc_len.pop(article_id)
+        self._law_name.pop(article_id, None)
+        for t in self._doc_terms.pop(article_id, ()):
+            docs = self._postings[t]
+            docs.pop(article_id, None)
+            if not docs:
+                del self._postings[t]
+
+    def _build(self, db: Session) -> None:
+        rows = db.execute(select(LawArticle.id, LawArticle.law_name, LawArticle.content))
+        for r in rows:
+            self._add(r.id, r.law_name, r.content)
+        self._built = True
+
+    def apply(self, changes: list[tuple[int, str, str | None]]) -> None:
+        """应用已提交的变更：[(法条id, 法律名称, 内容)]，内容为 None 表示删除。"""
+        with self._lock:
+            if self._built:
+                for article_id, law_name, content in changes:
+                    self._remove(article_id)
+                    if content is not None:
+                        self._add(article_id, law_name, content)
+
+    def upsert_many(self, conn: Connection, rows: list[tuple[int, str, str]]) -> None:
+        """批量导入：在 conn 的事务提交时应用，回滚时丢弃。"""
+        if not conn.in_transaction():
+            self.apply(rows)
+            return
+        pending = list(rows)
+
+        def _commit(_conn: Connection) -> None:
+            self.apply(pending)
+            pending.clear()
+
+        event.listen(conn, "commit", _commit, once=True)
+        event.listen(conn, "rollback", lambda _conn: pending.clear(), once=True)
+
+    def search(
+        self,
+        db: Session,
+        terms: list[str],
+        law_name: str | None,
+        limit: int,
+        after: tuple[float, int] | None,
+    ) -> list[tuple[int, float]]:
+        with self._lock:
+            if not self._built:
+                self._build(db)
+            postings = [self._postings.get(t, {}) for t in terms]
+            if not all(postings):
+                return []
+            n_docs = len(self._doc_len)
+            avg_len = self._total_len / n_docs if n_docs else 0.0
+            # 从最短的倒排链开始求交集
+            candidates = set(min(postings, key=len))
+            for docs in postings:
+                candidates &= docs.keys()
+            if law_name:
+                candidates = {i for i in candidates if self._law_name.get(i) == law_name}
+            scored = []
+            for doc_id in candidates:
+                dl = self._doc_len[doc_id]
+                score = 0.0
+                for docs in postings:
+                    tf = docs[doc_id]
+                    idf = math.log((n_docs - len(docs) + 0.5) / (len(docs) + 0.5) + 1)
+                    norm = tf + _BM25_K1 * (1 - _BM25_B + _BM25_B * dl / (avg_len or 1))
+                    score += idf * tf * (_BM25_K1 + 1) / norm
+                scored.append((doc_id, score))
+        if after:
+            scored = [(i, sc) for i, sc in scored if (sc, i) < after]
+        scored.sort(key=lambda x: (-x[1], -x[0]))
+        return scored[:limit]
+
+
+_backend: _Fts5Backend | _MemoryBackend | None = None
+
+
+def init_index(engine: Engine, ensure: bool = True) -> None:
+    """
+    选择索引后端并确保索引就绪（在 migrations.migrate / init_db 中调用）。
+
+    SQLite 下尝试创建 FTS5 虚拟表，失败（编译时未启用 FTS5）则退化为纯 Python 索引。
+    ensure=False 时（数据库结构版本已是最新）不建表也不核对行数，只按 FTS5 表是否存在选择后端。
+    """
+    global _backend
+    if engine.dialect.name == "sqlite" and not ensure:
+        with engine.connect() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": FTS_TABLE}
+            ).first()
+        _backend = _Fts5Backend() if exists else _MemoryBackend()
+        return
+    if engine.dialect.name == "sqlite":
+        try:
+            backend = _Fts5Backend()
+            backend.ensure(engine)
+            _backend = backend
+            return
+        except OperationalError:
+            pass
+    _backend = _MemoryBackend()
+
+
+def search(
+    db: Session,
+    keyword: str,
+    law_name: str | None = None,
+    limit: int = 50,
+    after: tuple[float, int] | None = None,
+) -> list[tuple[int, float]]:
+    """
+    全文检索法条
+
+    【参数说明】
+    - db: Session - 数据库会话
+    - keyword: str - 搜索关键字
+    - law_name: str | None - 法律名称过滤（精确匹配）
+    - limit: int - 最多返回条数
+    - after: tuple[float, int] | None - 上一页最后一条的 (得分, 法条id)，用于游标翻页
+
+    【返回值】
+    list[tuple[int, float]]: (法条id, 相关度得分) 列表，按得分从高到低排序
+    """
+    terms = query_terms(keyword)
+    if not terms:
+        return []
+    if _backend is None:
+        init_index(db.get_bind())
+    return _backend.search(db, terms, law_name, limit, after)
+
+
+def index_many(conn: Connection, rows: list[tuple[int, str, str]]) -> None:
+    """
+    批量写入/更新索引（批量导入时调用）
+
+    绕过 ORM 直接 INSERT / UPDATE law_articles 时不会触发下面的事件，
+    由调用方在同一连接（同一事务）中调用本函数。
+
+    【参数说明】
+    - rows: [(法条id, 法律名称, 内容), ...]
+    """
+    if _backend is not None and rows:
+        _backend.upsert_many(conn, rows)
+
+
+# ======================== 索引同步（ORM 事件） ========================
+# 事件在 flush 时触发，使用的是当前事务的连接：
+# FTS5 索引直接在该连接上更新，与 law_articles 同一事务提交或回滚；
+# 纯 Python 索引不在事务中，变更记在会话上，提交后再应用（同 response_cache.py）。
+
+
+def _defer(target: LawArticle, content: str | None) -> None:
+    """纯 Python 索引：把变更记在 target 所在的会话上，事务提交后再应用。"""
+    session = object_session(target)
+    session.info.setdefault(_PENDING_KEY, []).append((target.id, target.law_name, content))
+
+
+@event.listens_for(LawArticle, "after_insert")
+@event.listens_for(LawArticle, "after_update")
+def _sync_index(mapper, connection: Connection, target: LawArticle) -> None:
+    if isinstance(_backend, _MemoryBackend):
+        _defer(target, target.content)
+    elif _backend is not None:
+        _backend.upsert(connection, target.id, target.law_name, target.content)
+
+
+@event.listens_for(LawArticle, "after_delete")
+def _drop_from_index(mapper, connection: Connection, target: LawArticle) -> None:
+    if isinstance(_backend, _MemoryBackend):
+        _defer(target, None)
+    elif _backend is not None:
+        _backend.delete(connection, target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_after_commit(session: Session) -> None:
+    changes = session.info.pop(_PENDING_KEY, None)
+    if changes and isinstance(_backend, _MemoryBackend):
+        _backend.apply(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
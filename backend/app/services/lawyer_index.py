@@ -0,0 +1,97 @@
+"""
+=============================================================================
+文件: app/services/lawyer_index.py
+模块: 律师分类/标签索引服务
+描述: 维护 lawyer_facets 表，并提供律师列表按分类/标签过滤的查询条件
+=============================================================================
+
+【为什么需要】
+LawyerProfile.categories / tags 是 JSON 列，数据库无法按元素建索引。
+原先律师列表把整页律师查出来后在 Python 中判断 category in p.categories，
+既要解析每一行的 JSON，过滤又发生在分页之后（一页可能被过滤得只剩几条）。
+
+【实现方案】
+1. 展开：每个 (分类或标签, 律师) 一行，存入 lawyer_facets，主键 (kind, value, user_id)
+2. 同步：监听 LawyerProfile 的 after_insert / after_update / after_delete 事件，
+   在同一个连接（同一事务）中重写该律师的索引行；更新时只有 categories / tags / user_id 变化才重写
+3. 查询：facet_filter 生成 user_id IN (SELECT ...) 条件，与关键字过滤、游标分页一起在 SQL 中完成
+4. 初始化：启动时若索引为空而已有律师数据（如升级前的数据库），全量重建一次
+
+【使用方法】
+from app.services import lawyer_index
+stmt = stmt.where(lawyer_index.facet_filter(FACET_CATEGORY, "婚姻家事"))
+"""
+
+from sqlalchemy import delete, event, insert, inspect, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.models.lawyer_facet import FACET_CATEGORY, FACET_TAG, LawyerFacet
+from app.models.lawyer_profile import LawyerProfile
+
+
+def facet_rows(user_id: int, categories: list | None, tags: list | None) -> list[dict]:
+    """把一位律师的分类、标签展开为 lawyer_facets 行（去空白、去重，忽略非字符串值）。"""
+    rows: dict[tuple[str, str], dict] = {}
+    for kind, values in ((FACET_CATEGORY, categories), (FACET_TAG, tags)):
+        for value in values or ():
+            if isinstance(value, str) and value.strip():
+                key = (kind, value.strip())
+                rows[key] = {"kind": kind, "value": key[1], "user_id": user_id}
+    return list(rows.values())
+
+
+def facet_filter(kind: str, value: str):
+    """律师列表的过滤条件：LawyerProfile.user_id 属于该分类/标签。"""
+    return LawyerProfile.user_id.in_(
+        select(LawyerFacet.user_id).where(LawyerFacet.kind == kind, LawyerFacet.value == value)
+    )
+
+
+def rebuild(conn: Connection) -> None:
+    """按 lawyer_profiles 全量重建索引。"""
+    conn.execute(delete(LawyerFacet))
+    profiles = conn.execute(
+        select(LawyerProfile.user_id, LawyerProfile.categories, LawyerProfile.tags)
+    )
+    rows = [r for p in profiles for r in facet_rows(p.user_id, p.categories, p.tags)]
+    if rows:
+        conn.execute(insert(LawyerFacet), rows)
+
+
+def ensure(engine: Engine) -> None:
+    """启动时调用：索引为空但已有律师数据时全量重建（在 init_db 中调用）。"""
+    with engine.begin() as conn:
+        has_facets = conn.execute(select(LawyerFacet.user_id).limit(1)).first()
+        has_profiles = conn.execute(select(LawyerProfile.id).limit(1)).first()
+        if has_profiles and not has_facets:
+            rebuild(conn)
+
+
+# ======================== 索引同步（ORM 事件） ========================
+# 事件在 flush 时触发，使用当前事务的连接，索引与 lawyer_profiles 同一事务提交或回滚。
+
+
+def _replace(connection: Connection, target: LawyerProfile, old_user_id: int) -> None:
+    connection.execute(delete(LawyerFacet).where(LawyerFacet.user_id == old_user_id))
+    rows = facet_rows(target.user_id, target.categories, target.tags)
+    if rows:
+        connection.execute(insert(LawyerFacet), rows)
+
+
+@event.listens_for(LawyerProfile, "after_insert")
+def _index_profile(mapper, connection: Connection, target: LawyerProfile) -> None:
+    _replace(connection, target, target.user_id)
+
+
+@event.listens_for(LawyerProfile, "after_update")
+def _reindex_profile(mapper, connection: Connection, target: LawyerProfile) -> None:
+    attrs = inspect(target).attrs
+    if not any(attrs[key].history.has_changes() for key in ("categories", "tags", "user_id")):
+        return
+    old_user_ids = attrs.user_id.history.deleted
+    _replace(connection, target, old_user_ids[0] if old_user_ids else target.user_id)
+
+
+@event.listens_for(LawyerProfile, "after_delete")
+def _unindex_profile(mapper, connection: Connection, target: LawyerProfile) -> None:
+    connection.execute(delete(LawyerFacet).where(LawyerFacet.user_id == target.user_id))
@@ -0,0 +1,203 @@
+"""
+=============================================================================
+文件: app/services/lawyer_stats.py
+模块: 律师统计维护
+描述: 维护 lawyer_stats 表（案件数、胜诉、评分计数），并提供全量重建与展示格式
+=============================================================================
+
+【为什么需要】
+律师详情的 stats 原先全部为空：实时计算要在每次公开访问时聚合该律师的全部案件与评价。
+改为随写入增量维护计数，列表与详情按主键 JOIN 一行即可。
+
+【增量维护】
+监听 Case 与 Feedback 的 after_insert / after_update / after_delete 事件，在同一个连接（同一事务）中
+把写入前后各自的 "贡献" 相减，累加到对应律师的行：
+- 案件：承办律师 case_count + 1；已结案（completed）且 outcome 为 won/lost/settled 时 decided_count + 1，
+  won 时 won_count + 1 —— 新建、转为结案、修改结果、更换律师、删除都按同一规则处理
+- 反馈：带 lawyer_id、case_id 与 rating 时 rating_count + 1，rating ≥ 4 时 satisfied_count + 1
+  （评价接口校验案件属于评价人与该律师；没有 case_id 的旧评分无从核实，不计入）
+
+【注意事项】
+- 绕过 ORM 的批量写入不会触发事件，之后执行 scripts/rebuild_lawyer_stats.py 全量重建
+- 统计变化时清空律师接口的响应缓存（response_cache.invalidate_lawyers），列表与详情立即可见
+- 全量重建不经过事件，不清空其他进程的缓存，stats 最多滞后 LAWYER_CACHE_TTL_SECONDS
+
+【使用方法】
+from app.services import lawyer_stats
+lawyer_stats.format_stats(row, years)   # 计数 -> LawyerStats 的字段（字符串百分比）
+lawyer_stats.rebuild(conn)              # 按 cases 与 feedbacks 全量重建
+"""
+
+from collections import defaultdict
+
+from sqlalchemy import case, delete, event, func, insert, inspect, select, update
+from sqlalchemy.engine import Connection
+
+from app.models.case import Case
+from app.models.feedback import Feedback
+from app.models.lawyer_stat import CASE_OUTCOMES, OUTCOME_WON, SATISFIED_RATING, LawyerStat
+from app.services.response_cache import invalidate_lawyers
+
+COUNT_COLUMNS = ("case_count", "decided_count", "won_count", "rating_count", "satisfied_count")
+
+
+def _percent(part: int, whole: int) -> str | None:
+    return str(round(part * 100 / whole)) if whole else None
+
+
+def format_stats(row, years: str | None = None) -> dict:
+    """
+    计数行转换为前端 stats 的字段（与 LawyerStats 对应）
+
+    【参数说明】
+    - row: 带 case_count 等计数属性的对象（LawyerStat 或查询结果行）；律师还没有统计行时为 None
+    - years: 执业年限（来自律师资料）
+    """
+    if row is None or row.case_count is None:
+        return {"caseCount": "0", "winRate": None, "clientSatisfaction": None, "years": years}
+    return {
+        "caseCount": str(row.case_count),
+        "winRate": _percent(row.won_count, row.decided_count),
+        "clientSatisfaction": _percent(row.satisfied_count, row.rating_count),
+        "years": years,
+    }
+
+
+# ======================== 增量维护（ORM 事件） ========================
+
+
+def _apply(connection: Connection, deltas: dict[int, dict[str, int]]) -> bool:
+    """把 {律师 user_id: {列: 增量}} 累加到 lawyer_stats；律师还没有统计行时插入一行。返回是否有变化。"""
+    t = LawyerStat.__table__
+    changed = False
+    for user_id, changes in deltas.items():
+        changes = {c: d for c, d in changes.items() if d}
+        if not changes:
+            continue
+        changed = True
+        updated = connection.execute(
+            update(t).where(t.c.user_id == user_id).values({c: t.c[c] + d for c, d in changes.items()})
+        ).rowcount
+        if not updated:
+            connection.execute(
+                insert(t).values(
+                    {
+                        "user_id": user_id,
+                        **dict.fromkeys(COUNT_COLUMNS, 0),
+                        **{c: max(d, 0) for c, d in changes.items()},
+                    }
+                )
+            )
+    return changed
+
+
+def _value(target, name: str, old: bool):
+    """属性的当前值，或修改前的值（old=True，未修改时同当前值）。"""
+    if old:
+        history = inspect(target).attrs[name].history
+        if history.deleted:
+            return history.deleted[0]
+    return getattr(target, name)
+
+
+def _case_contribution(target: Case, old: bool) -> tuple[int | None, dict[str, int]]:
+    lawyer_id = _value(target, "lawyer_id", old)
+    outcome = _value(target, "outcome", old)
+    decided = _value(target, "status", old) == "completed" and outcome in CASE_OUTCOMES
+    return lawyer_id, {
+        "case_count": 1,
+        "decided_count": int(decided),
+        "won_count": int(decided and outcome == OUTCOME_WON),
+    }
+
+
+def _feedback_contribution(target: Feedback, old: bool) -> tuple[int | None, dict[str, int]]:
+    lawyer_id = _value(target, "lawyer_id", old)
+    rating = _value(target, "rating", old)
+    if lawyer_id is None or rating is None or _value(target, "case_id", old) is None:
+        return None, {}
+    return lawyer_id, {"rating_count": 1, "satisfied_count": int(rating >= SATISFIED_RATING)}
+
+
+def _sync(connection: Connection, contribution, target, *, before: bool, after: bool) -> None:
+    """按写入前（before）减去、写入后（after）加上该行的贡献。"""
+    phases = ([(True, -1)] if before else []) + ([(False, 1)] if after else [])
+    deltas = defaultdict(lambda: defaultdict(int))
+    for old, sign in phases:
+        lawyer_id, values = contribution(target, old)
+        if lawyer_id is not None:
+            for column, v in values.items():
+                deltas[lawyer_id][column] += sign * v
+    if _apply(connection, deltas):
+        # 律师列表 / 详情的响应缓存含 stats
+        invalidate_lawyers(target)
+
+
+def _changed(target, names: tuple[str, ...]) -> bool:
+    attrs = inspect(target).attrs
+    return any(attrs[n].history.has_changes() for n in names)
+
+
+@event.listens_for(Case, "after_insert")
+def _case_inserted(mapper, connection: Connection, target: Case) -> None:
+    _sync(connection, _case_contribution, target, before=False, after=True)
+
+
+@event.listens_for(Case, "after_update")
+def _case_updated(mapper, connection: Connection, target: Case) -> None:
+    if _changed(target, ("lawyer_id", "status", "outcome")):
+        _sync(connection, _case_contribution, target, before=True, after=True)
+
+
+@event.listens_for(Case, "after_delete")
+def _case_deleted(mapper, connection: Connection, target: Case) -> None:
+    _sync(connection, _case_contribution, target, before=True, after=False)
+
+
+@event.listens_for(Feedback, "after_insert")
+def _feedback_inserted(mapper, connection: Connection, target: Feedback) -> None:
+    _sync(connection, _feedback_contribution, target, before=False, after=True)
+
+
+@event.listens_for(Feedback, "after_update")
+def _feedback_updated(mapper, connection: Connection, target: Feedback) -> None:
+    if _changed(target, ("lawyer_id", "case_id", "rating")):
+        _sync(connection, _feedback_contribution, target, before=True, after=True)
+
+
+@event.listens_for(Feedback, "after_delete")
+def _feedback_deleted(mapper, connection: Connection, target: Feedback) -> None:
+    _sync(connection, _feedback_contribution, target, before=True, after=False)
+
+
+# ======================== 全量重建 ========================
+
+
+def rebuild(conn: Connection) -> int:
+    """按 cases 与 feedbacks 分组计数，重写 lawyer_stats，返回有统计的律师数。"""
+    decided = (Case.status == "completed") & Case.outcome.in_(CASE_OUTCOMES)
+    rows: dict[int, dict[str, int]] = defaultdict(lambda: dict.fromkeys(COUNT_COLUMNS, 0))
+    for lawyer_id, total, n_decided, n_won in conn.execute(
+        select(
+            Case.lawyer_id,
+            func.count(),
+            func.sum(case((decided, 1), else_=0)),
+            func.sum(case((decided & (Case.outcome == OUTCOME_WON), 1), else_=0)),
+        ).group_by(Case.lawyer_id)
+    ):
+        rows[lawyer_id].update(case_count=total, decided_count=n_decided or 0, won_count=n_won or 0)
+    for lawyer_id, n_rated, n_satisfied in conn.execute(
+        select(
+            Feedback.lawyer_id,
+            func.count(),
+            func.sum(case((Feedback.rating >= SATISFIED_RATING, 1), else_=0)),
+        )
+        .where(Feedback.lawyer_id.is_not(None), Feedback.case_id.is_not(None), Feedback.rating.is_not(None))
+        .group_by(Feedback.lawyer_id)
+    ):
+        rows[lawyer_id].update(rating_count=n_rated, satisfied_count=n_satisfied or 0)
+
+    conn.execute(delete(LawyerStat))
+    if rows:
+        conn.execute(insert(LawyerStat), [{"user_id": uid, **counts} for uid, counts in rows.items()])
+    return len(rows)
@@ -0,0 +1,215 @@
+"""
+=============================================================================
+文件: app/services/model_call_logger.py
+模块: 模型调用日志写入
+描述: 把 AI 模型调用记录（model_call_logs 表）先放入内存队列，
+      由后台任务攒批后一次性 INSERT，请求路径上只有一次入队操作
+=============================================================================
+
+【为什么需要】
+每次模型调用都同步插入一行日志，会给每个 AI 请求增加一次数据库写入与提交；
+SQLite 上写事务还要排队拿写锁。审计日志允许秒级延迟落库，适合攒批写入。
+
+【工作方式】
+1. log_call() 只把一条记录（dict）追加到内存队列，不做任何 I/O，可在事件循环或任意线程中调用
+2. 后台任务（start() 创建）满足任一条件即写库：
+   - 队列达到 MODEL_LOG_BATCH_SIZE 条（立即唤醒）
+   - 距上次写入已过 MODEL_LOG_FLUSH_INTERVAL_MS 毫秒
+3. 每批在线程池中用一条 executemany INSERT、一个事务写入，不占用事件循环
+4. stop()（应用关闭时）写完队列中剩余的记录后退出
+
+【背压】
+队列上限 MODEL_LOG_MAX_QUEUE 条。数据库变慢导致积压时，新记录直接丢弃并计数（dropped），
+而不是让调用方等待或无限占用内存；写库失败的整批记录计入 failed。
+两者都通过 /metrics 输出（model_call_log_dropped_total / model_call_log_failed_total），应配置告警。
+
+【使用方法】
+from app.services.model_call_logger import model_call_logger, hash_prompt
+model_call_logger.log_call("contract_review", model_name="gpt-4", user_id=user.id,
+                           prompt_hash=hash_prompt(prompt), input_tokens=812, output_tokens=120,
+                           duration_ms=2300)
+model_call_logger.stats()  # {"queued": ..., "written": ..., "dropped": ..., "failed": ...}
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.session import engine
+from app.models.model_call_log import ModelCallLog
+
+logger = logging.getLogger(__name__)
+
+
+def hash_prompt(prompt: str) -> str:
+    """prompt 的 SHA-256 十六进制摘要（写入 prompt_hash 列）。"""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class ModelCallLogWriter:
+    """
+    攒批写入的模型调用日志
+
+    【属性说明】
+    - written: 已写入数据库的记录数
+    - batches: 已执行的批量 INSERT 次数
+    - dropped: 队列已满被丢弃的记录数
+    - failed: 写库失败丢失的记录数
+    """
+
+    def __init__(
+        self, engine: Engine, batch_size: int, flush_interval_ms: int, max_queue: int
+    ) -> None:
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._queue: list[dict] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def log_call(
+        self,
+        endpoint: str,
+        *,
+        model_name: str | None = None,
+        user_id: int | None = None,
+        prompt_hash: str | None = None,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        status: str = "ok",
+        error_message: str | None = None,
+        duration_ms: int = 0,
+    ) -> bool:
+        """
+        记录一次模型调用（只入队，不写库）
+
+        【返回值】
+        bool: 是否入队；队列已满时返回 False，记录被丢弃
+        """
+        record = {
+            "user_id": user_id,
+            "endpoint": endpoint,
+            "model_name": model_name,
+            "prompt_hash": prompt_hash,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "status": status,
+            "error_message": error_message,
+            "duration_ms": duration_ms,
+            # 调用发生的时间，而不是写库的时间
+            "created_at": datetime.now(timezone.utc),
+        }
+        with self._lock:
+            if len(self._queue) >= self.max_queue:
+                self.dropped += 1
+                return False
+            self._queue.append(record)
+            full = len(self._queue) >= self.batch_size
+        if full:
+            self._wake()
+        return True
+
+    def _wake(self) -> None:
+        """唤醒后台任务（可在任意线程中调用）。"""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            wakeup.set()
+        else:
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def _take_batch(self) -> list[dict]:
+        with self._lock:
+            batch = self._queue[: self.batch_size]
+            del self._queue[: self.batch_size]
+        return batch
+
+    def _insert(self, batch: list[dict]) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(insert(ModelCallLog.__table__), batch)
+
+    async def flush(self) -> int:
+        """把队列中的记录全部写入数据库，返回写入条数。"""
+        total = 0
+        while batch := self._take_batch():
+            try:
+                await run_in_threadpool(self._insert, batch)
+            except Exception:
+                logger.exception("写入模型调用日志失败，丢弃 %d 条记录", len(batch))
+                with self._lock:
+                    self.failed += len(batch)
+                continue
+            with self._lock:
+                self.written += len(batch)
+                self.batches += 1
+            total += len(batch)
+        return total
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+        await self.flush()
+
+    def start(self) -> None:
+        """在当前事件循环中启动后台写入任务（应用启动时调用，重复调用无副作用）。"""
+        if self._task is not None and not self._task.done():
+            return
+        self._closing = False
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._run(), name="model-call-logger")
+
+    async def stop(self) -> None:
+        """停止后台任务，并写完队列中剩余的记录（应用关闭时调用）。"""
+        task, self._task = self._task, None
+        if task is None:
+            await self.flush()
+            return
+        self._closing = True
+        self._wakeup.set()
+        await task
+        self._loop = self._wakeup = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queued": len(self._queue),
+                "max_queue": self.max_queue,
+                "written": self.written,
+                "batches": self.batches,
+                "dropped": self.dropped,
+                "failed": self.failed,
+            }
+
+
+model_call_logger = ModelCallLogWriter(
+    engine=engine,
+    batch_size=settings.MODEL_LOG_BATCH_SIZE,
+    flush_interval_ms=settings.MODEL_LOG_FLUSH_INTERVAL_MS,
+    max_queue=settings.MODEL_LOG_MAX_QUEUE,
+)
@@ -0,0 +1,171 @@
+"""
+=============================================================================
+文件: app/services/response_cache.py
+模块: 公开接口响应缓存
+描述: 进程内 TTL + LRU 缓存，保存已序列化好的 JSON 响应体与 ETag
+      用于律师列表 / 律师详情这类公开、读多写少的接口
+=============================================================================
+
+【为什么需要】
+律师列表与详情是小程序访问最多的页面，数据却很少变化；
+每次请求都查询数据库、构造 Pydantic 对象并序列化，结果几乎总是相同。
+
+【缓存策略】
+1. 键：接口名 + 查询参数（由调用方构造的元组）
+2. 值：序列化后的 JSON 字节串 + 据此计算的 ETag
+3. 过期：写入后 ttl_seconds 秒；容量超过 maxsize 时淘汰最久未使用的条目（LRU）
+4. 失效：LawyerProfile 写入、User 更新/删除（角色变化会影响列表）、
+   律师统计变化（services/lawyer_stats.py 调用 invalidate_lawyers）时清空律师缓存
+   - flush 时立即清空一次，事务提交后再清空一次，避免提交前被并发请求以旧数据回填
+   - 多进程部署时其他进程依赖 TTL 兜底
+
+【使用方法】
+from app.services.response_cache import lawyer_cache
+entry = lawyer_cache.get(key)
+if entry is None:
+    entry = lawyer_cache.put(key, body_bytes)
+entry.body, entry.etag
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models.lawyer_profile import LawyerProfile
+from app.models.user import User
+
+# 记录在 Session.info 中、待事务提交后再次清空的缓存
+_PENDING_KEY = "response_cache_pending"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """已序列化的响应：body 为 JSON 字节串，etag 为带引号的强校验值。"""
+
+    body: bytes
+    etag: str
+
+
+class ResponseCache:
+    """
+    线程安全的 TTL + LRU 响应缓存
+
+    【属性说明】
+    - hits / misses: 命中 / 未命中次数
+    - invalidations: 因数据写入而清空的次数
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: int) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # key -> (过期时间戳, 响应)
+        self._entries: OrderedDict[Hashable, tuple[float, CachedResponse]] = OrderedDict()
+        # 每次清空时递增；put 时代数已变化说明数据在查询期间被修改，结果不再写入
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.maxsize > 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> CachedResponse | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, body: bytes, generation: int | None = None) -> CachedResponse:
+        """
+        写入缓存并返回带 ETag 的响应
+
+        【参数说明】
+        - generation: 开始查询数据库前读取的 self.generation；
+          期间发生过失效则只返回响应、不写入缓存
+        """
+        response = CachedResponse(body=body, etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+        if not self.enabled:
+            return response
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return response
+            self._entries[key] = (time.time() + self.ttl_seconds, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return response
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+# 律师列表与律师详情共用的缓存实例
+lawyer_cache = ResponseCache(
+    maxsize=settings.LAWYER_CACHE_MAXSIZE, ttl_seconds=settings.LAWYER_CACHE_TTL_SECONDS
+)
+
+
+# ======================== 数据写入时失效 ========================
+
+
+@event.listens_for(LawyerProfile, "after_insert")
+@event.listens_for(LawyerProfile, "after_update")
+@event.listens_for(LawyerProfile, "after_delete")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_lawyers(mapper, connection, target) -> None:
+    invalidate_lawyers(target)
+
+
+def invalidate_lawyers(target) -> None:
+    """律师数据随 target 的写入而变化：立即清空律师缓存，并在 target 所在事务提交后再清空一次。"""
+    lawyer_cache.clear()
+    session = object_session(target)
+    if session is not None:
+        session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop(_PENDING_KEY, False):
+        lawyer_cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -9,6 +9,8 @@
 【功能列表】
 - hash_password: 对明文密码进行 bcrypt 加密
 - verify_password: 验证密码是否正确
+- hash_password_async / verify_password_async: 在专用线程池中执行的异步版本
+- password_pool_stats: 密码哈希线程池的排队指标（由 /metrics 输出）
 - create_access_token: 生成 JWT 访问令牌
 
 【安全说明】
@@ -16,16 +18,27 @@
 2. JWT Token 使用 HS256 算法签名，需要保护好 SECRET_KEY
 3. Token 有过期时间，过期后需要重新登录
 
+【密码哈希线程池】
+bcrypt 单次耗时约 250ms（rounds=12）。若在 Starlette 共享线程池中同步执行，
+登录高峰时会占满线程池，其他接口随之排队。因此密码哈希放到独立的、
+大小固定的线程池（PASSWORD_HASH_WORKERS）中执行，接口以 async def 等待结果：
+- bcrypt 计算期间释放 GIL，线程池即可真正并行，无需进程池
+- 排队请求数超过 PASSWORD_HASH_MAX_PENDING 时抛出 PasswordHasherBusy（接口返回 503），
+  让登录延迟保持有界，而不是无限排队
+
 【依赖库】
 - bcrypt: 密码哈希库
 - python-jose: JWT 处理库
+
+两者都在首次使用时才导入（函数内 import），不计入应用启动时间；
+之后的调用只是一次 sys.modules 查找。
 """
 
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
-import bcrypt
-from jose import jwt
-
 from app.core.config import settings
 
 
@@ -57,10 +70,14 @@ def hash_password(password: str) -> str:
     因为 bcrypt 在底层操作的是字节数据。
     encode("utf-8") 将字符串转为 UTF-8 编码的字节串。
     """
-    # gensalt() 生成随机盐值，默认 rounds=12
+    import bcrypt  # 延迟导入，见模块说明
+
+    # gensalt() 生成随机盐值，rounds 取自配置 BCRYPT_ROUNDS（默认 12）
     # hashpw() 对密码进行加盐哈希
     # 需要将字符串编码为 bytes，处理后再解码为字符串存储
-    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+    hashed = bcrypt.hashpw(
+        password.encode("utf-8"), bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    )
     return hashed.decode("utf-8")  # 将 bytes 转回字符串，方便存储到数据库
 
 
@@ -88,6 +105,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     checkpw 使用恒定时间比较，防止时序攻击。
     不要自己实现密码比对逻辑！
     """
+    import bcrypt
+
     # checkpw 安全地比较密码
     # 两个参数都需要是 bytes 类型
     return bcrypt.checkpw(
@@ -95,6 +114,104 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     )
 
 
+class PasswordHasherBusy(Exception):
+    """密码哈希线程池排队已满（由 main.py 中的异常处理器转换为 HTTP 503）。"""
+
+
+class _PasswordPool:
+    """
+    密码哈希专用线程池 + 排队计数
+
+    【指标说明】
+    - pending: 已提交未完成的任务数（执行中 + 排队中）
+    - queued: 排队中的任务数（pending 超出线程数的部分）
+    - peak_pending: 历史最大 pending
+    - max_pending: pending 上限（PASSWORD_HASH_MAX_PENDING），达到后拒绝新任务
+    - completed / rejected: 已完成 / 因排队已满被拒绝的任务数
+    """
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # 首次使用时创建，shutdown 之后可再次创建
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+            executor = self._get_executor()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self.pending,
+                "queued": max(0, self.pending - self.workers),
+                "peak_pending": self.peak_pending,
+                "max_pending": self.max_pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+_password_pool = _PasswordPool(
+    workers=settings.PASSWORD_HASH_WORKERS, max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    hash_password 的异步版本：在密码哈希线程池中执行，不占用事件循环与共享线程池。
+
+    【异常情况】
+    - PasswordHasherBusy: 排队请求数已达 PASSWORD_HASH_MAX_PENDING
+    """
+    return await _password_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password 的异步版本，异常情况同 hash_password_async。"""
+    return await _password_pool.run(verify_password, plain_password, hashed_password)
+
+
+def password_pool_stats() -> dict:
+    """返回密码哈希线程池的排队指标（见 _PasswordPool）。"""
+    return _password_pool.stats()
+
+
+def shutdown_password_pool() -> None:
+    """应用关闭时等待进行中的哈希任务结束并释放线程。"""
+    _password_pool.shutdown()
+
+
 def create_access_token(subject: str, expires_minutes: int | None = None) -> str:
     """
     创建 JWT 访问令牌
@@ -142,6 +259,8 @@ def create_access_token(subject: str, expires_minutes: int | None = None) -> str
     # exp: expiration，JWT 标准声明，存放过期时间
     to_encode = {"sub": subject, "exp": expire}
     
+    from jose import jwt  # 延迟导入，见模块说明
+
     # 使用 HS256 算法和 SECRET_KEY 对 payload 进行签名
     # 返回编码后的 JWT 字符串
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
@@ -0,0 +1,211 @@
+"""
+=============================================================================
+文件: app/services/upload_stream.py
+模块: 流式文件上传
+描述: 边接收 multipart 请求体边写入磁盘，同一遍内计算大小与 SHA-256
+=============================================================================
+
+【为什么不用 UploadFile】
+FastAPI 的 UploadFile 会先把请求体完整写入临时文件（SpooledTemporaryFile），
+接口再从临时文件复制到 uploads/，同一份数据落盘两次；
+同步接口在整个复制过程中还占用一个线程池 worker。
+
+【实现方案】
+1. 直接迭代 request.stream()，用 python-multipart 的流式解析器拆出文件分片
+2. 分片先进入内存缓冲区，攒够 UPLOAD_BUFFER_BYTES 的整数倍后在线程池中一次写入，
+   同时更新 SHA-256；创建目录、打开文件也在线程池中，事件循环只负责收包，不做磁盘 I/O
+3. 文件写入临时目录下的 .{uuid}.part，完成后 fsync；
+   由调用方（services/blob_store.py）按摘要原子改名到最终位置，或在内容已存在时直接删除，
+   其他请求不会读到写了一半的文件；失败时删除临时文件
+4. 大小限制：Content-Length 明显超限时直接拒绝；流式接收中累计超过 UPLOAD_MAX_BYTES 立即中止
+
+【使用方法】
+stored = await receive_upload(request, blob_store.tmp_dir())
+stored.size, stored.sha256, stored.path  # path 为已 fsync 的临时文件
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import uuid4
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+
+from app.core.config import settings
+
+# multipart 边界、分片头等额外开销的估计上限，用于 Content-Length 预检查
+_MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadTooLarge(Exception):
+    """上传内容超过 UPLOAD_MAX_BYTES。"""
+
+
+class UploadFormError(Exception):
+    """请求不是合法的 multipart/form-data，或缺少文件字段。"""
+
+
+@dataclass
+class StoredUpload:
+    """已落盘的上传文件信息；path 为临时文件，调用方负责移走或删除。"""
+
+    filename: str
+    content_type: str | None
+    size: int
+    sha256: str
+    path: Path
+
+
+class _PartWriter:
+    """把单个文件分片写入临时文件：内存缓冲 + 线程池中打开与整块写入 + 同步计算摘要。"""
+
+    def __init__(self, dest_dir: Path, max_size: int, buffer_size: int) -> None:
+        self.max_size = max_size
+        self.buffer_size = buffer_size
+        self.tmp_path = dest_dir / f".{uuid4().hex}.part"
+        self.size = 0
+        self._digest = hashlib.sha256()
+        self._buffer = bytearray()
+        # 首次写入时在线程池中打开：open 同样是阻塞的磁盘操作，不在事件循环中执行
+        self._file = None
+
+    async def write(self, data: bytes) -> None:
+        self.size += len(data)
+        if self.size > self.max_size:
+            raise UploadTooLarge()
+        self._buffer += data
+        if len(self._buffer) >= self.buffer_size:
+            n = len(self._buffer) // self.buffer_size * self.buffer_size
+            block = bytes(self._buffer[:n])
+            del self._buffer[:n]
+            await run_in_threadpool(self._write_block, block)
+
+    def _write_block(self, block: bytes) -> None:
+        # 在线程池中执行。数据已在 self._buffer 中攒成 UPLOAD_BUFFER_BYTES 的整数倍再写入，
+        # 因此关闭 Python 文件对象的缓冲（buffering=0）：整块直接交给 write 系统调用，避免再拷贝一次
+        if self._file is None:
+            self._file = self.tmp_path.open("wb", buffering=0)
+        self._digest.update(block)
+        self._file.write(block)
+
+    async def finish(self) -> str:
+        """写出剩余数据并 fsync，返回 SHA-256 十六进制摘要。"""
+        block = bytes(self._buffer)
+        self._buffer.clear()
+
+        def _finish() -> None:
+            if block or self._file is None:
+                self._write_block(block)
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+        await run_in_threadpool(_finish)
+        return self._digest.hexdigest()
+
+    def abort(self) -> None:
+        # 在异常 / 取消处理中同步执行：close 与 unlink 只是元数据操作，且任务被取消后不能再 await
+        if self._file is not None:
+            self._file.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+async def receive_upload(
+    request: Request,
+    dest_dir: Path,
+    field_name: str = "file",
+    max_size: int | None = None,
+) -> StoredUpload:
+    """
+    流式接收 multipart 请求中的单个文件并保存到 dest_dir
+
+    【参数说明】
+    - request: Request - 原始请求（请求体尚未被读取）
+    - dest_dir: Path - 临时文件目录，需与最终存储目录位于同一文件系统，以保证改名是原子的
+    - field_name: str - 文件字段名，与前端 wx.uploadFile 的 name 一致
+    - max_size: int | None - 大小上限（字节），默认 UPLOAD_MAX_BYTES
+
+    【返回值】
+    StoredUpload: 原始文件名、MIME 类型、大小、SHA-256、临时文件路径
+
+    【异常情况】
+    - UploadTooLarge: 超过大小限制（已写入的临时文件会被删除）
+    - UploadFormError: 不是 multipart 请求或缺少文件字段
+    """
+    max_size = settings.UPLOAD_MAX_BYTES if max_size is None else max_size
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit():
+        if int(content_length) > max_size + _MULTIPART_OVERHEAD:
+            raise UploadTooLarge()
+
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise UploadFormError()
+
+    # 解析器回调是同步的：只记录事件，由下面的异步循环处理
+    events: list[tuple[str, bytes]] = []
+    headers: dict[bytes, bytes] = {}
+    header_name = bytearray()
+    header_value = bytearray()
+
+    def on_header_field(data: bytes, start: int, end: int) -> None:
+        header_name.extend(data[start:end])
+
+    def on_header_value(data: bytes, start: int, end: int) -> None:
+        header_value.extend(data[start:end])
+
+    def on_header_end() -> None:
+        headers[bytes(header_name).lower()] = bytes(header_value)
+        header_name.clear()
+        header_value.clear()
+
+    parser = MultipartParser(
+        boundary,
+        {
+            "on_part_begin": lambda: headers.clear(),
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": lambda: events.append(("begin", b"")),
+            "on_part_data": lambda data, start, end: events.append(("data", data[start:end])),
+            "on_part_end": lambda: events.append(("end", b"")),
+        },
+    )
+
+    await run_in_threadpool(dest_dir.mkdir, parents=True, exist_ok=True)
+    writer: _PartWriter | None = None
+    result: StoredUpload | None = None
+    filename = ""
+    part_type: str | None = None
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            for kind, data in events:
+                if kind == "begin" and result is None:
+                    _, options = parse_options_header(headers.get(b"content-disposition", b""))
+                    if options.get(b"name", b"").decode() == field_name and b"filename" in options:
+                        # 只保留文件名部分，防止 ../ 路径穿越
+                        filename = Path(options[b"filename"].decode("utf-8", "replace")).name
+                        part_type = headers.get(b"content-type", b"").decode("latin-1") or None
+                        writer = _PartWriter(dest_dir, max_size, settings.UPLOAD_BUFFER_BYTES)
+                elif kind == "data" and writer is not None:
+                    await writer.write(data)
+                elif kind == "end" and writer is not None:
+                    digest = await writer.finish()
+                    result = StoredUpload(filename, part_type, writer.size, digest, writer.tmp_path)
+                    writer = None
+            events.clear()
+        parser.finalize()
+        if result is None:
+            raise UploadFormError()
+    except BaseException:
+        # 客户端断开、超限或请求体不完整：不留下临时文件或半成品
+        if writer is not None:
+            writer.abort()
+        if result is not None:
+            result.path.unlink(missing_ok=True)
+        raise
+    return result
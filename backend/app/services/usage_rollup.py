@@ -0,0 +1,336 @@
+"""
+=============================================================================
+文件: app/services/usage_rollup.py
+模块: 模型用量汇总
+描述: 从 model_call_logs 增量汇总出按小时 / 按天的用量表，
+      管理端的用量统计只查询汇总表，耗时与日志表的行数无关
+=============================================================================
+
+【增量汇总】
+1. rollup_state 记录已汇总到的 model_call_logs.id（高水位）
+2. 每轮读取 id 大于高水位的至多 USAGE_ROLLUP_BATCH_SIZE 行，在内存中按
+   (时间桶, user_id, model_name) 聚合，再累加到 model_usage_hourly / model_usage_daily
+3. 累加与推进高水位在同一个事务中完成，中途失败整轮回滚，不会重复或遗漏
+4. 事务的第一条语句就写 rollup_state，取得写锁（SQLite）/ 行锁（其他数据库），
+   多个 worker 同时运行汇总时会串行执行，不会重复累加
+
+【运行方式】
+- 应用内：start() 启动的后台任务每 USAGE_ROLLUP_INTERVAL_SECONDS 秒汇总一次（0 表示不启动）
+- 命令行 / 定时任务：python scripts/rollup_usage.py
+
+【注意事项】
+高水位假设 id 按提交顺序递增（SQLite 与本项目的单一写入方 model_call_logger 满足）；
+日志只追加、不修改，已汇总的行被删除不影响汇总表。
+费用在查询时按 LLM_PRICES 计算，调整价格无需重新汇总。
+"""
+
+import asyncio
+import logging
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timezone
+
+from sqlalchemy import Select, and_, bindparam, insert, select, tuple_, update
+from sqlalchemy.engine import Connection, Engine
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.models.model_call_log import ModelCallLog
+from app.models.model_usage_rollup import (
+    LATENCY_BUCKETS_MS,
+    LATENCY_COLUMNS,
+    ModelUsageDaily,
+    ModelUsageHourly,
+    RollupState,
+)
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_NAME = "model_usage"
+GRANULARITIES = ("hour", "day")
+GROUP_BY = ("none", "user", "model", "user_model")
+
+_TABLES = {"hour": ModelUsageHourly.__table__, "day": ModelUsageDaily.__table__}
+_KEY_COLUMNS = ("bucket_start", "user_id", "model_name")
+_METRICS = ("calls", "cache_hits", "errors", "input_tokens", "output_tokens", "duration_ms") + LATENCY_COLUMNS
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    """统一为不带时区的 UTC（日志与汇总表的时间都按此存储）。"""
+    return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo is not None else dt
+
+
+def _truncate(dt: datetime, granularity: str) -> datetime:
+    """时间桶起点：整点或零点（UTC，不带时区）。"""
+    dt = _naive_utc(dt).replace(minute=0, second=0, microsecond=0)
+    return dt.replace(hour=0) if granularity == "day" else dt
+
+
+def _aggregate(rows: Iterable) -> dict[tuple, list[int]]:
+    """把日志行聚合为 (整点, user_id, model_name) -> 各指标的增量（顺序同 _METRICS）。"""
+    out: dict[tuple, list[int]] = {}
+    lat_offset = len(_METRICS) - len(LATENCY_COLUMNS)
+    # 行的列顺序见 _rollup_batch 中的查询
+    for _id, user_id, model_name, status, input_tokens, output_tokens, duration, created_at in rows:
+        # 日志时间从数据库读出即为不带时区的 UTC
+        hour = created_at.replace(minute=0, second=0, microsecond=0)
+        key = (hour, user_id or 0, model_name or "")
+        acc = out.get(key)
+        if acc is None:
+            acc = out[key] = [0] * len(_METRICS)
+        duration = duration or 0
+        acc[0] += 1
+        if status == "cache_hit":
+            acc[1] += 1
+        elif status == "error":
+            acc[2] += 1
+        acc[3] += input_tokens or 0
+        acc[4] += output_tokens or 0
+        acc[5] += duration
+        acc[lat_offset + bisect_left(LATENCY_BUCKETS_MS, duration)] += 1
+    return out
+
+
+def _fold_daily(hourly: dict[tuple, list[int]]) -> dict[tuple, list[int]]:
+    """由小时增量合并出天增量（键数远少于日志行数）。"""
+    out: dict[tuple, list[int]] = {}
+    for (hour, user_id, model_name), values in hourly.items():
+        key = (hour.replace(hour=0), user_id, model_name)
+        acc = out.get(key)
+        if acc is None:
+            out[key] = list(values)
+        else:
+            for i, v in enumerate(values):
+                acc[i] += v
+    return out
+
+
+def _apply(conn: Connection, granularity: str, deltas: dict[tuple, list[int]]) -> None:
+    """把增量累加到汇总表：已有的行 UPDATE col = col + 增量，其余 INSERT（均为 executemany）。"""
+    t = _TABLES[granularity]
+    key_cols = [t.c[k] for k in _KEY_COLUMNS]
+    existing = set()
+    keys = list(deltas)
+    # 分块查询已存在的键，避免 IN 列表过长
+    for i in range(0, len(keys), 500):
+        chunk = keys[i : i + 500]
+        existing.update(
+            tuple(r) for r in conn.execute(select(*key_cols).where(tuple_(*key_cols).in_(chunk)))
+        )
+
+    updates = [
+        {**{f"k_{k}": v for k, v in zip(_KEY_COLUMNS, key)}, **dict(zip(_METRICS, values))}
+        for key, values in deltas.items()
+        if key in existing
+    ]
+    inserts = [
+        {**dict(zip(_KEY_COLUMNS, key)), **dict(zip(_METRICS, values))}
+        for key, values in deltas.items()
+        if key not in existing
+    ]
+    if updates:
+        stmt = (
+            update(t)
+            .where(and_(*(t.c[k] == bindparam(f"k_{k}") for k in _KEY_COLUMNS)))
+            .values({m: t.c[m] + bindparam(m) for m in _METRICS})
+        )
+        conn.execute(stmt, updates)
+    if inserts:
+        conn.execute(insert(t), inserts)
+
+
+def _rollup_batch(conn: Connection, batch_size: int) -> int:
+    """在一个事务内汇总一批日志，返回处理的行数。"""
+    state = RollupState.__table__
+    now = _utcnow()
+    # 先写 rollup_state 取得锁，再读高水位
+    claimed = conn.execute(
+        update(state).where(state.c.name == ROLLUP_NAME).values(updated_at=now)
+    ).rowcount
+    if not claimed:
+        conn.execute(insert(state).values(name=ROLLUP_NAME, last_id=0, updated_at=now))
+    last_id = conn.execute(select(state.c.last_id).where(state.c.name == ROLLUP_NAME)).scalar_one()
+
+    log = ModelCallLog.__table__
+    rows = conn.execute(
+        select(
+            log.c.id, log.c.user_id, log.c.model_name, log.c.status,
+            log.c.input_tokens, log.c.output_tokens, log.c.duration_ms, log.c.created_at,
+        )
+        .where(log.c.id > last_id)
+        .order_by(log.c.id)
+        .limit(batch_size)
+    ).all()
+    if not rows:
+        return 0
+    hourly = _aggregate(rows)
+    _apply(conn, "hour", hourly)
+    _apply(conn, "day", _fold_daily(hourly))
+    conn.execute(
+        update(state).where(state.c.name == ROLLUP_NAME).values(last_id=rows[-1].id)
+    )
+    return len(rows)
+
+
+def run_rollup(engine: Engine, batch_size: int | None = None) -> int:
+    """
+    把高水位之后的新日志全部汇总，返回处理的行数（每批一个事务）
+
+    【使用示例】
+    from app.db.session import engine
+    run_rollup(engine)
+    """
+    batch_size = batch_size or settings.USAGE_ROLLUP_BATCH_SIZE
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            n = _rollup_batch(conn, batch_size)
+        total += n
+        if n < batch_size:
+            return total
+
+
+def state_query() -> Select:
+    """查询当前高水位 last_id 与最近一次汇总时间 updated_at（尚未汇总过时无结果行）。"""
+    state = RollupState.__table__
+    return select(state.c.last_id, state.c.updated_at).where(state.c.name == ROLLUP_NAME)
+
+
+def reset(engine: Engine) -> None:
+    """清空汇总表与高水位（之后的 run_rollup 会从头重新汇总）。"""
+    with engine.begin() as conn:
+        for t in _TABLES.values():
+            conn.execute(t.delete())
+        conn.execute(RollupState.__table__.delete().where(RollupState.__table__.c.name == ROLLUP_NAME))
+
+
+# ======================== 查询 ========================
+
+
+def usage_query(
+    granularity: str,
+    start: datetime,
+    end: datetime,
+    user_id: int | None = None,
+    model_name: str | None = None,
+) -> Select:
+    """
+    构造汇总表查询：[start, end) 内按 (时间桶, user_id, model_name) 的各项合计
+
+    只读取汇总表，结果行数由时间范围与用户 / 模型数决定，与日志表大小无关。
+    """
+    t = _TABLES[granularity]
+    stmt = (
+        select(t.c.bucket_start, t.c.user_id, t.c.model_name, *(t.c[m] for m in _METRICS))
+        .where(t.c.bucket_start >= _truncate(start, granularity), t.c.bucket_start < _naive_utc(end))
+        .order_by(t.c.bucket_start)
+    )
+    if user_id is not None:
+        stmt = stmt.where(t.c.user_id == user_id)
+    if model_name is not None:
+        stmt = stmt.where(t.c.model_name == model_name)
+    return stmt
+
+
+def _cost(model_name: str, input_tokens: int, output_tokens: int) -> float:
+    """按 LLM_PRICES（每千 Token 的输入 / 输出单价）计算费用；未配置价格的模型费用为 0。"""
+    price = settings.LLM_PRICES.get(model_name)
+    if not price:
+        return 0.0
+    return input_tokens / 1000 * price[0] + output_tokens / 1000 * price[1]
+
+
+def _percentile_ms(histogram: Sequence[int], q: float) -> int | None:
+    """由耗时分布估算百分位：返回所在区间的上界（超过最后一个上界时为 None）。"""
+    total = sum(histogram)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for bound, count in zip(LATENCY_BUCKETS_MS + (None,), histogram):
+        seen += count
+        if seen >= rank:
+            return bound
+    return None
+
+
+def summarize(rows: Sequence, group_by: str) -> list[dict]:
+    """
+    把 usage_query 的结果按时间桶与 group_by 维度合并，并计算费用、平均耗时与百分位
+
+    【参数说明】
+    - group_by: none（每个时间桶一行）/ user / model / user_model
+    """
+    merged: dict[tuple, dict] = {}
+    for row in rows:
+        key = (
+            row.bucket_start,
+            row.user_id if group_by in ("user", "user_model") else None,
+            row.model_name if group_by in ("model", "user_model") else None,
+        )
+        item = merged.get(key)
+        if item is None:
+            item = merged[key] = {
+                "bucket": row.bucket_start,
+                "user_id": key[1],
+                "model_name": key[2],
+                "cost": 0.0,
+                **{m: 0 for m in _METRICS},
+            }
+        for m in _METRICS:
+            item[m] += getattr(row, m)
+        # 费用按模型单价计算，所以查询总是按模型分组，合并时再累加
+        item["cost"] += _cost(row.model_name, row.input_tokens, row.output_tokens)
+
+    out = []
+    for item in merged.values():
+        histogram = [item.pop(c) for c in LATENCY_COLUMNS]
+        duration = item.pop("duration_ms")
+        item["cost"] = round(item["cost"], 6)
+        item["avg_ms"] = round(duration / item["calls"], 1) if item["calls"] else None
+        item["p50_ms"] = _percentile_ms(histogram, 0.5)
+        item["p95_ms"] = _percentile_ms(histogram, 0.95)
+        item["p99_ms"] = _percentile_ms(histogram, 0.99)
+        out.append(item)
+    out.sort(key=lambda i: (i["bucket"], i["user_id"] or 0, i["model_name"] or ""))
+    return out
+
+
+# ======================== 后台任务 ========================
+
+_task: asyncio.Task | None = None
+
+
+async def _run_periodically(engine: Engine, interval: float) -> None:
+    while True:
+        try:
+            await run_in_threadpool(run_rollup, engine)
+        except Exception:
+            logger.exception("模型用量汇总失败，下次继续")
+        await asyncio.sleep(interval)
+
+
+def start(engine: Engine) -> None:
+    """启动定时汇总（USAGE_ROLLUP_INTERVAL_SECONDS 为 0 时不启动）。"""
+    global _task
+    if settings.USAGE_ROLLUP_INTERVAL_SECONDS <= 0 or (_task is not None and not _task.done()):
+        return
+    _task = asyncio.get_running_loop().create_task(
+        _run_periodically(engine, settings.USAGE_ROLLUP_INTERVAL_SECONDS), name="usage-rollup"
+    )
+
+
+async def stop() -> None:
+    """停止定时汇总（进行中的一批会在线程中执行完并提交）。"""
+    global _task
+    task, _task = _task, None
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+列表接口序列化基准：在临时 SQLite 库上进程内调用各列表接口（每页 PAGE_SIZE_MAX 条），
+统计单次请求耗时；并单独对比取出一页合同并编码为 JSON 的三种方式（含 SQL，不含 HTTP）：
+  orm+pydantic - 查询 ORM 对象，按 response_model 校验后由 pydantic 输出 JSON（FastAPI 的默认路径）
+  orm+stdlib   - 同上，但经 jsonable_encoder + json.dumps 输出（自定义 JSONResponse 时的路径）
+  rows+orjson  - 投影列 -> dict -> orjson（app/api/responses.py 的可信数据快速路径）
+后者是请求在事件循环线程上占用的 CPU，决定并发时的吞吐；单次请求耗时中数据库等待占大头。
+用法: 在 backend 目录下执行  python scripts/bench_serialization.py [--rows 2000] [--repeat 200]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# 必须在导入 app 之前设置，使用独立的临时数据库与上传目录
+_TMP = tempfile.mkdtemp(prefix="lubao_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP}/bench.db"
+os.environ["UPLOAD_DIR"] = f"{_TMP}/uploads"
+os.environ.setdefault("REQUEST_LOG_ENABLED", "false")  # 逐请求日志会干扰计时
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+from app.api.responses import dumps, rows_to_dicts  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.case import Case  # noqa: E402
+from app.models.contract import Contract  # noqa: E402
+from app.models.law_article import LawArticle  # noqa: E402
+from app.models.uploaded_file import UploadedFile  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.pagination import Page  # noqa: E402
+from app.schemas.query import ContractOut  # noqa: E402
+
+PASSWORD = "123456"
+
+
+def seed(n: int) -> None:
+    """为 bench_client / bench_lawyer 各写入 n 条合同、文件、案件，以及 n 条法条。"""
+    db = SessionLocal()
+    try:
+        client, lawyer = (db.query(User).filter_by(username=name).one() for name in ("bench_client", "bench_lawyer"))
+        desc = "本合同就房屋租赁事宜约定如下，双方应当遵守。" * 4
+        db.add_all(
+            Contract(user_id=client.id, title=f"房屋租赁合同{i}", description=desc, status="active")
+            for i in range(n)
+        )
+        db.add_all(
+            UploadedFile(
+                user_id=client.id,
+                original_filename=f"合同{i}.pdf",
+                stored_filename=f"{i:032x}_合同{i}.pdf",
+                content_type="application/pdf",
+                size=1024 * i,
+                path=f"{_TMP}/uploads/blobs/{i}",
+            )
+            for i in range(n)
+        )
+        db.add_all(
+            Case(
+                case_no=f"(2024)京0105民初{i}号",
+                title=f"租赁合同纠纷{i}",
+                status="processing",
+                progress=i % 100,
+                case_type="民事",
+                lawyer_id=lawyer.id,
+                client_id=client.id,
+            )
+            for i in range(n)
+        )
+        db.add_all(
+            LawArticle(law_name="中华人民共和国民法典", article_no=f"第{i}条", content=f"租赁合同{i}" + desc)
+            for i in range(n)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def login(client: TestClient, username: str) -> dict:
+    client.post("/api/v1/auth/register", json={"username": username, "password": PASSWORD, "role": username.split("_")[1]})
+    token = client.post("/api/v1/auth/login", json={"username": username, "password": PASSWORD}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def bench_endpoint(client: TestClient, path: str, headers: dict | None, repeat: int) -> dict:
+    params = {"limit": settings.PAGE_SIZE_MAX}
+    r = client.get(path, params=params, headers=headers)
+    if r.status_code != 200 or len(r.json()["items"]) != settings.PAGE_SIZE_MAX:
+        raise RuntimeError(f"GET {path} 失败：{r.status_code} {r.text[:200]}")
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        client.get(path, params=params, headers=headers)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"mean_ms": round(statistics.fmean(timings), 3), "p50_ms": round(statistics.median(timings), 3), "bytes": len(r.content)}
+
+
+def bench_serializers(repeat: int) -> dict:
+    """取出一页合同并编码为 JSON：ORM + 模型校验 与 投影 + orjson 的对比（同步会话，含 SQL）。"""
+    columns = tuple(getattr(Contract, f) for f in ContractOut.model_fields)
+    adapter = TypeAdapter(Page[ContractOut])
+    limit = settings.PAGE_SIZE_MAX
+    db = SessionLocal()
+
+    def orm_page() -> Page:
+        db.expunge_all()  # 每次都重新构造 ORM 对象，与新请求的新会话一致
+        return adapter.validate_python(
+            Page(items=db.scalars(select(Contract).limit(limit)).all()), from_attributes=True
+        )
+
+    cases = {
+        "orm+pydantic": lambda: adapter.dump_json(orm_page()),
+        "orm+stdlib": lambda: json.dumps(jsonable_encoder(orm_page())).encode(),
+        "rows+orjson": lambda: dumps({"items": rows_to_dicts(db.execute(select(*columns).limit(limit)).all()), "next_cursor": None}),
+    }
+    out = {}
+    try:
+        for name, fn in cases.items():
+            fn()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                fn()
+            out[name] = {"mean_us": round((time.perf_counter() - started) / repeat * 1e6, 1)}
+    finally:
+        db.close()
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="列表接口序列化基准")
+    parser.add_argument("--rows", type=int, default=2000, help="每类数据的条数")
+    parser.add_argument("--repeat", type=int, default=200, help="每个接口的请求次数")
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        client_headers = login(client, "bench_client")
+        lawyer_headers = login(client, "bench_lawyer")
+        seed(args.rows)
+        endpoints = {
+            "GET /query/contracts": ("/api/v1/query/contracts", client_headers),
+            "GET /files": ("/api/v1/files", client_headers),
+            "GET /query/laws": ("/api/v1/query/laws", None),
+            "GET /query/laws?keyword": ("/api/v1/query/laws?keyword=租赁合同", None),
+            "GET /cases": ("/api/v1/cases", lawyer_headers),
+        }
+        report = {
+            "rows": args.rows,
+            "page_size": settings.PAGE_SIZE_MAX,
+            "endpoints": {name: bench_endpoint(client, path, h, args.repeat) for name, (path, h) in endpoints.items()},
+            "serializers": bench_serializers(args.repeat),
+        }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
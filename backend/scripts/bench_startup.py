@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+启动耗时基准：每次在新的子进程中冷启动，分别测量
+  import   - import app.main 的耗时（python -X importtime 的 app.main 累计时间，取中位数）
+  init_db  - 启动事件中的数据库初始化（临时 SQLite 库）：
+             first 新库首次启动（建表 + 迁移）、auto 结构版本已是最新时、full 每次完整检查时
+并列出自身导入耗时最多的模块、按顶层包汇总的导入耗时，以及启动时被提前导入的重模块
+（python-jose / bcrypt / httpx / cryptography 应在首次使用时才导入）。
+scripts/benchmark.py 会把本脚本的结果写入报告的 startup 字段并一起与基准对比。
+用法: 在 backend 目录下执行
+    python scripts/bench_startup.py --out startup.json
+    python scripts/bench_startup.py --baseline startup.json   # 与基准对比，有回归时退出码 1
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from datetime import datetime, timezone
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 不应在启动时导入的模块（顶层包名）
+HEAVY_MODULES = ("jose", "bcrypt", "httpx", "cryptography")
+
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+_INIT_DB = """
+import json, time
+import app.main  # noqa: F401 (与真实启动一致：模型与服务已导入，只计 init_db 本身)
+from app.db.session import init_db
+t = time.perf_counter()
+init_db()
+print(json.dumps({"init_db_ms": (time.perf_counter() - t) * 1000}))
+"""
+
+
+def _env(database_url: str, **extra: str) -> dict:
+    env = dict(os.environ, DATABASE_URL=database_url, REQUEST_LOG_ENABLED="false", **extra)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def _python(args: list[str], env: dict) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=BACKEND, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """解析 -X importtime 输出：[(模块名, 自身耗时 us, 累计耗时 us), ...]。"""
+    rows = []
+    for line in stderr.splitlines():
+        m = _IMPORTTIME.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2))))
+    return rows
+
+
+def import_profile(database_url: str, runs: int, top: int) -> dict:
+    """多次冷启动 import app.main，按 app.main 累计耗时取中位数那一次展开明细。"""
+    env = _env(database_url)
+    _python(["-c", "import app.main"], env)  # 预热：生成 .pyc，不计时
+    samples = []
+    for _ in range(runs):
+        rows = parse_importtime(_python(["-X", "importtime", "-c", "import app.main"], env).stderr)
+        total = next(cum for name, _, cum in rows if name == "app.main")
+        samples.append((total, rows))
+    samples.sort(key=lambda s: s[0])
+    total, rows = samples[len(samples) // 2]
+
+    packages: dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        packages[name.split(".")[0]] += self_us
+    loaded = {name.split(".")[0] for name, _, _ in rows}
+    return {
+        "import_ms": round(total / 1000, 1),
+        "import_ms_runs": [round(s[0] / 1000, 1) for s in samples],
+        "modules": len(rows),
+        "top_modules": [
+            {"module": name, "self_ms": round(self_us / 1000, 2), "cumulative_ms": round(cum / 1000, 2)}
+            for name, self_us, cum in sorted(rows, key=lambda r: r[1], reverse=True)[:top]
+        ],
+        "packages_ms": {
+            name: round(us / 1000, 1)
+            for name, us in sorted(packages.items(), key=lambda p: p[1], reverse=True)[:top]
+        },
+        "eager_heavy_modules": sorted(m for m in HEAVY_MODULES if m in loaded),
+    }
+
+
+def init_db_profile(database_url: str, runs: int) -> dict:
+    """新库首次 init_db 的耗时，以及结构已是最新时 auto / full 两种启动模式的中位数耗时。"""
+
+    def run(mode: str) -> float:
+        out = _python(["-c", _INIT_DB], _env(database_url, DB_SCHEMA_STARTUP=mode)).stdout
+        return json.loads(out.strip().splitlines()[-1])["init_db_ms"]
+
+    first = run("auto")
+    return {
+        "init_db_first_ms": round(first, 1),
+        "init_db_auto_ms": round(statistics.median(run("auto") for _ in range(runs)), 1),
+        "init_db_full_ms": round(statistics.median(run("full") for _ in range(runs)), 1),
+    }
+
+
+def profile(runs: int = 5, top: int = 15) -> dict:
+    """完整的启动耗时报告（每次调用使用新的临时 SQLite 库）。"""
+    tmp = tempfile.mkdtemp(prefix="lubao_startup_")
+    database_url = f"sqlite:///{tmp}/startup.db"
+    report = import_profile(database_url, runs, top)
+    report.update(init_db_profile(database_url, runs))
+    return report
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """打印与基准的对比，返回变慢超过阈值的指标，以及新增的启动时重模块。"""
+    regressions = []
+    for key in ("import_ms", "init_db_auto_ms"):
+        old, cur = baseline.get(key), report[key]
+        if not old:
+            continue
+        change = (cur - old) / old
+        flag = " <-- 回归" if change > threshold else ""
+        if flag:
+            regressions.append(key)
+        print(f"startup.{key:24s} {old:8.1f} -> {cur:8.1f} ms ({change:+.0%}){flag}")
+    new_heavy = set(report["eager_heavy_modules"]) - set(baseline.get("eager_heavy_modules", []))
+    if new_heavy:
+        print(f"启动时新导入的重模块：{', '.join(sorted(new_heavy))} <-- 回归")
+        regressions.extend(f"eager:{m}" for m in sorted(new_heavy))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="启动耗时基准")
+    parser.add_argument("--runs", type=int, default=5, help="每项测量的冷启动次数（取中位数）")
+    parser.add_argument("--top", type=int, default=15, help="列出导入耗时最多的模块 / 包的个数")
+    parser.add_argument("--out", help="把结果写入 JSON 文件（可作为之后的基准）")
+    parser.add_argument("--baseline", help="与基准 JSON 对比")
+    parser.add_argument("--threshold", type=float, default=0.25, help="变慢超过该比例视为回归（默认 0.25）")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "runs": args.runs,
+            "python": platform.python_version(),
+        },
+        **profile(args.runs, args.top),
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    if report["eager_heavy_modules"]:
+        print(f"启动时导入了重模块：{', '.join(report['eager_heavy_modules'])}", file=sys.stderr)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"启动耗时回归：{', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
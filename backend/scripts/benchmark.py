@@ -0,0 +1,439 @@
+# -*- coding: utf-8 -*-
+"""
+接口压测基准：写入一份接近真实规模的数据集（用户、律师资料、案件、合同、法条），
+对 /api/v1 下的每个接口并发施压，输出吞吐、p50/p95/p99 延迟与每请求 SQL 条数（JSON），
+可保存为基准并在之后的运行中对比。报告的 startup 字段是 bench_startup.py 测得的启动耗时
+（import 耗时、init_db 耗时、启动时导入的重模块），--no-startup 可跳过。
+
+两种运行方式：
+  进程内（默认）：httpx.ASGITransport 直接调用 app，不经过网络；默认使用临时 SQLite 库，
+                 --database-url 可指定 PostgreSQL 等；可统计每请求 SQL 条数
+  本地服务：--base-url http://127.0.0.1:8000，服务与本脚本需使用同一个 DATABASE_URL
+            （数据集由本脚本直接写库）；无法统计 SQL 条数
+
+用法: 在 backend 目录下执行
+    python scripts/benchmark.py --out baseline.json
+    python scripts/benchmark.py --baseline baseline.json          # 与基准对比，有回归时退出码 1
+有接口没有压测场景（uncovered）时同样以退出码 1 结束。
+    python scripts/benchmark.py --database-url postgresql+psycopg://... --scale 5
+    python scripts/benchmark.py --base-url http://127.0.0.1:8000 --database-url sqlite:///./app.db
+    python scripts/benchmark.py --only /batch --rtt-ms 50     # 批量接口与逐个请求对照，模拟 50ms 网络往返
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+# 必须在导入 app 之前确定数据库：先解析参数
+_parser = argparse.ArgumentParser(description="接口压测基准")
+_parser.add_argument("--database-url", help="数据库地址，默认使用临时 SQLite 库")
+_parser.add_argument("--base-url", help="压测已启动的服务（如 http://127.0.0.1:8000），默认进程内调用")
+_parser.add_argument("--scale", type=int, default=1, help="数据集规模倍数（1 倍约 2000 案件 / 2000 合同 / 3000 法条）")
+_parser.add_argument("--requests", type=int, default=200, help="每个接口的请求数")
+_parser.add_argument("--concurrency", type=int, default=10, help="并发数")
+_parser.add_argument("--only", help="只压测名称包含该子串的接口，如 /cases")
+_parser.add_argument("--out", help="把结果写入 JSON 文件（可作为之后的基准）")
+_parser.add_argument("--baseline", help="与基准 JSON 对比")
+_parser.add_argument("--threshold", type=float, default=0.25, help="p95 变慢超过该比例视为回归（默认 0.25）")
+_parser.add_argument("--rtt-ms", type=float, default=0, help="每个请求前等待的毫秒数，模拟客户端网络往返（对比批量接口时使用）")
+_parser.add_argument("--no-startup", action="store_true", help="不测量启动耗时（见 scripts/bench_startup.py）")
+ARGS = _parser.parse_args()
+
+_TMP = tempfile.mkdtemp(prefix="lubao_benchmark_")
+os.environ["DATABASE_URL"] = ARGS.database_url or f"sqlite:///{_TMP}/benchmark.db"
+os.environ.setdefault("UPLOAD_DIR", f"{_TMP}/uploads")
+os.environ.setdefault("REQUEST_LOG_ENABLED", "false")  # 逐请求日志会干扰计时
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bench_startup  # noqa: E402  (同目录脚本)
+import httpx  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.api.router import api_routes  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.db.session import SessionLocal, async_engine, engine, init_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.case import Case  # noqa: E402
+from app.models.contract import Contract  # noqa: E402
+from app.models.lawyer_profile import LawyerProfile  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services import law_import  # noqa: E402
+from app.services.security import hash_password  # noqa: E402
+
+PASSWORD = "123456"
+API = settings.API_V1_STR
+
+_CATEGORIES = ["婚姻家事", "刑事辩护", "合同纠纷", "劳动争议", "房产纠纷", "知识产权", "公司法务", "交通事故"]
+_TAGS = ["资深", "新锐", "调解", "诉讼", "仲裁", "非诉"]
+_DESC = "本合同就房屋租赁事宜约定如下：出租人应当按期交付租赁物，承租人应当按约定支付租金。"
+
+# ======================== SQL 计数 ========================
+
+_statements = 0
+
+
+def _count(conn, cursor, statement, parameters, context, executemany) -> None:
+    global _statements
+    _statements += 1
+
+
+event.listen(engine, "before_cursor_execute", _count)
+if async_engine is not None:
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _count)
+
+
+# ======================== 数据集 ========================
+
+
+def seed(scale: int) -> dict:
+    """
+    写入数据集（bench_client 已存在时视为已写入，直接复用）
+
+    bench_client / bench_lawyer 是压测使用的账号，各自名下的列表数据足够翻多页。
+    """
+    db = SessionLocal()
+    try:
+        if db.query(User.id).filter_by(username="bench_client").first() is None:
+            hashed = hash_password(PASSWORD)  # bcrypt 较慢，所有账号共用一个哈希
+            users = [
+                User(username="bench_client", hashed_password=hashed, role="client"),
+                User(username="bench_lawyer", hashed_password=hashed, role="lawyer"),
+                User(username="bench_admin", hashed_password=hashed, role="admin"),
+            ]
+            users += [User(username=f"bench_lawyer_{i}", hashed_password=hashed, role="lawyer") for i in range(50 * scale)]
+            users += [User(username=f"bench_client_{i}", hashed_password=hashed, role="client") for i in range(200 * scale)]
+            db.add_all(users)
+            db.flush()
+            lawyers = [u for u in users if u.role == "lawyer"]
+            clients = [u for u in users if u.role == "client"]
+            db.add_all(
+                LawyerProfile(
+                    user_id=u.id,
+                    name=f"律师{i}",
+                    title="合伙人" if i % 5 == 0 else "执业律师",
+                    organization="某某律师事务所",
+                    practice_years=str(3 + i % 20),
+                    introduction=f"专注{_CATEGORIES[i % len(_CATEGORIES)]}领域，执业多年。",
+                    categories=[_CATEGORIES[i % len(_CATEGORIES)], _CATEGORIES[(i * 3) % len(_CATEGORIES)]],
+                    tags=[_TAGS[i % len(_TAGS)]],
+                )
+                for i, u in enumerate(lawyers)
+            )
+            db.add_all(
+                Case(
+                    case_no=f"(2024)京0105民初{i}号",
+                    title=f"{_CATEGORIES[i % len(_CATEGORIES)]}案件{i}",
+                    case_type="民事",
+                    status=("pending", "processing", "completed")[i % 3],
+                    progress=i % 100,
+                    # 前 10% 的案件属于压测账号，其余分散到其他律师与客户
+                    lawyer_id=lawyers[0].id if i % 10 == 0 else lawyers[i % len(lawyers)].id,
+                    client_id=clients[0].id if i % 10 == 0 else clients[i % len(clients)].id,
+                )
+                for i in range(2000 * scale)
+            )
+            db.add_all(
+                Contract(
+                    user_id=clients[0].id if i % 10 == 0 else clients[i % len(clients)].id,
+                    title=f"房屋租赁合同{i}",
+                    description=_DESC,
+                    status=("draft", "active", "signed")[i % 3],
+                )
+                for i in range(2000 * scale)
+            )
+            db.commit()
+            law_import.import_articles(
+                engine,
+                (
+                    {"law_name": f"测试法典{i // 1000}", "article_no": f"第{i % 1000 + 1}条", "content": f"{_DESC}第{i}项。"}
+                    for i in range(3000 * scale)
+                ),
+            )
+        ids = {
+            "lawyer_id": db.query(User.id).filter_by(username="bench_lawyer").scalar(),
+            "case_id": db.query(Case.id)
+            .join(User, User.id == Case.lawyer_id)
+            .filter(User.username == "bench_lawyer")
+            .order_by(Case.id)
+            .limit(1)
+            .scalar(),
+        }
+        return ids
+    finally:
+        db.close()
+
+
+# ======================== 场景 ========================
+
+
+@dataclass
+class Context:
+    """压测过程中共享的 Token 与数据 ID。"""
+
+    client: dict
+    lawyer: dict
+    admin: dict
+    lawyer_id: int
+    case_id: int
+    file_id: int
+    run: str  # 本次运行的唯一前缀，避免注册等写接口重名
+
+
+@dataclass
+class Scenario:
+    """
+    一个接口的压测场景：build(ctx, i) 返回第 i 个请求的 httpx 参数
+
+    build 也可以返回参数列表：依次发送（可用 "method" 覆盖方法），整组计为一次请求的耗时，
+    用于与批量接口对照。
+    """
+
+    method: str
+    path: str  # 与路由声明一致的路径模板，用于检查覆盖率
+    build: Callable[[Context, int], dict | list[dict]]
+    max_requests: int | None = None  # 请求数上限：bcrypt 校验密码本身就慢，没必要压满
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}"
+
+
+def _page_calls(c: Context) -> list[tuple[str, dict]]:
+    """小程序首页加载时的 4 个请求：(路径, 查询参数)，批量接口场景与逐个请求的对照场景共用。"""
+    return [
+        ("/auth/me", {}),
+        ("/cases", {"limit": 10}),
+        ("/dashboard/summary", {}),
+        ("/lawyers", {"limit": 10}),
+    ]
+
+
+# 对照场景的名称：不是路由，不参与覆盖率检查
+SEQUENTIAL = "SEQ /batch"
+
+
+def _scenarios() -> list[Scenario]:
+    import_body = "\n".join(
+        json.dumps({"law_name": "压测导入法", "article_no": f"第{i}条", "content": f"{_DESC}{i}"}, ensure_ascii=False)
+        for i in range(1, 51)
+    ).encode()
+    return [
+        Scenario("POST", "/auth/register", lambda c, i: {"json": {"username": f"{c.run}_u{i}", "password": PASSWORD, "role": "client"}}, max_requests=20),
+        Scenario("POST", "/auth/login", lambda c, i: {"json": {"username": "bench_client", "password": PASSWORD}}, max_requests=20),
+        Scenario("POST", "/auth/token", lambda c, i: {"data": {"username": "bench_client", "password": PASSWORD}}, max_requests=20),
+        Scenario("GET", "/auth/me", lambda c, i: {"headers": c.client}),
+        Scenario("GET", "/cases", lambda c, i: {"headers": c.lawyer, "params": {"history": True}}),
+        Scenario("GET", "/cases/{case_id}", lambda c, i: {"headers": c.lawyer, "url": f"/cases/{c.case_id}"}),
+        Scenario(
+            "POST",
+            "/cases",
+            lambda c, i: {"headers": c.lawyer, "json": {"caseNo": f"{c.run}-{i}", "caseTitle": f"压测案件{i}", "filingDate": "2024-01-15"}},
+        ),
+        Scenario(
+            "PATCH",
+            "/cases/{case_id}",
+            # 在处理中与胜诉结案之间切换：每次都经过参与人、首页计数与律师统计的同步
+            lambda c, i: {
+                "headers": c.lawyer,
+                "url": f"/cases/{c.case_id}",
+                "json": {"status": "completed", "outcome": "won"} if i % 2 else {"status": "processing"},
+            },
+        ),
+        Scenario("GET", "/dashboard/summary", lambda c, i: {"headers": (c.client, c.lawyer)[i % 2]}),
+        Scenario("GET", "/query/contracts", lambda c, i: {"headers": c.client, "params": {"q": "租赁"} if i % 2 else {}}),
+        Scenario("GET", "/query/laws", lambda c, i: {"params": {"keyword": ("租赁", "租金", "出租人", "交付")[i % 4]}}),
+        Scenario("GET", "/lawyers", lambda c, i: {"params": {"category": _CATEGORIES[i % len(_CATEGORIES)]}}),
+        Scenario("GET", "/lawyers/{lawyer_id}", lambda c, i: {"url": f"/lawyers/{c.lawyer_id}"}),
+        Scenario("POST", "/files/upload", lambda c, i: {"headers": c.client, "files": {"file": (f"合同{i}.txt", f"{_DESC}{i}".encode())}}),
+        Scenario("GET", "/files", lambda c, i: {"headers": c.client}),
+        Scenario("GET", "/files/{file_id}/content", lambda c, i: {"headers": c.client, "url": f"/files/{c.file_id}/content"}),
+        Scenario("POST", "/feedback", lambda c, i: {"headers": c.client, "json": {"type": 1 + i % 5, "content": f"压测反馈内容，第{i}条。"}}),
+        Scenario(
+            "POST",
+            "/admin/laws/import",
+            lambda c, i: {"headers": c.admin, "files": {"file": ("laws.jsonl", import_body)}},
+        ),
+        Scenario(
+            "POST",
+            "/batch",
+            lambda c, i: {
+                "headers": c.client,
+                "json": {"requests": [{"path": path, "query": query} for path, query in _page_calls(c)]},
+            },
+        ),
+        # 与 POST /batch 对照：同样的 4 个请求逐个发送
+        Scenario(
+            "SEQ",
+            "/batch",
+            lambda c, i: [{"method": "GET", "url": path, "headers": c.client, "params": query} for path, query in _page_calls(c)],
+        ),
+        Scenario("GET", "/admin/usage", lambda c, i: {"headers": c.admin, "params": {"group_by": ("none", "user", "model")[i % 3]}}),
+    ]
+
+
+# ======================== 施压与统计 ========================
+
+
+def _percentile(sorted_ms: list[float], q: float) -> float:
+    """最近秩法百分位（q 取 0-100）。"""
+    if not sorted_ms:
+        return 0.0
+    k = min(len(sorted_ms), max(1, math.ceil(q / 100 * len(sorted_ms)))) - 1
+    return round(sorted_ms[k], 3)
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, ctx: Context, total: int, concurrency: int) -> dict:
+    global _statements
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+    counter = itertools.count()
+
+    async def worker() -> None:
+        while (i := next(counter)) < total:
+            calls = scenario.build(ctx, i)
+            started = time.perf_counter()
+            for kwargs in calls if isinstance(calls, list) else [calls]:
+                method = kwargs.pop("method", scenario.method)
+                url = kwargs.pop("url", scenario.path)
+                if ARGS.rtt_ms:
+                    await asyncio.sleep(ARGS.rtt_ms / 1000)
+                r = await client.request(method, f"{API}{url}", **kwargs)
+                if r.status_code >= 400:
+                    errors[str(r.status_code)] = errors.get(str(r.status_code), 0) + 1
+                elif scenario.path == "/batch" and method == "POST":
+                    # 批量接口总是 200，子请求的失败体现在各自的 status 中
+                    for sub in r.json()["responses"]:
+                        if sub["status"] >= 400:
+                            errors[f"batch:{sub['status']}"] = errors.get(f"batch:{sub['status']}", 0) + 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    statements_before = _statements
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "rps": round(total / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "queries_per_request": None if ARGS.base_url else round((_statements - statements_before) / total, 2),
+    }
+
+
+async def _login(client: httpx.AsyncClient, username: str) -> dict:
+    r = await client.post(f"{API}/auth/login", json={"username": username, "password": PASSWORD})
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def main() -> dict:
+    init_db()
+    ids = seed(ARGS.scale)
+    if ARGS.base_url:
+        client = httpx.AsyncClient(base_url=ARGS.base_url, timeout=60)
+    else:
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=60)
+    async with client:
+        client_headers = await _login(client, "bench_client")
+        r = await client.post(f"{API}/files/upload", headers=client_headers, files={"file": ("压测.txt", _DESC.encode() * 100)})
+        r.raise_for_status()
+        ctx = Context(
+            client=client_headers,
+            lawyer=await _login(client, "bench_lawyer"),
+            admin=await _login(client, "bench_admin"),
+            lawyer_id=ids["lawyer_id"],
+            case_id=ids["case_id"],
+            file_id=r.json()["id"],
+            run=f"bench{int(time.time())}",
+        )
+        scenarios = [s for s in _scenarios() if not ARGS.only or ARGS.only in s.name]
+        routes = {}
+        for scenario in scenarios:
+            total = min(ARGS.requests, scenario.max_requests or ARGS.requests)
+            routes[scenario.name] = await run_scenario(client, scenario, ctx, total, ARGS.concurrency)
+            print(f"{scenario.name:32s} {routes[scenario.name]['rps']:8.1f} req/s  p95 {routes[scenario.name]['p95_ms']:8.2f} ms", file=sys.stderr)
+    if async_engine is not None:
+        await async_engine.dispose()
+    batched, sequential = routes.get("POST /batch"), routes.get(SEQUENTIAL)
+    if batched and sequential:
+        print(
+            f"首页 4 个请求：批量 p50 {batched['p50_ms']:.2f} ms，逐个 p50 {sequential['p50_ms']:.2f} ms",
+            file=sys.stderr,
+        )
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "mode": "server" if ARGS.base_url else "in-process",
+            "database": engine.dialect.name,
+            "db_async": settings.DB_ASYNC,
+            "scale": ARGS.scale,
+            "requests": ARGS.requests,
+            "concurrency": ARGS.concurrency,
+            "rtt_ms": ARGS.rtt_ms,
+            "python": platform.python_version(),
+        },
+        "routes": routes,
+        "uncovered": sorted(api_routes(app) - {s.name for s in _scenarios()}),
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """打印与基准的对比，返回 p95 变慢超过阈值或每请求 SQL 条数增加的接口（以及启动耗时的回归项）。"""
+    regressions = []
+    print(f"{'接口':32s} {'rps':>18s} {'p95 ms':>20s} {'SQL/请求':>12s}")
+    for name, cur in report["routes"].items():
+        old = baseline.get("routes", {}).get(name)
+        if old is None:
+            print(f"{name:32s} （基准中没有）")
+            continue
+        change = (cur["p95_ms"] - old["p95_ms"]) / old["p95_ms"] if old["p95_ms"] else 0.0
+        more_sql = (cur["queries_per_request"] or 0) > (old["queries_per_request"] or 0)
+        flag = " <-- 回归" if change > threshold or more_sql else ""
+        if flag:
+            regressions.append(name)
+        print(
+            f"{name:32s} {old['rps']:8.1f} -> {cur['rps']:8.1f} "
+            f"{old['p95_ms']:8.2f} -> {cur['p95_ms']:8.2f} ({change:+.0%}) "
+            f"{old['queries_per_request']} -> {cur['queries_per_request']}{flag}"
+        )
+    if "startup" in report and "startup" in baseline:
+        regressions += bench_startup.compare(report["startup"], baseline["startup"], threshold)
+    return regressions
+
+
+if __name__ == "__main__":
+    report = asyncio.run(main())
+    if not ARGS.no_startup:
+        # 启动耗时在子进程中冷启动测量，与本进程的数据库无关
+        report["startup"] = bench_startup.profile(runs=3)
+    if ARGS.out:
+        with open(ARGS.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    if ARGS.baseline:
+        with open(ARGS.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), ARGS.threshold)
+        if regressions:
+            print(f"p95 / 启动耗时变慢超过 {ARGS.threshold:.0%} 或 SQL 条数增加：{', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
+    if report["uncovered"]:
+        # 新增接口必须同时补充压测场景
+        print(f"以下接口没有压测场景：{', '.join(report['uncovered'])}", file=sys.stderr)
+        sys.exit(1)
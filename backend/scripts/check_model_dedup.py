@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+模型调用并发去重检查：同一缓存键的并发调用只请求模型一次，且发起调用的请求被取消时等待者不会挂起。
+使用临时 SQLite 库与替换的模型后端（set_backend），不调用真实模型接口。
+用法: 在 backend 目录下执行  python scripts/check_model_dedup.py
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+
+# 必须在导入 app 之前设置，使用独立的临时数据库
+_TMP = tempfile.mkdtemp(prefix="lubao_check_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP}/check.db"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import init_db  # noqa: E402
+from app.services import ai_service  # noqa: E402
+from app.services.ai_service import ModelCallError, ModelOutput  # noqa: E402
+
+# 单个场景的超时：等待者挂起时以失败结束，而不是让脚本一直卡住
+TIMEOUT_SECONDS = 5.0
+
+_calls: list[str] = []
+_release = asyncio.Event()
+
+
+async def _slow_backend(model_name: str, prompt: str, params: dict) -> ModelOutput:
+    """等到 _release 被设置才返回；prompt 以 fail 开头时抛出 ModelCallError。"""
+    _calls.append(prompt)
+    await _release.wait()
+    if prompt.startswith("fail"):
+        raise ModelCallError("模拟的调用失败")
+    return ModelOutput(f"答复：{prompt}", 1, 1)
+
+
+async def _started(n: int) -> None:
+    """等到模型后端被调用 n 次（调用方已进入 _slow_backend）。"""
+    while len(_calls) < n:
+        await asyncio.sleep(0)
+
+
+def _reset() -> None:
+    _calls.clear()
+    _release.clear()
+    ai_service.clear_memory_cache()
+
+
+async def check_shared() -> None:
+    """两个并发调用只请求模型一次，第二个调用共享结果。"""
+    _reset()
+    first = asyncio.create_task(ai_service.invoke("check", "shared"))
+    await _started(1)
+    second = asyncio.create_task(ai_service.invoke("check", "shared"))
+    await asyncio.sleep(0.01)
+    _release.set()
+    a, b = await asyncio.gather(first, second)
+    assert len(_calls) == 1, f"模型被调用了 {len(_calls)} 次"
+    assert a.text == b.text and not a.cached and b.cached
+
+
+async def check_leader_cancelled() -> None:
+    """发起调用的请求被取消：等待者重新发起调用并拿到结果，不会挂起。"""
+    _reset()
+    leader = asyncio.create_task(ai_service.invoke("check", "cancel-leader"))
+    await _started(1)
+    waiter = asyncio.create_task(ai_service.invoke("check", "cancel-leader"))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    await _started(2)
+    _release.set()
+    result = await waiter
+    assert leader.cancelled()
+    assert result.text == "答复：cancel-leader"
+    assert len(_calls) == 2, f"模型被调用了 {len(_calls)} 次"
+
+
+async def check_waiter_cancelled() -> None:
+    """某个等待者被取消：进行中的调用与其他等待者不受影响。"""
+    _reset()
+    leader = asyncio.create_task(ai_service.invoke("check", "cancel-waiter"))
+    await _started(1)
+    waiter = asyncio.create_task(ai_service.invoke("check", "cancel-waiter"))
+    other = asyncio.create_task(ai_service.invoke("check", "cancel-waiter"))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    await asyncio.sleep(0.01)
+    _release.set()
+    a, b = await asyncio.gather(leader, other)
+    assert waiter.cancelled()
+    assert a.text == b.text
+    assert len(_calls) == 1, f"模型被调用了 {len(_calls)} 次"
+
+
+async def check_leader_failed() -> None:
+    """发起的调用失败：等待者收到同一个异常。"""
+    _reset()
+    leader = asyncio.create_task(ai_service.invoke("check", "fail-leader"))
+    await _started(1)
+    waiter = asyncio.create_task(ai_service.invoke("check", "fail-leader"))
+    await asyncio.sleep(0.01)
+    _release.set()
+    results = await asyncio.gather(leader, waiter, return_exceptions=True)
+    assert all(isinstance(r, ModelCallError) for r in results), results
+    assert len(_calls) == 1, f"模型被调用了 {len(_calls)} 次"
+
+
+CHECKS = (check_shared, check_leader_cancelled, check_waiter_cancelled, check_leader_failed)
+
+
+async def _run() -> int:
+    failed = 0
+    for check in CHECKS:
+        try:
+            await asyncio.wait_for(check(), TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            failed += 1
+            print(f"失败 {check.__name__}: {TIMEOUT_SECONDS:.0f}s 内没有完成（调用挂起）")
+        except AssertionError as e:
+            failed += 1
+            print(f"失败 {check.__name__}: {e}")
+        else:
+            print(f"通过 {check.__name__}")
+    return failed
+
+
+def main() -> int:
+    init_db()
+    ai_service.set_backend(_slow_backend)
+    try:
+        failed = asyncio.run(_run())
+    finally:
+        ai_service.set_backend(None)
+    if failed:
+        print(f"模型调用并发去重检查失败：{failed} 项。")
+        return 1
+    print("模型调用并发去重检查通过。")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+SQL 语句数回归检查：在临时 SQLite 库上进程内调用接口，统计每个请求执行的 SQL 条数。
+用于防止 N+1 查询回归（例如案件列表访问 case.lawyer / case.client 懒加载）。
+用法: 在 backend 目录下执行  python scripts/check_queries.py
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+
+# 必须在导入 app 之前设置，使用独立的临时数据库与上传目录
+_TMP = tempfile.mkdtemp(prefix="lubao_check_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP}/check.db"
+os.environ["UPLOAD_DIR"] = f"{_TMP}/uploads"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.db.session import SessionLocal, async_engine, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.case import Case  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+PASSWORD = "123456"
+
+_statements: list[str] = []
+
+
+def _count(conn, cursor, statement, parameters, context, executemany) -> None:
+    _statements.append(statement)
+
+
+# 接口走异步引擎（DB_ASYNC=True）或同步引擎（DB_ASYNC=False），两者都要统计
+event.listen(engine, "before_cursor_execute", _count)
+if async_engine is not None:
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _count)
+
+
+def count_statements(client: TestClient, method: str, path: str, **kwargs) -> int:
+    """执行一次请求并返回期间的 SQL 语句数。"""
+    _statements.clear()
+    r = client.request(method, path, **kwargs)
+    if r.status_code >= 400:
+        raise RuntimeError(f"{method} {path} 失败：{r.status_code} {r.text[:200]}")
+    return len(_statements)
+
+
+def _add_cases(lawyer_id: int, n: int) -> None:
+    """为律师添加 n 个案件，每个案件一个不同的客户（懒加载时每行都会触发新查询）。"""
+    db = SessionLocal()
+    try:
+        start = db.query(Case).filter(Case.lawyer_id == lawyer_id).count()
+        for i in range(start, start + n):
+            user = User(username=f"check_client_{lawyer_id}_{i}", hashed_password="x", role="client")
+            db.add(user)
+            db.flush()
+            db.add(
+                Case(
+                    case_no=f"CHK-{lawyer_id}-{i}",
+                    title=f"检查案件{i}",
+                    lawyer_id=lawyer_id,
+                    client_id=user.id,
+                )
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _register(client: TestClient, username: str, role: str | None) -> tuple[int, dict]:
+    r = client.post(
+        "/api/v1/auth/register",
+        json={"username": username, "password": PASSWORD, "role": role},
+    )
+    user_id = r.json()["id"]
+    r = client.post("/api/v1/auth/login", json={"username": username, "password": PASSWORD})
+    return user_id, {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def main() -> None:
+    failed: list[str] = []
+    with TestClient(app) as client:
+        lawyer_id, lawyer_headers = _register(client, "check_lawyer", "lawyer")
+        client_id, client_headers = _register(client, "check_client", "client")
+
+        # 先各请求一次 /auth/me 预热认证缓存，避免首个请求多出的用户查询干扰计数
+        client.get("/api/v1/auth/me", headers=lawyer_headers)
+        client.get("/api/v1/auth/me", headers=client_headers)
+
+        # 案件列表：1 个案件与 50 个案件（50 个不同客户）的语句数必须相同
+        _add_cases(lawyer_id, 1)
+        small = count_statements(client, "GET", "/api/v1/cases", headers=lawyer_headers, params={"limit": 100})
+        _add_cases(lawyer_id, 49)
+        large = count_statements(client, "GET", "/api/v1/cases", headers=lawyer_headers, params={"limit": 100})
+        print(f"GET /cases（律师视角）: 1 个案件 {small} 条 SQL，50 个案件 {large} 条 SQL")
+        if small != large:
+            failed.append(f"GET /cases 语句数随案件数增长：{small} -> {large}")
+
+        # 案件详情：律师、客户用户名必须随案件一次取出
+        db = SessionLocal()
+        case = Case(case_no="CHK-DETAIL", title="详情检查", lawyer_id=lawyer_id, client_id=client_id)
+        db.add(case)
+        db.commit()
+        case_id = case.id
+        db.close()
+        me = count_statements(client, "GET", "/api/v1/auth/me", headers=client_headers)
+        detail = count_statements(client, "GET", f"/api/v1/cases/{case_id}", headers=client_headers)
+        print(f"GET /cases/{{id}}: {detail} 条 SQL（其中认证 {me} 条）")
+        if detail - me > 1:
+            failed.append(f"GET /cases/{{id}} 除认证外执行了 {detail - me} 条 SQL，期望 1 条")
+
+        # 首页汇总：只按主键读取计数行，且计数与上面写入的 51 个案件一致
+        summary = count_statements(client, "GET", "/api/v1/dashboard/summary", headers=lawyer_headers)
+        print(f"GET /dashboard/summary: {summary} 条 SQL（其中认证 {me} 条）")
+        if summary - me > 1:
+            failed.append(f"GET /dashboard/summary 除认证外执行了 {summary - me} 条 SQL，期望 1 条")
+        cases = client.get("/api/v1/dashboard/summary", headers=lawyer_headers).json()["cases"]
+        if cases["pending"] != 51:
+            failed.append(f"GET /dashboard/summary 待处理案件数为 {cases['pending']}，期望 51")
+
+    if failed:
+        print("以下检查未通过:")
+        for f in failed:
+            print("  - " + f)
+        sys.exit(1)
+    print("SQL 语句数检查通过。")
+
+
+if __name__ == "__main__":
+    main()
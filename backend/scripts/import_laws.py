@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+法条批量导入：把法律全文（.txt）、JSONL 或 CSV 文件导入 law_articles 表并更新全文索引。
+使用 .env / 环境变量中的 DATABASE_URL；同一法律的同一条款已存在时更新内容。
+用法: 在 backend 目录下执行
+    python scripts/import_laws.py 民法典.txt --law-name 中华人民共和国民法典
+    python scripts/import_laws.py laws.jsonl laws.csv --batch-size 1000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import engine, init_db  # noqa: E402
+from app.services import law_import  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="批量导入法条")
+    parser.add_argument("paths", nargs="+", help="法条文件（.txt / .jsonl / .csv，UTF-8）")
+    parser.add_argument("--law-name", help="法律名称；纯文本为空时取文件第一行")
+    parser.add_argument("--format", choices=law_import.FORMATS, help="文件格式，默认按扩展名判断")
+    parser.add_argument("--batch-size", type=int, help="每个事务写入的条数")
+    args = parser.parse_args()
+
+    # 建表并初始化全文索引，导入时才会同步写入索引
+    init_db()
+    for path in args.paths:
+        try:
+            result = law_import.import_file(
+                engine, path, args.format, args.law_name, args.batch_size
+            )
+        except (law_import.LawImportError, OSError, UnicodeDecodeError) as e:
+            print(f"{path}: 导入失败：{e}", file=sys.stderr)
+            return 1
+        print(
+            f"{path}: 新增 {result.inserted} 条，更新 {result.updated} 条，"
+            f"跳过 {result.skipped} 条，耗时 {result.seconds:.2f}s"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+数据库迁移：把数据库结构升级到当前代码的版本（SCHEMA_VERSION，见 app/db/migrations.py），
+并确保法条全文索引、律师分类索引就绪。部署新版本时在启动服务之前执行一次；
+服务以 DB_SCHEMA_STARTUP=check 启动时，版本落后会拒绝启动。
+使用 .env / 环境变量中的 DATABASE_URL。
+用法: 在 backend 目录下执行
+    python scripts/migrate.py
+    python scripts/migrate.py --status    # 只查看当前版本与待执行的迁移
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import migrations  # noqa: E402
+from app.db.session import engine  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="数据库迁移")
+    parser.add_argument("--status", action="store_true", help="只显示当前版本与待执行的迁移，不修改数据库")
+    args = parser.parse_args()
+
+    version = migrations.current_version(engine)
+    print(f"数据库结构版本 {version}，代码版本 {migrations.SCHEMA_VERSION}")
+    todo = migrations.pending(engine)
+    for v, description in todo:
+        print(f"  待执行 {v}: {description}")
+    if args.status:
+        return 1 if todo else 0
+
+    started = time.perf_counter()
+    n = migrations.migrate(engine)
+    print(
+        f"执行 {n} 个迁移，当前版本 {migrations.current_version(engine)}，"
+        f"耗时 {time.perf_counter() - started:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
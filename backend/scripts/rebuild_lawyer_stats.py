@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+律师统计重建：按 cases 与 feedbacks 重新计数，重写 lawyer_stats（案件数、胜诉、评分）。
+统计随案件、反馈写入自动更新；批量导入数据或直接改库之后执行一次。
+使用 .env / 环境变量中的 DATABASE_URL。
+用法: 在 backend 目录下执行
+    python scripts/rebuild_lawyer_stats.py
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import engine, init_db  # noqa: E402
+from app.services import lawyer_stats  # noqa: E402
+
+
+def main() -> int:
+    argparse.ArgumentParser(description="律师统计重建").parse_args()
+
+    init_db()
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        n = lawyer_stats.rebuild(conn)
+    print(f"重建 {n} 位律师的统计，耗时 {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+首页计数对账：按 case_participants 与 contracts 重新计数，修正 dashboard_counters 中不一致的行。
+应用内已按 DASHBOARD_RECONCILE_INTERVAL_SECONDS 定时对账；设为 0 时可用本脚本配合 cron 定时执行。
+使用 .env / 环境变量中的 DATABASE_URL。
+用法: 在 backend 目录下执行
+    python scripts/reconcile_dashboard.py
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import engine, init_db  # noqa: E402
+from app.services import dashboard_counters  # noqa: E402
+
+
+def main() -> int:
+    argparse.ArgumentParser(description="首页计数对账").parse_args()
+
+    init_db()
+    started = time.perf_counter()
+    n = dashboard_counters.run_reconcile(engine)
+    print(f"修正 {n} 个用户的计数，耗时 {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+模型用量汇总：把 model_call_logs 中尚未汇总的日志累加到 model_usage_hourly / model_usage_daily。
+应用内已按 USAGE_ROLLUP_INTERVAL_SECONDS 定时汇总；设为 0 时可用本脚本配合 cron 定时执行。
+使用 .env / 环境变量中的 DATABASE_URL。
+用法: 在 backend 目录下执行
+    python scripts/rollup_usage.py
+    python scripts/rollup_usage.py --rebuild     # 清空汇总表后从头重新汇总
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import engine, init_db  # noqa: E402
+from app.services import usage_rollup  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="模型用量汇总")
+    parser.add_argument("--rebuild", action="store_true", help="清空汇总表与高水位，从头重新汇总")
+    parser.add_argument("--batch-size", type=int, help="每个事务处理的日志条数")
+    args = parser.parse_args()
+
+    init_db()
+    if args.rebuild:
+        usage_rollup.reset(engine)
+    started = time.perf_counter()
+    n = usage_rollup.run_rollup(engine, args.batch_size)
+    print(f"汇总 {n} 条调用日志，耗时 {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -61,7 +61,7 @@ Page({
 
   initData() {
     return request.get('/cases', true).then(({ data }) => {
-      const list = Array.isArray(data) ? data.map(mapCaseItem) : [];
+      const list = data && Array.isArray(data.items) ? data.items.map(mapCaseItem) : [];
       this.setData({ caseList: list, filteredCaseList: list });
     }).catch((err) => {
       if (err.statusCode === 401) {
@@ -38,7 +38,7 @@ Page({
       wx.showLoading({ title: '加载中...' });
       request.get('/lawyers', false).then(({ data }) => {
         wx.hideLoading();
-        const list = Array.isArray(data) ? data.map(mapLawyer) : [];
+        const list = data && Array.isArray(data.items) ? data.items.map(mapLawyer) : [];
         this.setData({ allLawyers: list }, () => this.updateDisplayedLawyers());
       }).catch(() => {
         wx.hideLoading();
@@ -52,7 +52,7 @@ Page({
     const showHistory = this.data.showHistory;
     const params = showHistory ? '?history=true' : '';
     return request.get('/cases' + params, true).then(({ data }) => {
-      const list = Array.isArray(data) ? data.map(mapCaseItem) : [];
+      const list = data && Array.isArray(data.items) ? data.items.map(mapCaseItem) : [];
       this.setData({ caseList: list });
       this.filterCases();
     }).catch((err) => {
@@ -38,7 +38,7 @@ Page({
     wx.showLoading({ title: '加载中...' });
     request.get('/cases?history=true', true).then(({ data }) => {
       wx.hideLoading();
-      const list = Array.isArray(data) ? data.filter(i => i.statusType === 'completed').map(mapCaseItem) : [];
+      const list = data && Array.isArray(data.items) ? data.items.filter(i => i.statusType === 'completed').map(mapCaseItem) : [];
       this.setData({ caseList: list }, () => this.filterCases());
     }).catch((err) => {
       wx.hideLoading();